@@ -1,7 +1,7 @@
-import os
 import re
 import time
 import math
+import uuid
 import discord
 import aiohttp
 import asyncio
@@ -12,9 +12,10 @@ import traceback
 import discord.utils
 
 from dciv_bot.util.cache import Cache
-from dciv_bot.util import mk, exceptions
+from dciv_bot.util.dm import DMDispatcher
+from dciv_bot.util import mk, exceptions, levenshtein, backup, pool, latency, looplag
 from dciv_bot.config import token, config
-from typing import Optional, Union
+from typing import Optional, Union, Set, List, Tuple, Dict
 from dciv_bot.util.law_helper import LawUtils
 from discord.ext import commands, tasks
 from dciv_bot.util.reddit_api import RedditAPIWrapper
@@ -35,6 +36,7 @@ initial_extensions = ['dciv_bot.event.logging',
                       'dciv_bot.module.roles',
                       'dciv_bot.module.guild',
                       'dciv_bot.module.admin',
+                      'dciv_bot.module.perf',
                       'dciv_bot.module.wiki',
                       'dciv_bot.module.tags',
                       'dciv_bot.module.starboard',
@@ -55,6 +57,14 @@ class DemocracivBot(commands.Bot):
         # Save the bot's start time for self.uptime
         self.start_time = time.time()
 
+        # Startup is coordinated through these gates instead of sleeping and hoping that the database or the
+        # Democraciv guild are there by then. How long it took until each of them was set is kept in startup_timeline
+        self.db_ready = asyncio.Event()
+        self.guild_ready = asyncio.Event()
+        self.caches_warm = asyncio.Event()
+        self.startup_timeline: List[Tuple[str, float]] = []
+        self._startup_clock = time.perf_counter()
+
         # Initialize commands.Bot with prefix, description and disable case_sensitivity
         super().__init__(command_prefix=commands.when_mentioned_or(config.BOT_PREFIX),
                          description=self.description, case_insensitive=True,
@@ -66,31 +76,54 @@ class DemocracivBot(commands.Bot):
         self.loop.create_task(self.initialize_aiohttp_session())
 
         # PostgreSQL database connection
-        self.db_ready = False
         self.db = None
-        self.loop.create_task(self.connect_to_db())
+
+        # Identifies the connections of this bot in the database, so that it can tell its own changes from others in
+        # the notifications that invalidate caches
+        self.db_application_name = f"democraciv-bot-{uuid.uuid4().hex[:12]}"
+        self._db_connection = self.loop.create_task(self.connect_to_db())
 
         self.embeds = EmbedUtils()
         self.checks = CheckUtils(self)
         self.laws = LawUtils(self)
         self.cache = Cache(self)
+        self.dms = DMDispatcher(self)
+
+        # Measures how long CPU work blocks the event loop, see -perf loop
+        self.loop_lag = looplag.LoopLagMonitor(self.loop, interval=config.LOOP_LAG_SAMPLE_INTERVAL)
+        self.loop_lag.start(detect_slow_callbacks=config.LOOP_SLOW_CALLBACK_DETECTOR_ENABLED,
+                            slow_callback_duration=config.LOOP_SLOW_CALLBACK_DURATION)
 
         # Attributes will be "initialized" in on_ready as they need a connection to Discord
         self.owner = None
         self.democraciv_guild_id = None
 
-        # Load the bot's cogs from /event and /module
+        # Names and aliases of all commands that tags cannot use, and the index used to suggest the closest command
+        # name for typos. Both are kept up to date by load/unload/reload_extension
+        self.reserved_command_names: Set[str] = set()
+        self.command_suggestions = levenshtein.BKTree()
+
+        # Load the bot's cogs from /event and /module. The lazy ones are only loaded by load_lazy_extensions() once
+        # someone invokes a command that is not loaded yet, so that importing them doesn't delay the start
+        self.extension_load_times: Dict[str, float] = {}
+        self.lazy_extensions: List[str] = []
+
         for extension in initial_extensions:
-            try:
-                self.load_extension(extension)
-                print(f'[BOT] Successfully loaded {extension}')
-            except Exception:
-                print(f'[BOT] Failed to load module {extension}.')
-                traceback.print_exc()
+            if config.EXTENSION_ALLOWLIST and extension not in config.EXTENSION_ALLOWLIST:
+                continue
+
+            if extension in config.LAZY_EXTENSIONS:
+                self.lazy_extensions.append(extension)
+            else:
+                self.load_timed_extension(extension)
+
+        self.mark_startup_phase("Extensions loaded")
 
         if config.DATABASE_DAILY_BACKUP_ENABLED:
             self.daily_db_backup.start()
 
+        latency.instrument_loops(self)
+
         # The bot needs a "main" guild that will be used for Reddit, Twitch & Youtube notifications, political
         # parties, legislature & ministry organization, the starboard and other admin commands.
         # The bot will automatically pick the first guild that it can see if 'DEMOCRACIV_GUILD_ID' from
@@ -98,11 +131,83 @@ class DemocracivBot(commands.Bot):
         self.loop.create_task(self.initialize_democraciv_guild())
 
         self.loop.create_task(self.check_custom_emoji_availability())
+        self.loop.create_task(self.report_startup_timeline())
 
         self.reddit_api = RedditAPIWrapper(self)
         self.google_api = GoogleAPIWrapper(self)
         self.mk = mk.MarkConfig(self)
 
+    def mark_startup_phase(self, phase: str):
+        self.startup_timeline.append((phase, time.perf_counter() - self._startup_clock))
+
+    async def report_startup_timeline(self):
+        await asyncio.gather(self.db_ready.wait(), self.guild_ready.wait(), self.caches_warm.wait())
+
+        timeline = "\n".join(f"      {seconds:>7.2f}s  {phase}" for phase, seconds in self.startup_timeline)
+        print(f"[BOT] Startup timeline:\n{timeline}")
+
+        slowest = sorted(self.extension_load_times.items(), key=lambda item: item[1], reverse=True)[:5]
+        slowest = "\n".join(f"      {seconds * 1000:>7.1f}ms {extension}" for extension, seconds in slowest)
+        print(f"[BOT] Slowest extensions to load:\n{slowest}")
+
+    def load_timed_extension(self, name: str) -> bool:
+        """Loads an extension, logs how long that took and returns whether it worked"""
+
+        started = time.perf_counter()
+
+        try:
+            self.load_extension(name)
+        except Exception:
+            print(f'[BOT] Failed to load module {name}.')
+            traceback.print_exc()
+            return False
+
+        self.extension_load_times[name] = time.perf_counter() - started
+        print(f'[BOT] Successfully loaded {name} in {self.extension_load_times[name] * 1000:.1f}ms')
+        return True
+
+    def load_lazy_extensions(self):
+        while self.lazy_extensions:
+            extension = self.lazy_extensions.pop(0)
+            self.load_timed_extension(extension)
+
+            # Listeners and loops of a lazy extension only started now, they might have missed events until then
+            for cog in self.cogs.values():
+                if cog.__module__ == extension and (cog.get_listeners() or any(
+                        isinstance(value, tasks.Loop) for value in vars(type(cog)).values())):
+                    print(f"[BOT] WARNING - {extension} has event listeners or background tasks and should be "
+                          f"removed from LAZY_EXTENSIONS in config.py.")
+
+    def load_extension(self, name):
+        super().load_extension(name)
+        self.update_command_indexes()
+
+    def unload_extension(self, name):
+        super().unload_extension(name)
+        self.update_command_indexes()
+
+    def reload_extension(self, name):
+        super().reload_extension(name)
+        self.update_command_indexes()
+
+    def update_command_indexes(self):
+        """Collects the qualified names of all commands and subcommands and the aliases of all of them, and
+        rebuilds the index of top-level command names and aliases for 'Did you mean' suggestions"""
+
+        reserved = set()
+
+        for command in self.commands:
+            reserved.add(command.qualified_name)
+            reserved.update(command.aliases)
+
+            if isinstance(command, commands.Group):
+                for subcommand in command.commands:
+                    reserved.add(subcommand.qualified_name)
+                    reserved.update(subcommand.aliases)
+
+        self.reserved_command_names = reserved
+        self.command_suggestions = levenshtein.BKTree(self.all_commands.keys())
+
     async def initialize_aiohttp_session(self):
         """Initialize a shared aiohttp ClientSession to be used for -wikipedia, -leg submit and reddit & twitch requests
         aiohttp needs to have this in an async function, that's why it's separated from __init__()"""
@@ -150,44 +255,65 @@ class DemocracivBot(commands.Bot):
             config.LEG_SUBMIT_MOTION = "\U0001f1f2"
             config.GUILD_SETTINGS_GEAR = "\U00002699"
 
-    async def connect_to_db(self):
+    async def connect_to_db(self) -> bool:
         """Attempt to connect to PostgreSQL database with specified credentials from token.py.
-        This will also fill an empty database with tables needed by the bot"""
+        This will also fill an empty database with tables needed by the bot. Sets self.db_ready on success."""
 
+        # The schema is executed before the pool is created, as the pool's init hook needs the types from it
         try:
-            self.db = await asyncpg.create_pool(user=token.POSTGRESQL_USER,
-                                                password=token.POSTGRESQL_PASSWORD,
-                                                database=token.POSTGRESQL_DATABASE,
-                                                host=token.POSTGRESQL_HOST)
+            connection = await self.create_db_connection()
         except Exception as e:
             print("[DATABASE] Unexpected error occurred while connecting to PostgreSQL database.")
             print(f"[DATABASE] {e}")
-            self.db_ready = False
-            return
+            return False
 
         with open('dciv_bot/db/schema.sql') as sql:
             try:
-                await self.db.execute(sql.read())
+                await connection.execute(sql.read())
             except asyncpg.InsufficientPrivilegeError:
                 print("[DATABASE] Could not create extension 'pg_trgm' as this user. Login as the"
                       " postgres user and manually create extension on database.")
-                self.db_ready = False
-                await asyncio.sleep(5)
-                return
+                return False
             except Exception as e:
                 print("[DATABASE] Unexpected error occurred while executing default schema on PostgreSQL database")
                 print(f"[DATABASE] {e}")
-                self.db_ready = False
-                return
+                return False
+            finally:
+                await connection.close()
+
+        try:
+            self.db = await asyncpg.create_pool(user=token.POSTGRESQL_USER,
+                                                password=token.POSTGRESQL_PASSWORD,
+                                                database=token.POSTGRESQL_DATABASE,
+                                                host=token.POSTGRESQL_HOST,
+                                                server_settings=pool.server_settings(self.db_application_name),
+                                                connection_class=pool.InstrumentedConnection,
+                                                init=pool.init_connection)
+        except Exception as e:
+            print("[DATABASE] Unexpected error occurred while connecting to PostgreSQL database.")
+            print(f"[DATABASE] {e}")
+            return False
 
         print("[DATABASE] Successfully initialised database")
-        self.db_ready = True
+        self.mark_startup_phase("Database ready")
+        self.db_ready.set()
+        return True
+
+    async def create_db_connection(self) -> asyncpg.Connection:
+        """Opens a single connection outside of the pool, for things like LISTEN that need a connection of their own"""
+
+        return await asyncpg.connect(user=token.POSTGRESQL_USER,
+                                     password=token.POSTGRESQL_PASSWORD,
+                                     database=token.POSTGRESQL_DATABASE,
+                                     host=token.POSTGRESQL_HOST,
+                                     server_settings=pool.server_settings(self.db_application_name))
 
     async def initialize_democraciv_guild(self):
         """Saves the Democraciv guild object (main guild) as a class attribute. If config.DEMOCRACIV_GUILD_ID is
         not a guild, the first guild in self.guilds will be used instead."""
 
         await self.wait_until_ready()
+        self.mark_startup_phase("Logged in to Discord")
 
         dciv_guild = self.get_guild(config.DEMOCRACIV_GUILD_ID)
 
@@ -205,6 +331,8 @@ class DemocracivBot(commands.Bot):
         self.democraciv_guild_id = dciv_guild.id
 
         print(f"[BOT] Using '{dciv_guild.name}' as Democraciv guild.")
+        self.mark_startup_phase("Democraciv guild ready")
+        self.guild_ready.set()
 
     @property
     def uptime(self):
@@ -220,39 +348,30 @@ class DemocracivBot(commands.Bot):
         return self.get_guild(self.democraciv_guild_id)
 
     async def safe_send_dm(self, target: Union[discord.User, discord.Member],
-                           reason: str = None, message: str = None, embed: discord.Embed = None):
-        dm_settings = await self.db.fetchrow("SELECT * FROM dm_settings WHERE user_id = $1", target.id)
-        p = config.BOT_PREFIX
+                           reason: str = None, message: str = None, embed: discord.Embed = None) -> bool:
+        """DMs a single user, unless they disabled DMs of this reason with -dms. To DM many users, use self.dms.queue()"""
 
-        if not dm_settings:
-            dm_settings = await self.db.fetchrow("INSERT INTO dm_settings (user_id) VALUES ($1) RETURNING *", target.id)
-
-        try:
-            is_enabled = dm_settings[reason]
-        except (KeyError, TypeError):
-            is_enabled = True
-
-        if not is_enabled:
-            return
-
-        if message:
-            message = f"{message}\n\n*If you want to enable or disable specific DMs from me, check `{p}help dms`.*"
-        else:
-            message = f"*If you want to enable or disable specific DMs from me, check `{p}help dms`.*"
-
-        try:
-            await target.send(content=message, embed=embed)
-        except discord.Forbidden:
-            pass
+        report = await self.dms.send([target], reason=reason, message=message, embed=embed)
+        return report.delivered == 1
 
     async def close(self):
         """Closes the aiohttp ClientSession, the connection pool to the PostgreSQL database and the bot itself."""
         await self.session.close()
-        await self.db.close()
+        self.dms.stop()
+        self.loop_lag.stop()
+
+        # Write the buffered tag uses before the connection pool is gone
+        if self.get_cog("Tags") is not None:
+            await self.get_cog("Tags").flush_pending_uses()
+
+        if self.db is not None:
+            await self.db.close()
+
         await super().close()
 
     async def on_ready(self):
-        if not self.db_ready:
+        # Wait for the connection attempt to finish, otherwise this would race with it
+        if not await self._db_connection:
             print("[DATABASE] Fatal error while connecting to database. Closing bot...")
             return await self.close()
 
@@ -262,11 +381,61 @@ class DemocracivBot(commands.Bot):
         self.owner = (await self.application_info()).owner
         self.owner_id = self.owner.id
 
+    def add_cog(self, cog):
+        super().add_cog(cog)
+
+        # Record how long every iteration of the cog's background tasks takes, see -perf
+        latency.instrument_loops(cog)
+
+    async def invoke(self, ctx):
+        # Attribute the queries of this command to it, see -perf queries
+        if ctx.command is None:
+            return await super().invoke(ctx)
+
+        origin = f"command:{ctx.command.qualified_name}"
+        pool.query_stats.command_invoked(origin)
+        token_ = pool.query_origin.set(origin)
+
+        # on_command and on_command_completion are dispatched from in here as separate tasks that run later, so
+        # the command's latency is measured around them instead, errors handled by on_command_error included
+        started = time.perf_counter()
+
+        try:
+            await super().invoke(ctx)
+        finally:
+            pool.query_origin.reset(token_)
+            first_argument = 2 if ctx.command.cog is not None else 1
+            latency.latency_stats.record(origin, time.perf_counter() - started,
+                                         latency.describe_arguments(ctx.args[first_argument:], ctx.kwargs),
+                                         failed=ctx.command_failed)
+
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        started = time.perf_counter()
+
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            latency.latency_stats.record(f"event:{getattr(coro, '__qualname__', event_name)}",
+                                         time.perf_counter() - started, latency.describe_arguments(args, kwargs))
+
+    def _schedule_event(self, coro, event_name, *args, **kwargs):
+        # The task of an event listener copies the current context, so the queries that it makes are attributed to it
+        token_ = pool.query_origin.set(f"event:{getattr(coro, '__qualname__', event_name)}")
+
+        try:
+            return super()._schedule_event(coro, event_name, *args, **kwargs)
+        finally:
+            pool.query_origin.reset(token_)
+
     async def on_message(self, message):
         # Don't process message/command from other bots
         if message.author.bot:
             return
 
+        # Commands and the guild config cache need the database
+        if not self.db_ready.is_set():
+            return
+
         for user in message.mentions:
             if user.id == self.user.id and len(message.content) in (20, 21, 22):
                 await message.channel.send(f"Hey! :wave:\nMy prefix is: `{config.BOT_PREFIX}`\n"
@@ -274,45 +443,60 @@ class DemocracivBot(commands.Bot):
                                            f" or `{config.BOT_PREFIX}about` to learn more about me!")
                 break
 
+        # Same as process_commands(), but the context is reused to find out whether the lazy extensions are needed
+        ctx = await self.get_context(message)
+
+        # A command that might belong to a lazy extension, or -help and -commands that list all commands
+        if self.lazy_extensions and ctx.invoked_with and (ctx.command is None or
+                                                          ctx.command.qualified_name in ('help', 'commands')):
+            self.load_lazy_extensions()
+            ctx = await self.get_context(message)
+
         await self.cache.verify_guild_config_cache(message)
-        await self.process_commands(message)
+        await self.invoke(ctx)
 
     @tasks.loop(hours=config.DATABASE_DAILY_BACKUP_INTERVAL)
     async def daily_db_backup(self):
-        """This task makes a backup of the bot's PostgreSQL database every 24hours and uploads
-        that backup to the #backup channel to the Democraciv Discord guild."""
+        """This task makes a compressed backup of the bot's PostgreSQL database every
+        DATABASE_DAILY_BACKUP_INTERVAL hours and uploads that backup to the #backup channel to the Democraciv
+        Discord guild."""
 
         # Unique filenames with current UNIX timestamp
         now = time.time()
         pretty_time = datetime.datetime.utcfromtimestamp(now).strftime("%A, %B %d %Y %H:%M:%S")
         file_name = f'democraciv-bot-db-backup-{now}'
 
-        # Use pg_dump to dumb the database as raw SQL
+        # Dump the database with pg_dump, compress it while it is being dumped and save it in db/backup/
         # Login with credentials provided in token.py
-        command = f'PGPASSWORD="{token.POSTGRESQL_PASSWORD}" pg_dump {token.POSTGRESQL_DATABASE} > ' \
-                  f'dciv_bot/db/backup/{file_name} -U {token.POSTGRESQL_USER} ' \
-                  f'-h {token.POSTGRESQL_HOST} -w'
+        try:
+            result = await backup.backup_database('dciv_bot/db/backup', file_name,
+                                                  config.DATABASE_DAILY_BACKUP_MAX_UPLOAD_SIZE,
+                                                  user=token.POSTGRESQL_USER, password=token.POSTGRESQL_PASSWORD,
+                                                  database=token.POSTGRESQL_DATABASE, host=token.POSTGRESQL_HOST)
+        except (backup.BackupError, OSError) as e:
+            print(f"[DATABASE] Database backup failed. {e.__class__.__name__}: {e}")
+            return
 
-        # Check if backup dir exists
-        if not os.path.isdir('dciv_bot/db/backup'):
-            os.mkdir('dciv_bot/db/backup')
+        print(f"[DATABASE] Backed up database to 'db/backup/{file_name}': {result}")
 
-        # Run the command and save the backup files in db/backup/
-        await asyncio.create_subprocess_shell(command)
+        deleted = backup.apply_retention('dciv_bot/db/backup', config.DATABASE_DAILY_BACKUP_RETENTION,
+                                         'democraciv-bot-db-backup-')
 
-        # Make sure that pg_dump is finished before loading the backup
-        await asyncio.sleep(20)
+        if deleted:
+            print(f"[DATABASE] Deleted {len(deleted)} backup file(s) older than "
+                  f"{config.DATABASE_DAILY_BACKUP_RETENTION} days.")
 
         # Upload the file to the #backup channel in the Moderation category on the Democraciv server
-        file = discord.File(f'dciv_bot/db/backup/{file_name}')
         backup_channel = self.get_channel(config.DATABASE_DAILY_BACKUP_DISCORD_CHANNEL)
 
         if backup_channel is None:
             print(f"[DATABASE] Couldn't find Backup Discord channel for database backup 'db/backup/{file_name}'.")
             return
 
-        await backup_channel.send(f"---- Database Backup from {pretty_time} (UTC) ----", file=file)
+        await backup_channel.send(f"---- Database Backup from {pretty_time} (UTC) ----\n{result}")
 
+        for part in result.parts:
+            await backup_channel.send(file=discord.File(part))
 
 if __name__ == '__main__':
     dciv = DemocracivBot()
@@ -13,6 +13,24 @@ DEMOCRACIV_GUILD_ID = 208984105310879744  # Democraciv
 # DEMOCRACIV_GUILD_ID = 653946455337467904  # Democraciv Bot Support
 # DEMOCRACIV_GUILD_ID = 232108753477042187  # Test Server
 
+# Extension Configuration
+# If not empty, only these of the extensions in bot.py are loaded
+EXTENSION_ALLOWLIST = []
+# Rarely used extensions that are not loaded on start, but only once someone invokes a command that is not loaded yet,
+# -help or -commands. Only extensions that have nothing but commands can be lazy: event listeners and tasks.loop()s
+# of a lazy extension would not run until then, like Misc's on_member_join that records original join dates.
+LAZY_EXTENSIONS = ['dciv_bot.module.wiki', 'dciv_bot.module.democraciv.supremecourt']
+
+# DM Configuration
+DM_CONCURRENCY = 4  # How many DMs are sent at the same time at most
+DM_PER_SECOND = 2  # Discord doesn't publish its rate limits for DMs, but bots that DM too fast get flagged as spam
+
+# Event Loop Monitoring, see -perf loop
+LOOP_LAG_SAMPLE_INTERVAL = 0.5  # How often the delay of the event loop is measured, in seconds
+# Reports which coroutine blocked the event loop. Needs asyncio's debug mode, which makes the whole bot slower
+LOOP_SLOW_CALLBACK_DETECTOR_ENABLED = False
+LOOP_SLOW_CALLBACK_DURATION = 0.1  # Callbacks that block the event loop for longer than this many seconds are reported
+
 # Starboard Configuration
 STARBOARD_ENABLED = True
 STARBOARD_CHANNEL = 680565146133069873  # The Discord channel for the starboard
@@ -51,6 +69,10 @@ HELP_BOT_HELP = "<:qe:685986162225184788>"
 DATABASE_DAILY_BACKUP_ENABLED = True
 DATABASE_DAILY_BACKUP_DISCORD_CHANNEL = 656214962854821928
 DATABASE_DAILY_BACKUP_INTERVAL = 72  # hours
+DATABASE_DAILY_BACKUP_RETENTION = 30  # Backups older than this many days are deleted from db/backup/
+DATABASE_DAILY_BACKUP_MAX_UPLOAD_SIZE = 8 * 1024 * 1024 - 4096  # Discord's upload limit, larger backups are split
+DATABASE_SLOW_QUERY_THRESHOLD = 0.2  # Queries that take longer than this many seconds are logged
+DATABASE_TRGM_SIMILARITY_THRESHOLD = 0.4  # How similar a law's tag must be to a search query, from 0 to 1
 
 # Reddit Notifications
 REDDIT_ENABLED = True
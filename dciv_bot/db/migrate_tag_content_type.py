@@ -0,0 +1,37 @@
+import asyncio
+import asyncpg
+
+from dciv_bot.config import token
+from dciv_bot.module.tags import Tags
+
+"""Migrate database as the content type of tags is now saved when a tag is added or edited. The column itself is
+added by schema.sql when the bot starts, this fills it in for the tags that were created before."""
+
+
+async def get_db():
+    return await asyncpg.create_pool(user=token.POSTGRESQL_USER,
+                                     password=token.POSTGRESQL_PASSWORD,
+                                     database=token.POSTGRESQL_DATABASE,
+                                     host=token.POSTGRESQL_HOST)
+
+
+async def main():
+    db = await get_db()
+
+    async with db.acquire() as connection:
+        async with connection.transaction():
+            tags = await connection.fetch("SELECT id, content FROM guild_tags WHERE content_type IS NULL")
+
+            # Use the bot's own classification so that migrated tags behave exactly like new ones
+            content_types = [Tags.get_tag_content_type(record['content']).value for record in tags]
+
+            await connection.execute("UPDATE guild_tags SET content_type = backfill.content_type"
+                                     " FROM unnest($1::int[], $2::int[]) AS backfill(id, content_type)"
+                                     " WHERE guild_tags.id = backfill.id",
+                                     [record['id'] for record in tags], content_types)
+            print(f"Set the content type of {len(tags)} tags.")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+    print("Migration complete.")
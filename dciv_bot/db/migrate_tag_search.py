@@ -0,0 +1,37 @@
+import asyncio
+import asyncpg
+
+from dciv_bot.config import token
+
+"""Add the trigram indexes used by -tag search to an existing database.
+
+schema.sql creates these indexes too, but it would lock guild_tags and guild_tags_alias against writes while they are
+built. This builds them concurrently instead, run it before starting the new version of the bot."""
+
+
+async def get_db():
+    return await asyncpg.create_pool(user=token.POSTGRESQL_USER,
+                                     password=token.POSTGRESQL_PASSWORD,
+                                     database=token.POSTGRESQL_DATABASE,
+                                     host=token.POSTGRESQL_HOST)
+
+
+async def main():
+    db = await get_db()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    async with db.acquire() as connection:
+        await connection.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+        await connection.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS guild_tags_alias_alias_trgm_idx "
+                                 "ON guild_tags_alias USING gin (alias gin_trgm_ops);")
+        print("Added trigram index on guild_tags_alias.alias.")
+
+        await connection.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS guild_tags_title_trgm_idx "
+                                 "ON guild_tags USING gin (title gin_trgm_ops);")
+        print("Added trigram index on guild_tags.title.")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+    print("Migration complete.")
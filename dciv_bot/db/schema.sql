@@ -93,6 +93,7 @@ CREATE TABLE IF NOT EXISTS legislature_tags(
 
 CREATE INDEX IF NOT EXISTS legislature_tags_tag_trgm_idx ON legislature_tags USING gin (tag gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS legislature_bills_name_lower_idx ON legislature_bills (LOWER(bill_name));
+CREATE INDEX IF NOT EXISTS legislature_bills_leg_session_idx ON legislature_bills (leg_session);
 
 CREATE TABLE IF NOT EXISTS legislature_motions(
     id serial UNIQUE PRIMARY KEY,
@@ -103,6 +104,8 @@ CREATE TABLE IF NOT EXISTS legislature_motions(
     submitter bigint
 );
 
+CREATE INDEX IF NOT EXISTS legislature_motions_leg_session_idx ON legislature_motions (leg_session);
+
 CREATE TABLE IF NOT EXISTS guild_tags(
     guild_id bigint references guilds(id),
     id serial UNIQUE,
@@ -113,10 +116,16 @@ CREATE TABLE IF NOT EXISTS guild_tags(
     author bigint,
     uses int DEFAULT 0,
     is_embedded bool DEFAULT TRUE,
+    content_type int,
     PRIMARY KEY (guild_id, id),
     UNIQUE (guild_id, name)
 );
 
+-- Columns that were added after the table was first created. The cache invalidation trigger below needs them, and
+-- the content types of existing tags are filled in by migrate_tag_content_type.py
+ALTER TABLE guild_tags ADD COLUMN IF NOT EXISTS is_embedded bool DEFAULT TRUE;
+ALTER TABLE guild_tags ADD COLUMN IF NOT EXISTS content_type int;
+
 CREATE TABLE IF NOT EXISTS guild_tags_alias(
     tag_id serial references guild_tags(id) ON DELETE CASCADE,
     guild_id bigint references guilds(id),
@@ -127,6 +136,8 @@ CREATE TABLE IF NOT EXISTS guild_tags_alias(
 
 CREATE INDEX IF NOT EXISTS guild_tags_alias_alias_idx ON guild_tags_alias (alias);
 CREATE UNIQUE INDEX IF NOT EXISTS guild_tags_alias_alias_guild_id_idx ON guild_tags_alias (alias, guild_id);
+CREATE INDEX IF NOT EXISTS guild_tags_alias_alias_trgm_idx ON guild_tags_alias USING gin (alias gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS guild_tags_title_trgm_idx ON guild_tags USING gin (title gin_trgm_ops);
 
 
 CREATE TABLE IF NOT EXISTS original_join_dates(
@@ -164,4 +175,60 @@ CREATE TABLE IF NOT EXISTS starboard_starrers(
     entry_id serial references starboard_entries(id) ON DELETE CASCADE,
     starrer_id bigint,
     UNIQUE (entry_id, starrer_id)
-);
\ No newline at end of file
+);
+
+-- Tell every running instance of the bot that a row in a cached table changed, so that it can refresh its cache.
+-- The payload holds the table, the operation, the key columns given as trigger arguments and the application_name
+-- of the connection that made the change, so that a bot can ignore its own changes.
+CREATE OR REPLACE FUNCTION notify_cache_invalidation() RETURNS trigger AS $$
+DECLARE
+    changed_row jsonb;
+    keys jsonb := '{}'::jsonb;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := to_jsonb(OLD);
+    ELSE
+        changed_row := to_jsonb(NEW);
+    END IF;
+
+    FOR i IN 0 .. TG_NARGS - 1 LOOP
+        keys := keys || jsonb_build_object(TG_ARGV[i], changed_row -> TG_ARGV[i]);
+    END LOOP;
+
+    PERFORM pg_notify('cache_invalidation', json_build_object('table', TG_TABLE_NAME,
+                                                              'operation', TG_OP,
+                                                              'keys', keys,
+                                                              'origin', current_setting('application_name'))::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS guilds_cache_invalidation ON guilds;
+CREATE TRIGGER guilds_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON guilds
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('id');
+
+-- Not on 'uses', that is updated all the time and nothing caches it
+DROP TRIGGER IF EXISTS guild_tags_cache_invalidation ON guild_tags;
+CREATE TRIGGER guild_tags_cache_invalidation
+    AFTER INSERT OR DELETE OR UPDATE OF guild_id, id, name, title, content, global, author, is_embedded, content_type
+    ON guild_tags FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('id');
+
+DROP TRIGGER IF EXISTS guild_tags_alias_cache_invalidation ON guild_tags_alias;
+CREATE TRIGGER guild_tags_alias_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON guild_tags_alias
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('tag_id');
+
+DROP TRIGGER IF EXISTS parties_cache_invalidation ON parties;
+CREATE TRIGGER parties_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON parties
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('id');
+
+DROP TRIGGER IF EXISTS party_alias_cache_invalidation ON party_alias;
+CREATE TRIGGER party_alias_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON party_alias
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('party_id');
+
+DROP TRIGGER IF EXISTS roles_cache_invalidation ON roles;
+CREATE TRIGGER roles_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON roles
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('guild_id', 'role_id');
+
+DROP TRIGGER IF EXISTS dm_settings_cache_invalidation ON dm_settings;
+CREATE TRIGGER dm_settings_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON dm_settings
+    FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation('user_id');
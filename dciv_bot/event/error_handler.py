@@ -1,7 +1,6 @@
 import asyncio
 import traceback
 import dciv_bot.util.utils as utils
-import dciv_bot.util.levenshtein as levenshtein
 import dciv_bot.util.exceptions as exceptions
 
 from dciv_bot.util import mk
@@ -34,9 +33,9 @@ class ErrorHandler(commands.Cog):
             await ctx.send(embed=local_embed)
 
         if to_log_channel:
-            log_channel = await utils.get_logging_channel(self.bot, ctx.guild)
+            log_channel = utils.get_logging_channel(self.bot, ctx.guild)
 
-            if await self.bot.checks.is_logging_enabled(ctx.guild.id):
+            if self.bot.checks.is_logging_enabled(ctx.guild.id):
                 if log_channel is not None:
                     await log_channel.send(embed=embed)
 
@@ -141,15 +140,18 @@ class ErrorHandler(commands.Cog):
                 return
 
             message = f":x: There is no command called `{ctx.invoked_with}`."
-            if self.bot.commands:
-                async with ctx.typing():
-                    closest_alias = min(*self.bot.all_commands.keys(), key=lambda cmd: levenshtein.distance(cmd, ctx.invoked_with))
-                    closest_name = self.bot.all_commands.get(closest_alias).name
-                    if closest_alias == closest_name:
-                        message += f" Did you mean `{ctx.prefix}{closest_alias}`?"
-                    else:
-                        message += f" Did you mean `{ctx.prefix}{closest_alias}`, an alias of the `{ctx.prefix}{closest_name}` command?"
-            
+
+            # Don't suggest commands that have barely anything in common with what was typed
+            closest_alias = self.bot.command_suggestions.closest(ctx.invoked_with.lower(),
+                                                                 max_distance=max(2, len(ctx.invoked_with) // 2))
+
+            if closest_alias is not None:
+                closest_name = self.bot.all_commands.get(closest_alias).name
+                if closest_alias == closest_name:
+                    message += f" Did you mean `{ctx.prefix}{closest_alias}`?"
+                else:
+                    message += f" Did you mean `{ctx.prefix}{closest_alias}`, an alias of the `{ctx.prefix}{closest_name}` command?"
+
             await ctx.send(message)
             return
 
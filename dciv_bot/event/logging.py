@@ -25,7 +25,7 @@ class Log(commands.Cog):
             embed.set_thumbnail(url=thumbnail)
 
         # Send event embed to log channel
-        log_channel = await utils.get_logging_channel(self.bot, guild)
+        log_channel = utils.get_logging_channel(self.bot, guild)
 
         if log_channel is not None:
             await log_channel.send(embed=embed)
@@ -39,10 +39,10 @@ class Log(commands.Cog):
         if before.guild is None:
             return
 
-        if not await self.bot.checks.is_logging_enabled(before.guild.id):
+        if not self.bot.checks.is_logging_enabled(before.guild.id):
             return
 
-        if not await self.bot.checks.is_channel_excluded(before.guild.id, before.channel.id):
+        if not self.bot.checks.is_channel_excluded(before.guild.id, before.channel.id):
             if not before.clean_content or not after.clean_content:
                 return
 
@@ -69,10 +69,10 @@ class Log(commands.Cog):
         if message.guild is None:
             return
 
-        if not await self.bot.checks.is_logging_enabled(message.guild.id):
+        if not self.bot.checks.is_logging_enabled(message.guild.id):
             return
 
-        if not await self.bot.checks.is_channel_excluded(message.guild.id, message.channel.id):
+        if not self.bot.checks.is_channel_excluded(message.guild.id, message.channel.id):
             embed_fields = {
                 "Author": [f"{message.author.mention} {message.author}", True],
                 "Channel": [f"{message.channel.mention}", False]
@@ -87,10 +87,10 @@ class Log(commands.Cog):
     async def on_raw_bulk_message_delete(self, payload):
         guild = self.bot.get_guild(payload.guild_id)
 
-        if not await self.bot.checks.is_logging_enabled(guild.id):
+        if not self.bot.checks.is_logging_enabled(guild.id):
             return
 
-        if not await self.bot.checks.is_channel_excluded(guild.id, payload.channel_id):
+        if not self.bot.checks.is_channel_excluded(guild.id, payload.channel_id):
             channel = self.bot.get_channel(payload.channel_id)
 
             embed_fields = {
@@ -102,7 +102,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        if not await self.bot.checks.is_logging_enabled(member.guild.id):
+        if not self.bot.checks.is_logging_enabled(member.guild.id):
             return
 
         embed_fields = {
@@ -115,7 +115,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        if not await self.bot.checks.is_logging_enabled(member.guild.id):
+        if not self.bot.checks.is_logging_enabled(member.guild.id):
             return
 
         embed_fields = {
@@ -129,7 +129,7 @@ class Log(commands.Cog):
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         if before.display_name != after.display_name:
-            if not await self.bot.checks.is_logging_enabled(before.guild.id):
+            if not self.bot.checks.is_logging_enabled(before.guild.id):
                 return
 
             embed_fields = {
@@ -143,7 +143,7 @@ class Log(commands.Cog):
                                  thumbnail=before.avatar_url_as(static_format="png"))
 
         elif before.roles != after.roles:
-            if not await self.bot.checks.is_logging_enabled(before.guild.id):
+            if not self.bot.checks.is_logging_enabled(before.guild.id):
                 return
 
             if len(before.roles) < len(after.roles):
@@ -180,7 +180,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
-        if not await self.bot.checks.is_logging_enabled(guild.id):
+        if not self.bot.checks.is_logging_enabled(guild.id):
             return
 
         embed_fields = {
@@ -193,7 +193,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
-        if not await self.bot.checks.is_logging_enabled(guild.id):
+        if not self.bot.checks.is_logging_enabled(guild.id):
             return
 
         embed_fields = {
@@ -223,7 +223,7 @@ class Log(commands.Cog):
 
         # Add new guild to database
         await self.bot.db.execute("INSERT INTO guilds (id) VALUES ($1) ON CONFLICT DO NOTHING ", guild.id)
-        await self.bot.cache.update_guild_config_cache()
+        await self.bot.cache.refresh_guild_config(guild.id)
 
         try:
             await introduction_channel.send(embed=embed)
@@ -232,7 +232,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role):
-        if not await self.bot.checks.is_logging_enabled(role.guild.id):
+        if not self.bot.checks.is_logging_enabled(role.guild.id):
             return
 
         # Handle exception if bot was just added to new guild
@@ -250,7 +250,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
-        if not await self.bot.checks.is_logging_enabled(role.guild.id):
+        if not self.bot.checks.is_logging_enabled(role.guild.id):
             return
 
         embed_fields = {
@@ -263,7 +263,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
-        if not await self.bot.checks.is_logging_enabled(channel.guild.id):
+        if not self.bot.checks.is_logging_enabled(channel.guild.id):
             return
 
         embed_fields = {
@@ -275,7 +275,7 @@ class Log(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
-        if not await self.bot.checks.is_logging_enabled(channel.guild.id):
+        if not self.bot.checks.is_logging_enabled(channel.guild.id):
             return
 
         embed_fields = {
@@ -285,7 +285,9 @@ class Log(commands.Cog):
 
         await self.log_event(channel.guild, ':exclamation:  Channel Deleted', embed_fields)
 
+    @commands.Cog.listener()
     async def on_guild_remove(self, guild):
+        self.bot.cache.evict_guild_config(guild.id)
         await self.bot.owner.send(f":warning:  I was removed from {guild.name} ({guild.id}).")
 
 
@@ -1,10 +1,10 @@
 import html
 import typing
-import asyncio
 
 import dciv_bot.util.exceptions as exceptions
 
 from dciv_bot.config import config
+from dciv_bot.util import statements
 from discord.ext import tasks, commands
 
 
@@ -58,11 +58,8 @@ class Reddit(commands.Cog):
 
             _id = reddit_post['id']
 
-            # Try to add post id to database
-            status = await self.bot.db.execute("INSERT INTO reddit_posts (id) VALUES ($1) ON CONFLICT DO NOTHING", _id)
-
-            # ID already in database -> post already seen
-            if status == "INSERT 0 0":
+            # Try to add post id to database, ID already in database -> post already seen
+            if not await statements.mark_as_seen(self.bot.db, 'reddit_posts', _id):
                 continue
 
             _title = reddit_post['title']
@@ -88,11 +85,9 @@ class Reddit(commands.Cog):
 
     @reddit_task.before_loop
     async def before_reddit_task(self):
-        await self.bot.wait_until_ready()
-
-        # Delay first run of task until Democraciv Guild has been found
-        if self.bot.democraciv_guild_object is None:
-            await asyncio.sleep(5)
+        # Delay first run of task until the Democraciv guild has been found and the database is ready
+        await self.bot.guild_ready.wait()
+        await self.bot.db_ready.wait()
 
 
 def setup(bot):
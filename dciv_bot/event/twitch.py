@@ -4,7 +4,7 @@ import asyncio
 
 import dciv_bot.util.exceptions as exceptions
 
-from dciv_bot.util import mk
+from dciv_bot.util import mk, statements
 from discord.ext import tasks, commands
 from dciv_bot.config import token, config
 
@@ -66,11 +66,8 @@ class Twitch(commands.Cog):
 
         else:
             # Streamer is currently live
-            status = await self.bot.db.execute("INSERT INTO twitch_streams (id) VALUES ($1) ON CONFLICT DO NOTHING",
-                                               _stream_id)
-
             # ID already in database -> stream already announced
-            if status == "INSERT 0 0":
+            if not await statements.mark_as_seen(self.bot.db, 'twitch_streams', _stream_id):
                 return self.StreamStatus.LIVE_AND_ANNOUNCED
 
             # Get thumbnail in right size
@@ -136,11 +133,9 @@ class Twitch(commands.Cog):
 
     @twitch_task.before_loop
     async def before_twitch_task(self):
-        await self.bot.wait_until_ready()
-
-        # Delay first run of task until Democraciv Guild has been found
-        if self.bot.democraciv_guild_object is None:
-            await asyncio.sleep(5)
+        # Delay first run of task until the Democraciv guild has been found and the database is ready
+        await self.bot.guild_ready.wait()
+        await self.bot.db_ready.wait()
 
     async def streaming_rules_reminder(self):
         executive_channel = mk.get_democraciv_channel(self.bot, mk.DemocracivChannel.EXECUTIVE_CHANNEL)
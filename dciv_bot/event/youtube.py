@@ -1,7 +1,6 @@
 import typing
-import asyncio
 
-from dciv_bot.util import exceptions
+from dciv_bot.util import exceptions, statements
 from discord.ext import tasks, commands
 from dciv_bot.config import token, config
 
@@ -52,10 +51,8 @@ class YouTube(commands.Cog):
         except (IndexError, KeyError):
             return None
 
-        status = await self.bot.db.execute("INSERT INTO youtube_streams (id) VALUES ($1) ON CONFLICT DO NOTHING", _id)
-
         # ID already in database -> stream already announced
-        if status == "INSERT 0 0":
+        if not await statements.mark_as_seen(self.bot.db, 'youtube_streams', _id):
             return None
 
         async with self.bot.session.get(f"https://www.googleapis.com/youtube/v3/videos?part=snippet&"
@@ -152,12 +149,8 @@ class YouTube(commands.Cog):
 
             _id = youtube_video["snippet"]["resourceId"]["videoId"]
 
-            # Try to add post id to database
-            status = await self.bot.db.execute("INSERT INTO youtube_uploads (id) VALUES ($1) ON CONFLICT DO NOTHING",
-                                               _id)
-
-            # ID already in database -> post already seen
-            if status == "INSERT 0 0":
+            # Try to add post id to database, ID already in database -> post already seen
+            if not await statements.mark_as_seen(self.bot.db, 'youtube_uploads', _id):
                 continue
 
             title = youtube_video['snippet']['title']
@@ -189,19 +182,15 @@ class YouTube(commands.Cog):
 
     @youtube_upload_tasks.before_loop
     async def before_upload_task(self):
-        await self.bot.wait_until_ready()
-
-        # Delay first run of task until Democraciv Guild has been found
-        if self.bot.democraciv_guild_object is None:
-            await asyncio.sleep(5)
+        # Delay first run of task until the Democraciv guild has been found and the database is ready
+        await self.bot.guild_ready.wait()
+        await self.bot.db_ready.wait()
 
     @youtube_stream_task.before_loop
     async def before_stream_task(self):
-        await self.bot.wait_until_ready()
-
-        # Delay first run of task until Democraciv Guild has been found
-        if self.bot.democraciv_guild_object is None:
-            await asyncio.sleep(5)
+        # Delay first run of task until the Democraciv guild has been found and the database is ready
+        await self.bot.guild_ready.wait()
+        await self.bot.db_ready.wait()
 
 
 def setup(bot):
@@ -1,4 +1,5 @@
-from dciv_bot.util.converter import Law
+from dciv_bot.util.cache import caches
+from dciv_bot.util.converter import Law, invalidate_bill
 from discord.ext import commands
 from jishaku.cog import JishakuBase, jsk
 from jishaku.metacog import GroupCogMeta
@@ -33,8 +34,23 @@ class Admin(JishakuBase, metaclass=GroupCogMeta, command_parent=jsk, command_att
     async def lawtag(self, ctx, law: Law, tag: str):
         """Add a search tag to a law to be used in `-laws search`"""
         await self.bot.db.execute("INSERT INTO legislature_tags (id, tag) VALUES ($1, $2)", law.id, tag.lower())
+        invalidate_bill(self.bot, law.bill.id)
         await ctx.send(f":white_check_mark: `{tag}` was added as a search tag to `{law.bill.name}` (#{law.id})")
 
+    @commands.command(name='cache')
+    @commands.is_owner()
+    async def cache(self, ctx):
+        """See how well the caches are doing"""
+
+        lines = []
+
+        for name, cache in {'legislature': self.bot.cache.legislature, **caches}.items():
+            lines.append(f"{name:<22} {len(cache):>4}/{cache.max_size:<4} {cache.hits:>6} {cache.misses:>6} "
+                         f"{cache.evictions:>6} {cache.hit_rate:>7.1%}")
+
+        await ctx.send(f"```{'Cache':<22} {'Size':>9} {'Hits':>6} {'Misses':>6} {'Evict.':>6} {'Rate':>7}\n"
+                       + "\n".join(lines) + "```")
+
 
 def setup(bot):
     bot.add_cog(Admin(bot))
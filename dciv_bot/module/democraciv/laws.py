@@ -257,10 +257,7 @@ class Laws(commands.Cog, name='Law'):
             async with self.bot.db.acquire() as con:
                 results = await self.bot.laws.search_law_by_name(name, connection=con)
 
-                # Set word similarity threshold for search by tag
-                await self.bot.laws.update_pg_trgm_similarity_threshold(0.4, connection=con)
-
-                # Then, search by tag similarity
+                # Then, search by tag similarity. The similarity threshold for that is set by pool.server_settings
                 for substring in query:
                     if len(substring) < 3 or substring in self.illegal_tags:
                         continue
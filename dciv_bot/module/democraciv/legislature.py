@@ -12,7 +12,8 @@ from dciv_bot.util import mk, exceptions, utils
 from discord.ext.commands import Greedy
 from dciv_bot.util.paginator import AlternativePages
 from dciv_bot.util.law_helper import AnnouncementQueue
-from dciv_bot.util.converter import Session, SessionStatus, Bill, Motion, Law, CaseInsensitiveMember, PoliticalParty, BillStatus
+from dciv_bot.util.converter import Session, SessionStatus, Bill, Motion, Law, CaseInsensitiveMember, PoliticalParty, BillStatus, \
+    invalidate_session
 
 
 class PassScheduler(AnnouncementQueue):
@@ -84,9 +85,8 @@ class Legislature(commands.Cog):
     def legislator_role(self) -> typing.Optional[discord.Role]:
         return mk.get_democraciv_role(self.bot, mk.DemocracivRole.LEGISLATOR_ROLE)
 
-    async def dm_legislators(self, message: str, reason: str):
-        for legislator in self.legislator_role.members:
-            await self.bot.safe_send_dm(target=legislator, reason=reason, message=message)
+    def dm_legislators(self, message: str, reason: str):
+        self.bot.dms.queue(self.legislator_role.members, reason=reason, message=message)
 
     def is_cabinet(self, member: discord.Member) -> bool:
         if self.speaker_role in member.roles or self.vice_speaker_role in member.roles:
@@ -140,8 +140,7 @@ class Legislature(commands.Cog):
 
             pretty = []
 
-            for record in all_bills:
-                _bill = await Bill.convert(ctx, record['id'])
+            for _bill in await Bill.convert_many(ctx, [record['id'] for record in all_bills]):
                 pretty.append(f"Bill #{_bill.id} - [{_bill.name}]({_bill.link}) "
                               f"{await _bill.get_emojified_status(verbose=False)}")
 
@@ -201,8 +200,7 @@ class Legislature(commands.Cog):
         found_bills = await self.bot.db.fetch(sql_query, query.lower())
         pretty = []
 
-        for record in found_bills:
-            _bill = await Bill.convert(ctx, record['id'])
+        for _bill in await Bill.convert_many(ctx, [record['id'] for record in found_bills]):
             pretty.append(f"Bill #{_bill.id} - [{_bill.name}]({_bill.link}) "
                           f"{await _bill.get_emojified_status(verbose=False)}")
 
@@ -242,8 +240,7 @@ class Legislature(commands.Cog):
 
         pretty = []
 
-        for record in bills_from_person:
-            _bill = await Bill.convert(ctx, record['id'])
+        for _bill in await Bill.convert_many(ctx, [record['id'] for record in bills_from_person]):
             pretty.append(f"Bill #{_bill.id} - [{_bill.name}]({_bill.link}) "
                           f"{await _bill.get_emojified_status(verbose=False)}")
 
@@ -370,8 +367,7 @@ class Legislature(commands.Cog):
         found_motions = await self.bot.db.fetch(sql_query, query.lower())
         pretty = []
 
-        for record in found_motions:
-            _motion = await Motion.convert(ctx, record['id'])
+        for _motion in await Motion.convert_many(ctx, [record['id'] for record in found_motions]):
             pretty.append(f"Motion #{_motion.id} - [{_motion.title}]({_motion.link})")
 
         pretty = pretty or ["Nothing found."]
@@ -402,10 +398,10 @@ class Legislature(commands.Cog):
                                                   f"#{new_session} has started! Bills and motions can be "
                                                   f"submitted with `-legislature submit`.")
 
-        await self.dm_legislators(reason="leg_session_open",
-                                  message=f":envelope_with_arrow: The **submission period** for Legislative Session "
-                                          f" #{new_session} has started! Submit your bills and motions with "
-                                          f"`-legislature submit` on the Democraciv server.")
+        self.dm_legislators(reason="leg_session_open",
+                            message=f":envelope_with_arrow: The **submission period** for Legislative Session "
+                                    f" #{new_session} has started! Submit your bills and motions with "
+                                    f"`-legislature submit` on the Democraciv server.")
 
     @legislature.command(name='updatesession', aliases=['us'])
     @commands.cooldown(1, config.BOT_COMMAND_COOLDOWN, commands.BucketType.user)
@@ -439,9 +435,9 @@ class Legislature(commands.Cog):
                                                   f"Session #{active_leg_session.id} "
                                                   f"has started!\nVote Form: <{voting_form}>")
 
-        await self.dm_legislators(reason="leg_session_update",
-                                  message=f":ballot_box: The **voting period** for Legislative Session "
-                                          f"#{active_leg_session.id} has started!\nVote here: {voting_form}")
+        self.dm_legislators(reason="leg_session_update",
+                            message=f":ballot_box: The **voting period** for Legislative Session "
+                                    f"#{active_leg_session.id} has started!\nVote here: {voting_form}")
 
     @legislature.command(name='closesession', aliases=['cs'])
     @commands.cooldown(1, config.BOT_COMMAND_COOLDOWN, commands.BucketType.user)
@@ -456,11 +452,6 @@ class Legislature(commands.Cog):
 
         await active_leg_session.close()
 
-        #  Update all bills that did not pass
-        await self.bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE leg_session = $2",
-                                  BillStatus.LEG_FAILED.value,
-                                  active_leg_session.id)
-
         await ctx.send(f":white_check_mark: Session #{active_leg_session.id} was closed. "
                        f"Check `-help legislature pass` on what to do next.")
 
@@ -487,13 +478,11 @@ class Legislature(commands.Cog):
             m_ids = list()
             m_hyperlinks = list()
 
-            for bill_id in session.bills:
-                bill = await Bill.convert(ctx, bill_id)
+            for bill in await Bill.convert_many(ctx, session.bills):
                 b_ids.append(f"Bill #{bill.id}")
                 b_hyperlinks.append(f'=HYPERLINK("{bill.link}"; "{bill.name}")')
 
-            for motion_id in session.motions:
-                motion = await Motion.convert(ctx, motion_id)
+            for motion in await Motion.convert_many(ctx, session.motions):
                 m_ids.append(f"Motion #{motion.id}")
                 m_hyperlinks.append(f'=HYPERLINK("{motion.link}"; "{motion.name}")')
 
@@ -546,8 +535,8 @@ class Legislature(commands.Cog):
                            f"\n:arrows_counterclockwise: This may take a few minutes...")
 
             async with ctx.typing():
-                bills = {b.name: b.link for b in [await Bill.convert(ctx, _b) for _b in session.bills]}
-                motions = {m.name: m.link for m in [await Motion.convert(ctx, _m) for _m in session.motions]}
+                bills = {b.name: b.link for b in await Bill.convert_many(ctx, session.bills)}
+                motions = {m.name: m.link for m in await Motion.convert_many(ctx, session.motions)}
 
                 result = await self.bot.google_api.run_apps_script(script_id="MME1GytLY6YguX02rrXqPiGqnXKElby-M",
                                                                    function="generate_form",
@@ -668,8 +657,7 @@ class Legislature(commands.Cog):
 
         if len(session.motions) > 0:
             pretty_motions = []
-            for motion_id in session.motions:
-                motion = await Motion.convert(ctx, motion_id)
+            for motion in await Motion.convert_many(ctx, session.motions):
                 pretty_motions.append(f"Motion #{motion.id} - [{motion.short_name}]({motion.link})")
         else:
             pretty_motions = ["-"]
@@ -677,8 +665,7 @@ class Legislature(commands.Cog):
         if len(session.bills) > 0:
             pretty_bills = []
 
-            for bill_id in session.bills:
-                bill = await Bill.convert(ctx, bill_id)
+            for bill in await Bill.convert_many(ctx, session.bills):
                 if await bill.is_law():
                     pretty_bills.append(f"__Bill #{bill.id}__ - [{bill.short_name}]({bill.tiny_link})")
                 else:
@@ -813,6 +800,8 @@ class Legislature(commands.Cog):
                 await ctx.send(":x: A bill with the same exact Google Docs Document was already submitted!")
                 return None, None
 
+            invalidate_session(self.bot, current_leg_session_id)
+
             message = "Hey! A new **bill** was just submitted."
             embed = self.bot.embeds.embed_builder(title="Bill Submitted", description="", time_stamp=True)
             embed.add_field(name="Title", value=bill_title, inline=False)
@@ -863,6 +852,7 @@ class Legislature(commands.Cog):
                 "INSERT INTO legislature_motions (leg_session, title, description, submitter, hastebin) "
                 "VALUES ($1, $2, $3, $4, $5)",
                 current_leg_session_id, title, description, ctx.author.id, haste_bin_url)
+            invalidate_session(self.bot, current_leg_session_id)
 
             message = "Hey! A new **motion** was just submitted."
             embed = self.bot.embeds.embed_builder(title="Motion Submitted", description="", time_stamp=True)
@@ -6,7 +6,7 @@ from dciv_bot.util.flow import Flow
 from discord.ext import commands
 from dciv_bot.config import config
 from dciv_bot.util import mk, exceptions, utils
-from dciv_bot.util.converter import PoliticalParty
+from dciv_bot.util.converter import PoliticalParty, invalidate_parties
 from dciv_bot.util.exceptions import ForbiddenTask
 
 
@@ -17,6 +17,11 @@ class Party(commands.Cog, name='Political Parties'):
     def __init__(self, bot):
         self.bot = bot
 
+    @commands.Cog.listener()
+    async def on_cache_invalidation(self, table: typing.Optional[str], operation: typing.Optional[str], keys: dict):
+        if table in (None, 'parties', 'party_alias'):
+            invalidate_parties()
+
     async def collect_parties_and_members(self) -> typing.List[typing.Tuple[str, int]]:
         """Returns all parties with a role on the Democraciv server and their amount of members for -members."""
         parties_and_members = []
@@ -250,11 +255,13 @@ class Party(commands.Cog, name='Political Parties'):
                                          " ON CONFLICT DO NOTHING ",
                                          discord_role.name.lower(), discord_role.id)
 
-                if not is_updated:
-                    await ctx.send(f':white_check_mark: `{discord_role.name}` was added as a new party.')
-                else:
-                    await ctx.send(f':white_check_mark: `{discord_role.name}` was added as a new party or its '
-                                   f'properties were updated if it already existed.')
+        invalidate_parties()
+
+        if not is_updated:
+            await ctx.send(f':white_check_mark: `{discord_role.name}` was added as a new party.')
+        else:
+            await ctx.send(f':white_check_mark: `{discord_role.name}` was added as a new party or its '
+                           f'properties were updated if it already existed.')
 
         return await PoliticalParty.convert(ctx, discord_role.id)
 
@@ -284,6 +291,8 @@ class Party(commands.Cog, name='Political Parties'):
                 await connection.execute("DELETE FROM party_alias WHERE party_id = $1", party.role.id)
                 await connection.execute("DELETE FROM parties WHERE id = $1", party.role.id)
 
+        invalidate_parties()
+
         if hard:
             try:
                 await party.role.delete()
@@ -312,6 +321,8 @@ class Party(commands.Cog, name='Political Parties'):
                 status = await connection.execute("INSERT INTO party_alias (alias, party_id) VALUES ($1, $2)",
                                                   alias.lower(), party.role.id)
 
+        invalidate_parties()
+
         if status == "INSERT 0 1":
             await ctx.send(f':white_check_mark: Alias `{alias}` for party '
                            f'`{party.role.name}` was added.')
@@ -327,6 +338,7 @@ class Party(commands.Cog, name='Political Parties'):
             return await ctx.send(f":x: `{alias}` is not an alias of any party.")
 
         await self.bot.db.execute("DELETE FROM party_alias WHERE alias = $1", alias.lower())
+        invalidate_parties()
         await ctx.send(f':white_check_mark: Alias `{alias}` was deleted.')
 
     @party.command(name='merge')
@@ -390,6 +402,7 @@ class Party(commands.Cog, name='Political Parties'):
                         await connection.execute("DELETE FROM party_alias WHERE party_id = $1", party.role.id)
                         await connection.execute("DELETE FROM parties WHERE id = $1", party.role.id)
 
+                invalidate_parties()
                 await party.role.delete()
 
         await ctx.send(":white_check_mark: The old parties were deleted and"
@@ -29,10 +29,10 @@ class Guild(commands.Cog, name="Server"):
     async def guild(self, ctx):
         """Statistics and information about this server"""
 
-        is_welcome_enabled = self.emojiy_settings(await self.bot.checks.is_welcome_message_enabled(ctx.guild.id))
-        is_logging_enabled = self.emojiy_settings(await self.bot.checks.is_logging_enabled(ctx.guild.id))
-        is_default_role_enabled = self.emojiy_settings(await self.bot.checks.is_default_role_enabled(ctx.guild.id))
-        is_tag_creation_allowed = self.emojiy_settings(await self.bot.checks.is_tag_creation_allowed(ctx.guild.id))
+        is_welcome_enabled = self.emojiy_settings(self.bot.checks.is_welcome_message_enabled(ctx.guild.id))
+        is_logging_enabled = self.emojiy_settings(self.bot.checks.is_logging_enabled(ctx.guild.id))
+        is_default_role_enabled = self.emojiy_settings(self.bot.checks.is_default_role_enabled(ctx.guild.id))
+        is_tag_creation_allowed = self.emojiy_settings(self.bot.checks.is_tag_creation_allowed(ctx.guild.id))
 
         excluded_channels = await self.bot.db.fetchval("SELECT logging_excluded FROM guilds WHERE id = $1",
                                                        ctx.guild.id)
@@ -55,10 +55,10 @@ class Guild(commands.Cog, name="Server"):
 
     @commands.Cog.listener(name="on_member_join")
     async def welcome_message_listener(self, member):
-        if not await self.bot.checks.is_welcome_message_enabled(member.guild.id):
+        if not self.bot.checks.is_welcome_message_enabled(member.guild.id):
             return
 
-        welcome_channel = await utils.get_welcome_channel(self.bot, member.guild)
+        welcome_channel = utils.get_welcome_channel(self.bot, member.guild)
 
         if welcome_channel is not None:
             welcome_message = (await self.bot.db.fetchval("SELECT welcome_message FROM guilds WHERE id = $1",
@@ -71,8 +71,8 @@ class Guild(commands.Cog, name="Server"):
     async def welcome(self, ctx):
         """Add a welcome message that every new member will see once they join this server"""
 
-        is_welcome_enabled = await self.bot.checks.is_welcome_message_enabled(ctx.guild.id)
-        current_welcome_channel = await utils.get_welcome_channel(self.bot, ctx.guild)
+        is_welcome_enabled = self.bot.checks.is_welcome_message_enabled(ctx.guild.id)
+        current_welcome_channel = utils.get_welcome_channel(self.bot, ctx.guild)
         current_welcome_message = await self.bot.db.fetchval("SELECT welcome_message FROM guilds WHERE id = $1",
                                                              ctx.guild.id)
 
@@ -144,7 +144,7 @@ class Guild(commands.Cog, name="Server"):
                 await self.bot.db.execute("UPDATE guilds SET welcome = false WHERE id = $1", ctx.guild.id)
                 await ctx.send(":white_check_mark: Welcome messages were disabled.")
 
-            await self.bot.cache.update_guild_config_cache()
+            await self.bot.cache.refresh_guild_config(ctx.guild.id)
 
     @guild.command(name='logs', aliases=['log', 'logging'])
     @commands.guild_only()
@@ -152,8 +152,8 @@ class Guild(commands.Cog, name="Server"):
     async def logs(self, ctx):
         """Log important events like message edits & deletions and more to a specific channel"""
 
-        is_logging_enabled = await self.bot.checks.is_logging_enabled(ctx.guild.id)
-        current_logging_channel = await utils.get_logging_channel(self.bot, ctx.guild)
+        is_logging_enabled = self.bot.checks.is_logging_enabled(ctx.guild.id)
+        current_logging_channel = utils.get_logging_channel(self.bot, ctx.guild)
 
         if current_logging_channel is None:
             current_logging_channel = "-"
@@ -202,7 +202,7 @@ class Guild(commands.Cog, name="Server"):
                 await self.bot.db.execute("UPDATE guilds SET logging = false WHERE id = $1", ctx.guild.id)
                 await ctx.send(":white_check_mark: Event logging was disabled.")
 
-            await self.bot.cache.update_guild_config_cache()
+            await self.bot.cache.refresh_guild_config(ctx.guild.id)
 
     @guild.command(name='exclude')
     @commands.guild_only()
@@ -215,7 +215,7 @@ class Guild(commands.Cog, name="Server"):
                 `-server exclude` to see all excluded channels
                 `-server exclude <channel>` to add/remove a channel to/from the excluded channels list
         """
-        current_logging_channel = await utils.get_logging_channel(self.bot, ctx.guild)
+        current_logging_channel = utils.get_logging_channel(self.bot, ctx.guild)
 
         if current_logging_channel is None:
             return await ctx.send(":x: This server currently has no logging channel."
@@ -262,7 +262,7 @@ class Guild(commands.Cog, name="Server"):
                     ctx.guild.id, channel_object.id)
 
                 if remove_status == "UPDATE 1":
-                    await self.bot.cache.update_guild_config_cache()
+                    await self.bot.cache.refresh_guild_config(ctx.guild.id)
                     return await ctx.send(f":white_check_mark: {channel_object.mention} is no longer excluded from"
                                           f" showing up in {current_logging_channel.mention}.")
 
@@ -273,11 +273,11 @@ class Guild(commands.Cog, name="Server"):
             if add_status == "UPDATE 1":
                 await ctx.send(f":white_check_mark: Excluded channel {channel_object.mention} from showing up in "
                                f"{current_logging_channel.mention}.")
-                await self.bot.cache.update_guild_config_cache()
+                await self.bot.cache.refresh_guild_config(ctx.guild.id)
 
     @commands.Cog.listener(name="on_member_join")
     async def default_role_listener(self, member):
-        if not await self.bot.checks.is_default_role_enabled(member.guild.id):
+        if not self.bot.checks.is_default_role_enabled(member.guild.id):
             return
 
         default_role = await self.bot.db.fetchval("SELECT defaultrole_role FROM guilds WHERE id = $1", member.guild.id)
@@ -295,7 +295,7 @@ class Guild(commands.Cog, name="Server"):
     async def defaultrole(self, ctx):
         """Give every new member a specific role once they join this server"""
 
-        is_default_role_enabled = await self.bot.checks.is_default_role_enabled(ctx.guild.id)
+        is_default_role_enabled = self.bot.checks.is_default_role_enabled(ctx.guild.id)
 
         current_default_role = await self.bot.db.fetchval("SELECT defaultrole_role FROM guilds WHERE id = $1",
                                                           ctx.guild.id)
@@ -364,7 +364,7 @@ class Guild(commands.Cog, name="Server"):
                 await self.bot.db.execute("UPDATE guilds SET defaultrole = false WHERE id = $1", ctx.guild.id)
                 await ctx.send(":white_check_mark: Disabled the default role.")
 
-            await self.bot.cache.update_guild_config_cache()
+            await self.bot.cache.refresh_guild_config(ctx.guild.id)
 
     @guild.command(name='tagcreation')
     @commands.guild_only()
@@ -372,7 +372,7 @@ class Guild(commands.Cog, name="Server"):
     async def tagcreation(self, ctx):
         """Allow everyone to make tags on this server, or just Administrators"""
 
-        is_allowed = await self.bot.checks.is_tag_creation_allowed(ctx.guild.id)
+        is_allowed = self.bot.checks.is_tag_creation_allowed(ctx.guild.id)
 
         pretty_is_allowed = "Only Administrators" if not is_allowed else "Everyone"
 
@@ -409,7 +409,7 @@ class Guild(commands.Cog, name="Server"):
                 await ctx.send(":white_check_mark: Only Administrators can now make"
                                " tags with `tag -add` on this server.")
 
-            await self.bot.cache.update_guild_config_cache()
+            await self.bot.cache.refresh_guild_config(ctx.guild.id)
 
 
 def setup(bot):
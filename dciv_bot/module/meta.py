@@ -4,6 +4,7 @@ import discord
 from bot import DemocracivBot
 from dciv_bot.config import config
 from discord.ext import commands
+from dciv_bot.util.cache import DMSettings
 from dciv_bot.util.help import PaginatedHelpCommand
 
 
@@ -73,21 +74,26 @@ class Meta(commands.Cog):
             commands_list.append(cmd)
         return len(commands_list), sorted(commands_list, key=lambda com: com.qualified_name)
 
-    async def ensure_dm_settings(self, user: int):
-        settings = await self.bot.db.fetchrow("SELECT * FROM dm_settings WHERE user_id = $1", user)
+    async def get_dm_settings(self, user: int) -> DMSettings:
+        return (await self.bot.cache.get_dm_settings([user]))[user]
 
-        if not settings:
-            settings = await self.bot.db.fetchrow("INSERT INTO dm_settings (user_id) VALUES ($1) RETURNING *", user)
+    async def set_dm_settings(self, user: int, **settings: bool):
+        """Saves the given dm_settings columns of a user, creating their row if needed, and updates the cache"""
 
-        return settings
+        columns = list(settings)
+        values = ", ".join(f"${i}" for i in range(2, len(columns) + 2))
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns)
+
+        record = await self.bot.db.fetchrow(f"INSERT INTO dm_settings (user_id, {', '.join(columns)}) "
+                                            f"VALUES ($1, {values}) ON CONFLICT (user_id) DO UPDATE SET {updates} "
+                                            f"RETURNING *", user, *settings.values())
+        self.bot.cache.update_dm_settings(record)
 
     async def toggle_dm_setting(self, user: int, setting: str):
-        settings = await self.ensure_dm_settings(user)
-        current_setting = settings[setting]
-        await self.bot.db.execute(f"UPDATE dm_settings SET {setting} = $1 WHERE user_id = $2",
-                                  not current_setting,
-                                  user)
-        return not current_setting
+        settings = await self.get_dm_settings(user)
+        new_setting = not getattr(settings, setting)
+        await self.set_dm_settings(user, **{setting: new_setting})
+        return new_setting
 
     @commands.group(name='dms', aliases=['dm', 'pm', 'dmsettings', 'dm-settings'], case_insensitive=True,
                     invoke_without_command=True)
@@ -96,13 +102,13 @@ class Meta(commands.Cog):
         """See your currently enabled DMs from me"""
 
         emojify_settings = self.bot.get_cog("Server").emojiy_settings
-        settings = await self.ensure_dm_settings(ctx.author.id)
+        settings = await self.get_dm_settings(ctx.author.id)
 
-        mute_kick_ban = emojify_settings(settings['ban_kick_mute'])
-        leg_session_open = emojify_settings(settings['leg_session_open'])
-        leg_session_update = emojify_settings(settings['leg_session_update'])
-        leg_session_submit = emojify_settings(settings['leg_session_submit'])
-        leg_session_withdraw = emojify_settings(settings['leg_session_withdraw'])
+        mute_kick_ban = emojify_settings(settings.ban_kick_mute)
+        leg_session_open = emojify_settings(settings.leg_session_open)
+        leg_session_update = emojify_settings(settings.leg_session_update)
+        leg_session_submit = emojify_settings(settings.leg_session_submit)
+        leg_session_withdraw = emojify_settings(settings.leg_session_withdraw)
 
         embed = self.bot.embeds.embed_builder(title=f"Direct Messages for {ctx.author.name}",
                                               description=f"Check `{config.BOT_PREFIX}help dms` for help on "
@@ -128,13 +134,8 @@ class Meta(commands.Cog):
     async def enableall(self, ctx):
         """Enable all DMs"""
 
-        await self.ensure_dm_settings(ctx.author.id)
-
-        await self.bot.db.execute("UPDATE dm_settings SET"
-                                  " ban_kick_mute = true, leg_session_open = true,"
-                                  " leg_session_update = true, leg_session_submit = true,"
-                                  " leg_session_withdraw = true"
-                                  " WHERE user_id = $1", ctx.author.id)
+        await self.set_dm_settings(ctx.author.id, ban_kick_mute=True, leg_session_open=True,
+                                   leg_session_update=True, leg_session_submit=True, leg_session_withdraw=True)
 
         await ctx.send(":white_check_mark: All DMs from me are now enabled.")
 
@@ -143,13 +144,8 @@ class Meta(commands.Cog):
     async def disableall(self, ctx):
         """Disable all DMs"""
 
-        await self.ensure_dm_settings(ctx.author.id)
-
-        await self.bot.db.execute("UPDATE dm_settings SET"
-                                  " ban_kick_mute = false, leg_session_open = false,"
-                                  " leg_session_update = false, leg_session_submit = false,"
-                                  " leg_session_withdraw = false"
-                                  " WHERE user_id = $1", ctx.author.id)
+        await self.set_dm_settings(ctx.author.id, ban_kick_mute=False, leg_session_open=False,
+                                   leg_session_update=False, leg_session_submit=False, leg_session_withdraw=False)
 
         await ctx.send(":white_check_mark: All DMs from me are now disabled.")
 
@@ -249,7 +245,7 @@ class Meta(commands.Cog):
         description_text = []
         field_text = []
 
-        hidden_cogs = ('Admin', 'ErrorHandler', 'Log', 'Reddit', 'YouTube', 'Twitch')
+        hidden_cogs = ('Admin', 'Performance', 'ErrorHandler', 'Log', 'Reddit', 'YouTube', 'Twitch')
         amounts = 0
         i = 0
         p = config.BOT_PREFIX
@@ -9,6 +9,7 @@ import re
 
 from dciv_bot.config import config
 from discord.ext import commands
+from dciv_bot.util.cache import cached
 from dciv_bot.util.paginator import AlternativePages
 from dciv_bot.util.converter import CaseInsensitiveRole, PoliticalParty, CaseInsensitiveMember
 
@@ -18,7 +19,6 @@ class Misc(commands.Cog, name="Miscellaneous"):
 
     def __init__(self, bot):
         self.bot = bot
-        self.cached_sorted_veterans_on_democraciv = []
 
     @commands.Cog.listener(name="on_member_join")
     async def original_join_position_listener(self, member):
@@ -185,47 +185,29 @@ class Misc(commands.Cog, name="Miscellaneous"):
         if isinstance(error, commands.BadUnionArgument):
             return
 
+    # Veterans rarely change, and calculating them for a guild other than Democraciv means sorting all its members
+    @cached('veterans', max_size=64, ttl=3600, key=lambda self, guild: guild.id)
+    async def get_veterans(self, guild: discord.Guild) -> typing.List[typing.Tuple[discord.abc.User, int]]:
+        """Returns the first 15 human members of a guild and their join positions, sorted by join position"""
+
+        if guild.id == self.bot.democraciv_guild_object.id:
+            vets = await self.bot.db.fetch("SELECT member, join_position FROM original_join_dates WHERE "
+                                           "join_position <= 15 ORDER BY join_position")
+            return [(self.bot.get_user(record['member']), record['join_position']) for record in vets]
+
+        # Veterans can only be human, exclude bot accounts
+        guild_members_without_bots = sorted((member for member in guild.members if not member.bot and member.joined_at),
+                                            key=operator.attrgetter("joined_at"))
+        return [(member, position) for position, member in enumerate(guild_members_without_bots[:15], start=1)]
+
     @commands.command(name='veterans')
     @commands.cooldown(1, config.BOT_COMMAND_COOLDOWN, commands.BucketType.user)
     @commands.guild_only()
     async def veterans(self, ctx):
         """List the first 15 members who joined this server"""
 
-        sorted_first_15_members = []
-
-        # As veterans rarely change, use a cached version of sorted list if exists
-        if ctx.guild.id == self.bot.democraciv_guild_object.id:
-            if len(self.cached_sorted_veterans_on_democraciv) >= 2:
-                sorted_first_15_members = self.cached_sorted_veterans_on_democraciv
-            else:
-                vets = await self.bot.db.fetch("SELECT member, join_position FROM original_join_dates WHERE "
-                                               "join_position <= 15 ORDER BY join_position")
-                for record in vets:
-                    member = self.bot.get_user(record['member'])
-                    sorted_first_15_members.append((member, record['join_position']))
-
-                self.cached_sorted_veterans_on_democraciv = sorted_first_15_members
-
-        # If cache is empty OR ctx not on democraciv guild, calculate & sort again
-        else:
-            async with ctx.typing():
-                guild_members_without_bots = [member for member in ctx.guild.members if not member.bot]
-
-                first_15_members = []
-
-                # Veterans can only be human, exclude bot accounts
-                for member in guild_members_without_bots:
-                    join_position, max_members = await self.get_member_join_position(member, guild_members_without_bots)
-
-                    if join_position <= 15:
-                        first_15_members.append((member, join_position))
-
-                # Sort by join position
-                sorted_first_15_members = sorted(first_15_members, key=lambda x: x[1])
-
-                # Save to cache if democraciv guild. This should only be done once in the bot's life cycle.
-                if ctx.guild.id == self.bot.democraciv_guild_object.id:
-                    self.cached_sorted_veterans_on_democraciv = sorted_first_15_members
+        async with ctx.typing():
+            sorted_first_15_members = await self.get_veterans(ctx.guild)
 
         # Send veterans
         message = "These are the first 15 people who joined this server.\nBot accounts are not counted.\n\n"
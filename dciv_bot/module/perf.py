@@ -0,0 +1,222 @@
+from discord.ext import commands
+from dciv_bot.config import config
+from dciv_bot.util.pool import query_stats
+from dciv_bot.util.latency import latency_stats
+from dciv_bot.util.statements import registry
+
+
+class Performance(commands.Cog):
+    """See where the bot spends its time"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.group(name='perf', case_insensitive=True, invoke_without_command=True, hidden=True)
+    @commands.is_owner()
+    async def perf(self, ctx, amount: int = 8):
+        """Latencies of commands, event listeners and background tasks, and their slowest recent invocations
+
+        **Usage:**
+            `-perf [amount]` shows the 8, or the specified amount, that took the most time in total of each kind
+            `-perf histogram <name>` shows the whole histogram of a command, event or task
+            `-perf reset` resets the latencies
+        """
+
+        lines = []
+
+        for kind, title in (('command', 'Commands'), ('event', 'Event Listeners'), ('task', 'Background Tasks')):
+            lines.append(f"{title:<32} {'Calls':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'Max':>7}")
+
+            for name, histogram in latency_stats.by_kind(kind)[:amount]:
+                name = name.partition(":")[2]
+                name = name if len(name) <= 32 else f"{name[:29]}..."
+                lines.append(f"{name:<32} {histogram.count:>6} {self.format_duration(histogram.percentile(50))} "
+                             f"{self.format_duration(histogram.percentile(95))} "
+                             f"{self.format_duration(histogram.percentile(99))} {self.format_duration(histogram.max)}")
+
+            lines.extend(["", "Slowest recent:"])
+
+            for invocation in latency_stats.slowest_recent(kind, 3):
+                failed = " (failed)" if invocation.failed else ""
+                lines.append(f"{self.format_duration(invocation.duration)}  {invocation.name.partition(':')[2]}"
+                             f"({invocation.arguments}){failed} at {invocation.finished_at:%H:%M:%S} UTC")
+
+            lines.append("")
+
+        await self.send_lines(ctx, lines)
+
+    @perf.command(name='histogram', aliases=['h'])
+    @commands.is_owner()
+    async def histogram(self, ctx, *, name: str):
+        """The whole latency histogram of a command, event or task, for example `-perf histogram command:tag`"""
+
+        histogram = latency_stats.histograms.get(name)
+
+        if histogram is None or not histogram.count:
+            return await ctx.send(f":x: Nothing named `{name}` was recorded yet, the name has to start with "
+                                  f"`command:`, `event:` or `task:`.")
+
+        lines = [f"{name}: {histogram.count} calls, average {histogram.average * 1000:.1f}ms", ""]
+        bounds = [f"<= {bound * 1000:g}ms" for bound in histogram.buckets] + [f"> {histogram.buckets[-1] * 1000:g}ms"]
+        most = max(histogram.counts)
+
+        for bound, count in zip(bounds, histogram.counts):
+            lines.append(f"{bound:>11} {count:>6} {'#' * round(count / most * 40)}")
+
+        await self.send_lines(ctx, lines)
+
+    @perf.command(name='loop', aliases=['lag'])
+    @commands.is_owner()
+    async def event_loop(self, ctx, action: str = None):
+        """How long the event loop was blocked, and by what
+
+        **Usage:**
+            `-perf loop` shows the delay of the event loop and the callbacks that blocked it
+            `-perf loop on` or `-perf loop off` enables or disables the slow callback detector
+            `-perf loop reset` resets the statistics
+        """
+
+        monitor = self.bot.loop_lag
+
+        if action is not None:
+            action = action.lower()
+
+            if action == 'on':
+                monitor.start_slow_callback_detector(config.LOOP_SLOW_CALLBACK_DURATION)
+                return await ctx.send(f":white_check_mark: Callbacks that block the event loop for longer than "
+                                      f"{config.LOOP_SLOW_CALLBACK_DURATION * 1000:.0f}ms will be reported. Note "
+                                      f"that asyncio's debug mode makes the bot slower.")
+            elif action == 'off':
+                monitor.stop_slow_callback_detector()
+                return await ctx.send(":white_check_mark: The slow callback detector was disabled.")
+            elif action == 'reset':
+                monitor.clear()
+                return await ctx.send(":white_check_mark: Event loop statistics were reset.")
+
+            return await ctx.send_help(ctx.command)
+
+        lag = monitor.lag
+        recent = max(monitor.recent, default=0.0)
+        lines = [f"Event loop delay, sampled every {monitor.interval}s ({lag.count} samples)",
+                 f"  p50 {self.format_duration(lag.percentile(50))}   p95 {self.format_duration(lag.percentile(95))}"
+                 f"   p99 {self.format_duration(lag.percentile(99))}   max {self.format_duration(lag.max)}",
+                 f"  max of the last {len(monitor.recent)} samples: {self.format_duration(recent)}", ""]
+
+        if not monitor.detects_slow_callbacks:
+            lines.append(f"The slow callback detector is disabled, enable it with {config.BOT_PREFIX}perf loop on")
+        else:
+            lines.append(f"Callbacks that blocked the loop for longer than "
+                         f"{monitor.slow_callback_duration * 1000:.0f}ms:")
+
+        for callback in reversed(monitor.slow_callbacks):
+            lines.extend(["", f"{callback.happened_at:%H:%M:%S} UTC {self.format_duration(callback.duration)}  "
+                              f"{callback.description[:150]}"])
+
+            # The innermost frames show what the loop was busy with
+            for frame in callback.stack[-4:]:
+                lines.extend(f"    {line.strip()[:150]}" for line in frame.strip().splitlines())
+
+        await self.send_lines(ctx, lines)
+
+    @perf.command(name='reset')
+    @commands.is_owner()
+    async def reset(self, ctx):
+        """Reset the latencies of commands, events and tasks"""
+        latency_stats.clear()
+        await ctx.send(":white_check_mark: Latencies were reset.")
+
+    @perf.command(name='queries', aliases=['q', 'sql'])
+    @commands.is_owner()
+    async def queries(self, ctx, amount: int = 10):
+        """The queries that took the most time and the average amount of queries per command
+
+        **Usage:**
+            `-perf queries [amount]` shows the top 10, or the specified amount
+            `-perf queries 0` resets the statistics
+        """
+
+        if amount <= 0:
+            query_stats.clear()
+            return await ctx.send(":white_check_mark: Query statistics were reset.")
+
+        lines = [f"{'Total':>9} {'Avg':>7} {'Max':>7} {'Calls':>6}  Query"]
+
+        for query, stats in query_stats.top_queries(amount):
+            query = ' '.join(query.split())
+            query = query if len(query) <= 60 else f"{query[:57]}..."
+            lines.append(f"{stats.total * 1000:>7.0f}ms {stats.average * 1000:>5.1f}ms {stats.max * 1000:>5.0f}ms "
+                         f"{stats.count:>6}  {query}")
+
+        lines.extend(["", f"{'Queries':>7}  Origin"])
+
+        for origin, per_invocation in query_stats.queries_per_invocation()[:amount]:
+            lines.append(f"{per_invocation:>7.1f}  {origin} ({query_stats.invocations[origin]} invocations)")
+
+        background = sorted(((origin, stats) for origin, stats in query_stats.by_origin.items()
+                             if origin not in query_stats.invocations), key=lambda item: item[1].count, reverse=True)
+
+        lines.extend(["", f"{'Queries':>7}  Listeners & Tasks"])
+
+        for origin, stats in background[:amount]:
+            lines.append(f"{stats.count:>7}  {origin}")
+
+        lines.extend(["", f"Slow queries (>= {config.DATABASE_SLOW_QUERY_THRESHOLD * 1000:.0f}ms): "
+                          f"{query_stats.slow_queries}"])
+
+        await self.send_lines(ctx, lines)
+
+    @perf.command(name='statements', aliases=['s', 'prepared'])
+    @commands.is_owner()
+    async def statements(self, ctx, action: str = None):
+        """How often the prepared statements of the hot paths were prepared and executed, and how long they took
+
+        **Usage:**
+            `-perf statements`
+            `-perf statements reset` resets the latencies
+        """
+
+        if action is not None:
+            if action.lower() == 'reset':
+                registry.clear()
+                return await ctx.send(":white_check_mark: Statement statistics were reset.")
+
+            return await ctx.send_help(ctx.command)
+
+        lines = [f"{'Statement':<26} {'Runs':>6} {'Prepared':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'Max':>7}"]
+
+        for statement in sorted(registry.statements.values(), key=lambda s: s.latency.count, reverse=True):
+            latency = statement.latency
+            lines.append(f"{statement.name:<26} {latency.count:>6} {statement.prepares:>8} "
+                         f"{latency.percentile(50) * 1000:>5.1f}ms {latency.percentile(95) * 1000:>5.1f}ms "
+                         f"{latency.percentile(99) * 1000:>5.1f}ms {latency.max * 1000:>5.1f}ms")
+
+        runs = sum(statement.latency.count for statement in registry.statements.values())
+        prepares = sum(statement.prepares for statement in registry.statements.values())
+        lines.extend(["", f"{runs} executions with {prepares} parses & plans, "
+                               f"{max(0, runs - prepares)} were skipped"])
+
+        await self.send_lines(ctx, lines)
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        return f"{seconds * 1000:>5.1f}ms" if seconds < 1 else f"{seconds:>6.2f}s"
+
+    @staticmethod
+    async def send_lines(ctx, lines):
+        """Sends the lines as code blocks, split into as few messages as Discord's message limit allows"""
+
+        page = []
+
+        for line in lines:
+            if sum(len(line) + 1 for line in page) + len(line) > 1900:
+                await ctx.send("```" + "\n".join(page) + "```")
+                page = []
+
+            page.append(line)
+
+        if page:
+            await ctx.send("```" + "\n".join(page) + "```")
+
+
+def setup(bot):
+    bot.add_cog(Performance(bot))
@@ -24,11 +24,10 @@ DEALINGS IN THE SOFTWARE."""
 import typing
 import asyncpg
 import discord
-import asyncio
 import datetime
 import itertools
 
-from dciv_bot.util import mk
+from dciv_bot.util import mk, statements
 from dciv_bot.config import token, config
 from discord.ext import commands, tasks
 
@@ -198,11 +197,9 @@ class Starboard(commands.Cog):
 
     @weekly_starboard_to_reddit_task.before_loop
     async def before_starboard_task(self):
-        await self.bot.wait_until_ready()
-
-        # Delay first run of task until Democraciv Guild has been found
-        if self.bot.democraciv_guild_object is None:
-            await asyncio.sleep(5)
+        # Delay first run of task until the Democraciv guild has been found and the database is ready
+        await self.bot.guild_ready.wait()
+        await self.bot.db_ready.wait()
 
     @property
     def starboard_channel(self) -> typing.Optional[discord.TextChannel]:
@@ -250,7 +247,7 @@ class Starboard(commands.Cog):
         if payload.channel_id == self.starboard_channel.id:
             return False
 
-        if await self.bot.checks.is_channel_excluded(self.bot.democraciv_guild_object.id, payload.channel_id):
+        if self.bot.checks.is_channel_excluded(self.bot.democraciv_guild_object.id, payload.channel_id):
             return False
 
         if not isinstance(channel, discord.TextChannel):
@@ -333,8 +330,7 @@ class Starboard(commands.Cog):
         except asyncpg.UniqueViolationError:
             return
 
-        amount_of_stars = await self.bot.db.fetchval("SELECT COUNT(*) FROM starboard_starrers WHERE entry_id = $1",
-                                                     entry_id)
+        amount_of_stars = await statements.count_stars(self.bot.db, entry_id)
 
         if amount_of_stars < self.star_threshold:
             return
@@ -381,8 +377,7 @@ class Starboard(commands.Cog):
         if bot_message is None:
             return
 
-        amount_of_stars = await self.bot.db.fetchval("SELECT COUNT(*) FROM starboard_starrers WHERE entry_id = $1",
-                                                     entry_id)
+        amount_of_stars = await statements.count_stars(self.bot.db, entry_id)
 
         try:
             old_bot_message = await self.starboard_channel.fetch_message(bot_message)
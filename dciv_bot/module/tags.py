@@ -1,14 +1,16 @@
 import re
 import enum
+import asyncio
 import typing
 import discord
+import collections
 
 import dciv_bot.util.utils as utils
 
 from dciv_bot.util import mk
 from dciv_bot.config import config
 from dciv_bot.util.flow import Flow
-from discord.ext import commands
+from discord.ext import commands, tasks
 from dciv_bot.util.paginator import AlternativePages
 from dciv_bot.util.converter import Tag, OwnedTag, CaseInsensitiveMember
 
@@ -29,16 +31,149 @@ class Tags(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+        # In-memory index of every tag so that sending a tag does not need to hit the database.
+        #   _tags: tag id -> guild_tags row as dict
+        #   _aliases: (guild id, alias) -> tag id, guild id is None for aliases of global tags
+        #   _tag_aliases: tag id -> {alias: (guild id the alias was created on, whether it was indexed as global)}
+        self._tags: typing.Dict[int, dict] = {}
+        self._aliases: typing.Dict[typing.Tuple[typing.Optional[int], str], int] = {}
+        self._tag_aliases: typing.Dict[int, typing.Dict[str, typing.Tuple[int, bool]]] = {}
+        self._tag_index_ready = asyncio.Event()
+        self.bot.loop.create_task(self.load_tag_index())
+
+        # tag id -> uses that were not yet written to the database
+        self._pending_uses: typing.Counter[int] = collections.Counter()
+        self.flush_tag_uses.start()
+
+    def cog_unload(self):
+        self.flush_tag_uses.cancel()
+        self.bot.loop.create_task(self.flush_pending_uses())
+
+    @tasks.loop(seconds=60)
+    async def flush_tag_uses(self):
+        await self.flush_pending_uses()
+
+    @flush_tag_uses.before_loop
+    async def before_flush_tag_uses(self):
+        await self.bot.db_ready.wait()
+
+    async def flush_pending_uses(self):
+        """Writes the buffered tag uses to the database with a single query"""
+
+        if not self._pending_uses:
+            return
+
+        pending, self._pending_uses = self._pending_uses, collections.Counter()
+
+        try:
+            await self.bot.db.execute("UPDATE guild_tags SET uses = guild_tags.uses + pending.uses"
+                                      " FROM unnest($1::int[], $2::int[]) AS pending(id, uses)"
+                                      " WHERE guild_tags.id = pending.id", list(pending.keys()), list(pending.values()))
+        except Exception as e:
+            # Keep them for the next try
+            self._pending_uses.update(pending)
+            print(f"[DATABASE] Error while flushing tag uses: {e.__class__.__name__}: {e}")
+
+    def sort_by_uses(self, records) -> list:
+        """Sorts guild_tags rows by their uses, including the uses that were not yet written to the database"""
+        return sorted(records, key=lambda record: record['uses'] + self._pending_uses[record['id']], reverse=True)
+
+    async def load_tag_index(self):
+        await self.bot.db_ready.wait()
+
+        tags = await self.bot.db.fetch("SELECT * FROM guild_tags")
+        aliases = await self.bot.db.fetch("SELECT * FROM guild_tags_alias")
+
+        self._tags.clear()
+        self._aliases.clear()
+        self._tag_aliases.clear()
+
+        for record in tags:
+            self._tags[record['id']] = dict(record)
+
+        for record in aliases:
+            self.index_alias(record['tag_id'], record['alias'], record['guild_id'], record['global'])
+
+        self._tag_index_ready.set()
+        print(f"[CACHE] Tag index was loaded with {len(self._tags)} tags and {len(self._aliases)} aliases.")
+
+    async def refresh_indexed_tag(self, tag_id: int):
+        record = await self.bot.db.fetchrow("SELECT * FROM guild_tags WHERE id = $1", tag_id)
+        aliases = await self.bot.db.fetch("SELECT * FROM guild_tags_alias WHERE tag_id = $1", tag_id)
+
+        self.unindex_tag(tag_id)
+
+        if record is None:
+            return
+
+        self._tags[tag_id] = dict(record)
+
+        for alias in aliases:
+            self.index_alias(tag_id, alias['alias'], alias['guild_id'], alias['global'])
+
+    @commands.Cog.listener()
+    async def on_cache_invalidation(self, table: typing.Optional[str], operation: typing.Optional[str], keys: dict):
+        if table is None:
+            await self.load_tag_index()
+
+        elif table == 'guild_tags':
+            await self.refresh_indexed_tag(keys['id'])
+
+        elif table == 'guild_tags_alias':
+            await self.refresh_indexed_tag(keys['tag_id'])
+
+    def index_alias(self, tag_id: int, alias: str, guild_id: int, is_global: bool):
+        self._aliases[(None if is_global else guild_id, alias)] = tag_id
+        self._tag_aliases.setdefault(tag_id, {})[alias] = (guild_id, is_global)
+
+    def unindex_alias(self, tag_id: int, alias: str):
+        scope = self._tag_aliases.get(tag_id, {}).pop(alias, None)
+
+        if scope is None:
+            return
+
+        guild_id, is_global = scope
+        key = (None if is_global else guild_id, alias)
+
+        # A global tag and another guild's local tag can share a name, only remove what belongs to this tag
+        if self._aliases.get(key) == tag_id:
+            del self._aliases[key]
+
+    def unindex_tag(self, tag_id: int):
+        for alias in list(self._tag_aliases.get(tag_id, {})):
+            self.unindex_alias(tag_id, alias)
+
+        self._tag_aliases.pop(tag_id, None)
+        self._tags.pop(tag_id, None)
+
+    def set_tag_global(self, tag_id: int, is_global: bool):
+        self._tags[tag_id]['global'] = is_global
+
+        for alias, (guild_id, _) in list(self._tag_aliases.get(tag_id, {}).items()):
+            self.unindex_alias(tag_id, alias)
+            self.index_alias(tag_id, alias, guild_id, is_global)
+
+    def get_indexed_tag(self, alias: str, guild_id: typing.Optional[int]) -> typing.Optional[dict]:
+        """Looks up a tag by name or alias, global tags take precedence over the local tags of guild_id"""
+
+        tag_id = self._aliases.get((None, alias))
+
+        if tag_id is None and guild_id is not None:
+            tag_id = self._aliases.get((guild_id, alias))
+
+        return self._tags.get(tag_id)
+
     @commands.group(name="tag", aliases=['tags', 't'], invoke_without_command=True, case_insensitive=True)
     @commands.cooldown(1, config.BOT_COMMAND_COOLDOWN, commands.BucketType.user)
     @commands.guild_only()
     async def tags(self, ctx):
         """List all tags on this server"""
 
-        global_tags = await self.bot.db.fetch("SELECT * FROM guild_tags WHERE global = true ORDER BY uses desc")
-        all_tags = await self.bot.db.fetch("SELECT * FROM guild_tags WHERE guild_id = $1 AND global = false"
-                                           " ORDER BY uses desc",
-                                           ctx.guild.id)
+        global_tags = self.sort_by_uses(await self.bot.db.fetch("SELECT * FROM guild_tags WHERE global = true"
+                                                                " ORDER BY uses desc"))
+        all_tags = self.sort_by_uses(await self.bot.db.fetch("SELECT * FROM guild_tags WHERE guild_id = $1"
+                                                             " AND global = false ORDER BY uses desc",
+                                                             ctx.guild.id))
 
         pretty_tags = []
 
@@ -72,8 +207,8 @@ class Tags(commands.Cog):
     async def local(self, ctx):
         """List all non-global tags on this server"""
 
-        all_tags = await self.bot.db.fetch("SELECT * FROM guild_tags WHERE guild_id = $1 AND global = false "
-                                           "ORDER BY uses desc", ctx.guild.id)
+        all_tags = self.sort_by_uses(await self.bot.db.fetch("SELECT * FROM guild_tags WHERE guild_id = $1"
+                                                             " AND global = false ORDER BY uses desc", ctx.guild.id))
 
         if not all_tags:
             embed = self.bot.embeds.embed_builder(title="There are no local tags on this server.",
@@ -100,9 +235,9 @@ class Tags(commands.Cog):
 
         member = member or ctx.author
 
-        all_tags = await self.bot.db.fetch("SELECT * FROM guild_tags WHERE author = $1 AND guild_id = $2"
-                                           " ORDER BY uses desc",
-                                           member.id, ctx.guild.id)
+        all_tags = self.sort_by_uses(await self.bot.db.fetch("SELECT * FROM guild_tags WHERE author = $1"
+                                                             " AND guild_id = $2 ORDER BY uses desc",
+                                                             member.id, ctx.guild.id))
 
         if not all_tags:
             embed = self.bot.embeds.embed_builder(title=f"{member} hasn't made any tags on this server yet.",
@@ -159,6 +294,7 @@ class Tags(commands.Cog):
                                                ctx.guild.id, tag.is_global)
 
         if status == "INSERT 0 1":
+            self.index_alias(tag.id, alias.lower(), ctx.guild.id, tag.is_global)
             await ctx.send(f':white_check_mark: The `{config.BOT_PREFIX}{alias}` alias was added to '
                            f'`{config.BOT_PREFIX}{tag.name}`.')
 
@@ -192,6 +328,7 @@ class Tags(commands.Cog):
                 async with con.transaction():
                     await con.execute("DELETE FROM guild_tags_alias WHERE alias = $1 AND tag_id = $2",
                                       alias.invoked_with, alias.id)
+                    self.unindex_alias(alias.id, alias.invoked_with)
                     await ctx.send(f":white_check_mark: Successfully removed the alias "
                                    f"`{config.BOT_PREFIX}{alias.invoked_with}` from "
                                    f"`{config.BOT_PREFIX}{alias.name}`.")
@@ -199,33 +336,22 @@ class Tags(commands.Cog):
     async def validate_tag_name(self, ctx, tag_name: str) -> bool:
         tag_name = tag_name.lower()
 
-        all_cmds = list(self.bot.commands)
-        aliases = []
-
-        for command in self.bot.commands:
-            if isinstance(command, commands.Group):
-                for c in command.commands:
-                    all_cmds.append(c)
-                    aliases.append(c.aliases)
-            aliases.append(command.aliases)
-
-        qualified_command_names = [c.qualified_name for c in all_cmds]
+        # The names of commands that were not loaded yet are reserved as well
+        self.bot.load_lazy_extensions()
 
-        if tag_name in qualified_command_names or any(tag_name in a for a in aliases):
+        if tag_name in self.bot.reserved_command_names:
             await ctx.send(":x: You can't create a tag with the same name of one of my commands!")
             return False
 
-        global_tags = await self.bot.db.fetch("SELECT * FROM guild_tags_alias WHERE global = true AND alias = $1",
-                                              tag_name)
+        found_alias = await self.bot.db.fetchval("SELECT COALESCE(global, false) AS is_global FROM guild_tags_alias"
+                                                 " WHERE alias = $1 AND (global = true OR guild_id = $2)"
+                                                 " ORDER BY is_global DESC LIMIT 1", tag_name, ctx.guild.id)
 
-        if len(global_tags) > 0:
+        if found_alias is True:
             await ctx.send(":x: A global tag with that name already exists!")
             return False
 
-        found_alias = await self.bot.db.fetch("SELECT * FROM guild_tags_alias WHERE guild_id = $1 AND alias = $2",
-                                              ctx.guild.id, tag_name)
-
-        if len(found_alias) > 0:
+        if found_alias is False:
             await ctx.send(":x: A tag or alias with that name already exists on this server.")
             return False
 
@@ -315,14 +441,17 @@ class Tags(commands.Cog):
         elif reaction:
             async with self.bot.db.acquire() as con:
                 async with con.transaction():
-                    _id = await con.fetchval("INSERT INTO guild_tags (guild_id, name, content, title,"
-                                             " global, author, is_embedded) VALUES "
-                                             "($1, $2, $3, $4, $5, $6, $7) RETURNING id",
-                                             ctx.guild.id, name.lower(), content, title, is_global,
-                                             ctx.author.id, is_embedded)
+                    record = await con.fetchrow("INSERT INTO guild_tags (guild_id, name, content, title,"
+                                                " global, author, is_embedded, content_type) VALUES "
+                                                "($1, $2, $3, $4, $5, $6, $7, $8) RETURNING *",
+                                                ctx.guild.id, name.lower(), content, title, is_global,
+                                                ctx.author.id, is_embedded, self.get_tag_content_type(content).value)
                     await con.execute("INSERT INTO guild_tags_alias (tag_id, alias, guild_id, global)"
-                                      " VALUES ($1, $2, $3, $4)", _id, name.lower(),
+                                      " VALUES ($1, $2, $3, $4)", record['id'], name.lower(),
                                       ctx.guild.id, is_global)
+
+                    self._tags[record['id']] = dict(record)
+                    self.index_alias(record['id'], name.lower(), ctx.guild.id, is_global)
                     await ctx.send(f":white_check_mark: The `{config.BOT_PREFIX}{name}` tag was added.")
 
     @tags.command(name="info", aliases=['about', 'i'])
@@ -356,7 +485,7 @@ class Tags(commands.Cog):
 
         embed.add_field(name="Global Tag", value=is_global, inline=True)
         embed.add_field(name="Embedded Tag", value=is_embedded, inline=True)
-        embed.add_field(name="Uses", value=str(tag.uses), inline=False)
+        embed.add_field(name="Uses", value=str(tag.uses + self._pending_uses[tag.id]), inline=False)
         embed.add_field(name="Aliases", value=pretty_aliases, inline=False)
         await ctx.send(embed=embed)
 
@@ -377,6 +506,9 @@ class Tags(commands.Cog):
 
         await self.bot.db.execute("UPDATE guild_tags SET author = $1 WHERE id = $2", ctx.author.id, tag.id)
 
+        if tag.id in self._tags:
+            self._tags[tag.id]['author'] = ctx.author.id
+
         return await ctx.send(f":white_check_mark: You are now the owner `{config.BOT_PREFIX}{tag.name}`.")
 
     @tags.command(name="transfer")
@@ -391,6 +523,9 @@ class Tags(commands.Cog):
 
         await self.bot.db.execute("UPDATE guild_tags SET author = $1 WHERE id = $2", to_person.id, tag.id)
 
+        if tag.id in self._tags:
+            self._tags[tag.id]['author'] = to_person.id
+
         return await ctx.send(f":white_check_mark: {to_person} is now the owner of `{config.BOT_PREFIX}{tag.name}`.")
 
     @tags.command(name="raw")
@@ -454,8 +589,15 @@ class Tags(commands.Cog):
             return await ctx.send("Aborted.")
 
         else:
-            await self.bot.db.execute("UPDATE guild_tags SET content = $1, title = $3, is_embedded = $4 WHERE id = $2",
-                                      new_content, tag.id, new_title, is_embedded)
+            content_type = self.get_tag_content_type(new_content).value
+            await self.bot.db.execute("UPDATE guild_tags SET content = $1, title = $3, is_embedded = $4,"
+                                      " content_type = $5 WHERE id = $2",
+                                      new_content, tag.id, new_title, is_embedded, content_type)
+
+            if tag.id in self._tags:
+                self._tags[tag.id].update(content=new_content, title=new_title, is_embedded=is_embedded,
+                                          content_type=content_type)
+
             await ctx.send(":white_check_mark: Your tag was edited.")
 
     @tags.command(name="search", aliases=['s'])
@@ -464,27 +606,24 @@ class Tags(commands.Cog):
     async def search(self, ctx, *, query: str):
         """Search for a global or local tag on this server"""
 
-        db_query = """SELECT tag_id FROM guild_tags_alias
-                      WHERE (global = true AND alias LIKE '%' || $1 || '%') OR 
-                            (alias LIKE '%' || $1 || '%' AND guild_id = $2)
-                      ORDER BY similarity(alias, $1) DESC
+        db_query = """SELECT t.name, t.title,
+                             max(greatest(similarity(a.alias, $1), similarity(t.title, $1))) AS rank
+                      FROM guild_tags_alias a
+                      JOIN guild_tags t ON t.id = a.tag_id
+                      WHERE (a.global = true OR a.guild_id = $2)
+                        AND (a.alias LIKE '%' || $1 || '%' OR t.title ILIKE '%' || $1 || '%')
+                      GROUP BY t.guild_id, t.id
+                      ORDER BY rank DESC
                       LIMIT 20
                     """
 
         tags = await self.bot.db.fetch(db_query, query.lower(), ctx.guild.id)
-        pretty_names = dict()  # Abuse dict as ordered set since you can't use DISTINCT in above SQL query
+        pretty_names = [f"`{config.BOT_PREFIX}{record['name']}`  {record['title']}" for record in tags]
 
         if not tags:
-            pretty_names['Nothing found.'] = None
+            pretty_names.append('Nothing found.')
 
-        else:
-            for record in tags:
-                details = await self.bot.db.fetchrow("SELECT name, title from guild_tags WHERE id = $1",
-                                                     record['tag_id'])
-                if details:
-                    pretty_names[f"`{config.BOT_PREFIX}{details['name']}`  {details['title']}"] = None
-
-        pages = AlternativePages(ctx=ctx, entries=list(pretty_names), show_entry_count=False,
+        pages = AlternativePages(ctx=ctx, entries=pretty_names, show_entry_count=False,
                                  a_title=f"Tags matching '{query}'",
                                  a_icon=ctx.guild.icon_url_as(static_format='png'),
                                  show_index=False, show_amount_of_pages=True)
@@ -502,12 +641,14 @@ class Tags(commands.Cog):
             # Local -> Global
             await self.bot.db.execute("UPDATE guild_tags SET global = true WHERE id = $1", tag.id)
             await self.bot.db.execute("UPDATE guild_tags_alias SET global = true WHERE tag_id = $1", tag.id)
+            self.set_tag_global(tag.id, True)
             await ctx.send(f":white_check_mark: `{config.BOT_PREFIX}{tag.name}` is now a global tag. ")
 
         else:
             # Global -> Local
             await self.bot.db.execute("UPDATE guild_tags SET global = false WHERE id = $1", tag.id)
             await self.bot.db.execute("UPDATE guild_tags_alias SET global = false WHERE tag_id = $1", tag.id)
+            self.set_tag_global(tag.id, False)
             await ctx.send(f":white_check_mark: `{config.BOT_PREFIX}{tag.name}` is now a local tag.")
 
     @tags.command(name="remove", aliases=['delete'])
@@ -536,6 +677,7 @@ class Tags(commands.Cog):
                     await con.execute("DELETE FROM guild_tags_alias WHERE tag_id = $1", tag.id)
                     await con.execute("DELETE FROM guild_tags WHERE name = $1 AND guild_id = $2",
                                       tag.name, ctx.guild.id)
+                    self.unindex_tag(tag.id)
                     await ctx.send(f":white_check_mark: `{config.BOT_PREFIX}{tag.name}` was removed.")
 
     @staticmethod
@@ -568,44 +710,30 @@ class Tags(commands.Cog):
 
         return TagContentType.TEXT
 
-    async def resolve_tag_name(self, query: str, guild: discord.Guild):
-        tag_id = await self.bot.db.fetchval("SELECT tag_id FROM guild_tags_alias WHERE global = true AND alias = $1",
-                                            query.lower())
-
-        if tag_id is None:
-            tag_id = await self.bot.db.fetchval(
-                "SELECT tag_id FROM guild_tags_alias WHERE alias = $1 AND guild_id = $2",
-                query.lower(), guild.id)
+    async def resolve_tag_name(self, query: str, guild: typing.Optional[discord.Guild]) -> typing.Optional[dict]:
+        await self._tag_index_ready.wait()
+        tag_details = self.get_indexed_tag(query.lower(), guild.id if guild is not None else None)
 
-        if tag_id is None:
+        if tag_details is None:
             return None
 
-        tag_details = await self.bot.db.fetchrow("SELECT * FROM guild_tags WHERE id = $1", tag_id)
-
-        await self.bot.db.execute("UPDATE guild_tags SET uses = uses + 1 WHERE id = $1", tag_id)
+        tag_details['uses'] += 1
+        self._pending_uses[tag_details['id']] += 1
         return tag_details
 
     async def send_tag(self, message):
         """If the tag exists, the contents are sent. If the tag is exists returns True, otherwise returns False."""
         tag_name = message.content[len(config.BOT_PREFIX):]
-
-        if message.guild is None:
-            tag_id = await self.bot.db.fetchval(
-                "SELECT tag_id FROM guild_tags_alias WHERE global = true AND alias = $1",
-                tag_name.lower())
-
-            if tag_id is None:
-                return False
-
-            tag_details = await self.bot.db.fetchrow("SELECT * FROM guild_tags WHERE id = $1", tag_id)
-
-        else:
-            tag_details = await self.resolve_tag_name(tag_name, message.guild)
+        tag_details = await self.resolve_tag_name(tag_name, message.guild)
 
         if tag_details is None:
             return False
 
-        tag_content_type = self.get_tag_content_type(tag_details['content'])
+        # Tags that were made before content_type existed and weren't migrated yet have to be classified here
+        if tag_details.get('content_type') is not None:
+            tag_content_type = TagContentType(tag_details['content_type'])
+        else:
+            tag_content_type = self.get_tag_content_type(tag_details['content'])
 
         if tag_details['is_embedded']:
             if tag_content_type is TagContentType.IMAGE:
@@ -1,6 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from discord.ext import commands
 from dciv_bot.config import token, config
+from dciv_bot.util import exceptions
+from dciv_bot.util.cache import cached
 
 
 class Time(commands.Cog):
@@ -9,6 +11,24 @@ class Time(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    # Only the UTC offset and abbreviation of a zone are cached, the time itself is calculated from our own clock.
+    # Offsets change with daylight saving time, so they are looked up again every hour. Unknown zones raise instead
+    # of being cached, since TimeZoneDB also answers with an error when we are rate limited.
+    @cached('timezones', max_size=256, ttl=3600)
+    async def get_time_zone(self, zone: str) -> dict:
+        query_base = f"https://api.timezonedb.com/v2.1/get-time-zone?key={token.TIMEZONEDB_API_KEY}&format=json&" \
+                     f"by=zone&zone={zone}"
+
+        async with self.bot.session.get(query_base) as response:
+            time_response = await response.json()
+
+        if time_response['status'] != "OK":
+            raise exceptions.NotFoundError(f":x: `{zone}` is not a valid time zone or area code. "
+                                           f"See the list of available time zones here: "
+                                           f"<https://timezonedb.com/time-zones>")
+
+        return {'abbreviation': time_response['abbreviation'], 'gmtOffset': time_response['gmtOffset']}
+
     @commands.command(name='time', aliases=['clock, tz'])
     @commands.cooldown(1, config.BOT_COMMAND_COOLDOWN, commands.BucketType.user)
     async def time(self, ctx, *, zone: str):
@@ -21,22 +41,13 @@ class Time(commands.Cog):
         if not token.TIMEZONEDB_API_KEY:
             return await ctx.send(":x: Invalid TimeZoneDB API key.")
 
-        query_base = f"https://api.timezonedb.com/v2.1/get-time-zone?key={token.TIMEZONEDB_API_KEY}&format=json&" \
-                     f"by=zone&zone={zone}"
-
         async with ctx.typing():
-            async with self.bot.session.get(query_base) as response:
-                if response.status == 200:
-                    time_response = await response.json()
-
-            if time_response['status'] != "OK":
-                return await ctx.send(f":x: `{zone}` is not a valid time zone or area code. "
-                                      f"See the list of available time zones here: "
-                                      f"<https://timezonedb.com/time-zones>")
-
-            date = datetime.utcfromtimestamp(time_response['timestamp']).strftime("%A, %B %d %Y")
-            us_time = datetime.utcfromtimestamp(time_response['timestamp']).strftime("%I:%M:%S %p")
-            eu_time = datetime.utcfromtimestamp(time_response['timestamp']).strftime("%H:%M:%S")
+            time_response = await self.get_time_zone(zone)
+
+            local_time = datetime.utcnow() + timedelta(seconds=time_response['gmtOffset'])
+            date = local_time.strftime("%A, %B %d %Y")
+            us_time = local_time.strftime("%I:%M:%S %p")
+            eu_time = local_time.strftime("%H:%M:%S")
 
             if zone.lower() == "utc":
                 title = f":clock1:  Current Time in UTC"
@@ -3,6 +3,12 @@ import urllib.parse
 
 from dciv_bot.config import config
 from discord.ext import commands
+from dciv_bot.util.cache import cached
+
+
+def cache_ttl(result):
+    # Requests that failed return None, those are tried again next time instead of being cached for an hour
+    return 0 if result is None else 3600
 
 
 class Wiki(commands.Cog):
@@ -20,6 +26,7 @@ class Wiki(commands.Cog):
         else:
             return urllib.parse.quote(link)
 
+    @cached('wikipedia', max_size=256, ttl=cache_ttl)
     async def get_wikipedia_result_with_rest_api(self, query):
 
         # This uses the newer REST API that MediaWiki offers to query their site.
@@ -34,6 +41,7 @@ class Wiki(commands.Cog):
             else:
                 return None
 
+    @cached('wikipedia_suggestions', max_size=256, ttl=cache_ttl)
     async def get_wikipedia_suggested_articles(self, query):
 
         # This uses the older MediaWiki Action API to query their site.
@@ -50,6 +58,7 @@ class Wiki(commands.Cog):
             else:
                 return None
 
+    @cached('civwiki_suggestions', max_size=256, ttl=cache_ttl)
     async def get_civilization_fandom_suggested_article(self, query: str) -> int:
 
         async with self.bot.session.get(f"https://civilization.fandom.com/api/v1/SearchSuggestions"
@@ -75,6 +84,7 @@ class Wiki(commands.Cog):
 
         return article_id
 
+    @cached('civwiki', max_size=256, ttl=cache_ttl)
     async def get_civilization_fandom_article_details(self, article_id: int) -> list:
 
         if article_id == -1:
@@ -0,0 +1,94 @@
+import os
+import sys
+import glob
+import gzip
+import time
+import asyncio
+import tempfile
+import unittest
+
+from dciv_bot.util import backup
+
+
+class TestBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.loop.close()
+        self.directory.cleanup()
+
+    def test_stream_compressed(self):
+        path = os.path.join(self.directory.name, 'dump.sql.gz')
+        command = [sys.executable, '-c', "import sys\nfor i in range(100000): sys.stdout.write(f'INSERT {i};\\n')"]
+
+        raw_size = self.loop.run_until_complete(backup.stream_compressed(command, path))
+
+        with gzip.open(path, 'rb') as file:
+            content = file.read()
+
+        self.assertEqual(len(content), raw_size)
+        self.assertTrue(content.endswith(b'INSERT 99999;\n'))
+        self.assertLess(os.path.getsize(path), raw_size / 4)
+
+    def test_failed_command(self):
+        path = os.path.join(self.directory.name, 'dump.sql.gz')
+        command = [sys.executable, '-c', "import sys; sys.exit('connection refused')"]
+
+        with self.assertRaisesRegex(backup.BackupError, 'connection refused'):
+            self.loop.run_until_complete(backup.stream_compressed(command, path))
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_split_file(self):
+        path = os.path.join(self.directory.name, 'dump.sql.gz')
+        data = os.urandom(2500)
+
+        with open(path, 'wb') as file:
+            file.write(data)
+
+        self.assertEqual(backup.split_file(path, 5000), [path])
+
+        parts = backup.split_file(path, 1000)
+        self.assertEqual([os.path.basename(part) for part in parts],
+                         ['dump.sql.gz.part001', 'dump.sql.gz.part002', 'dump.sql.gz.part003'])
+        self.assertFalse(os.path.exists(path))
+
+        joined = b''
+
+        for part in parts:
+            with open(part, 'rb') as file:
+                joined += file.read()
+
+        self.assertEqual(joined, data)
+
+    def test_split_file_into_many_parts(self):
+        path = os.path.join(self.directory.name, 'dump.sql.gz')
+        data = os.urandom(1200)
+
+        with open(path, 'wb') as file:
+            file.write(data)
+
+        parts = backup.split_file(path, 100)
+        self.assertEqual(len(parts), 12)
+
+        # The order in which 'cat path.part* > path' joins them
+        joined = b''
+
+        for part in sorted(glob.glob(f"{path}.part*")):
+            with open(part, 'rb') as file:
+                joined += file.read()
+
+        self.assertEqual(joined, data)
+
+    def test_retention(self):
+        for name, age_in_days in (('backup-old', 40), ('backup-new', 1), ('other-old', 40)):
+            path = os.path.join(self.directory.name, name)
+            open(path, 'w').close()
+            os.utime(path, (time.time() - age_in_days * 86400,) * 2)
+
+        self.assertEqual(backup.apply_retention(self.directory.name, 30, 'backup-'), ['backup-old'])
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['backup-new', 'other-old'])
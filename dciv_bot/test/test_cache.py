@@ -0,0 +1,178 @@
+import typing
+import asyncio
+import unittest
+import tracemalloc
+
+from unittest import mock
+from dciv_bot.util.cache import GuildSettings, LRUCache, cached
+
+
+def make_record(guild_id: int) -> dict:
+    return {'id': guild_id, 'welcome': True, 'welcome_message': 'Welcome {member}!', 'welcome_channel': guild_id + 1,
+            'logging': True, 'logging_channel': guild_id + 2, 'logging_excluded': [guild_id + 3, guild_id + 4],
+            'defaultrole': False, 'defaultrole_role': None, 'tag_creation_allowed': False}
+
+
+def measure_guild_config_memory(guilds: int = 1000) -> typing.List[typing.Tuple[str, int, int]]:
+    """The memory in bytes that the config of the guilds takes in the old dict-based guild config cache, and as
+    GuildSettings. Run python -m dciv_bot.test.test_cache to see the numbers."""
+
+    def measure(build, records) -> int:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        cache = {record['id']: build(record) for record in records}
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del cache
+        return size
+
+    def as_dict(record) -> dict:
+        return {"welcome": record['welcome'],
+                "welcome_message": record['welcome_message'],
+                "welcome_channel": record['welcome_channel'],
+                "logging": record['logging'],
+                "logging_channel": record['logging_channel'],
+                "logging_excluded": list(record['logging_excluded']),
+                "defaultrole": record['defaultrole'],
+                "defaultrole_role": record['defaultrole_role'],
+                "tag_creation_allowed": record['tag_creation_allowed']
+                }
+
+    # Most guilds don't exclude any channels from logging
+    without_excluded = [dict(make_record(guild_id * 10), logging_excluded=[]) for guild_id in range(guilds)]
+    with_excluded = [make_record(guild_id * 10) for guild_id in range(guilds)]
+
+    return [(description, measure(as_dict, records), measure(GuildSettings.from_record, records))
+            for description, records in (("no excluded channels", without_excluded),
+                                         ("2 excluded channels", with_excluded))]
+
+
+class TestGuildSettings(unittest.TestCase):
+
+    def test_from_record(self):
+        settings = GuildSettings.from_record(make_record(100))
+
+        self.assertTrue(settings.logging)
+        self.assertEqual(settings.logging_channel, 102)
+        self.assertEqual(settings.excluded_channels, frozenset({103, 104}))
+        self.assertFalse(hasattr(settings, '__dict__'))
+
+    def test_defaults(self):
+        settings = GuildSettings(id=100)
+
+        self.assertFalse(settings.logging)
+        self.assertEqual(settings.excluded_channels, frozenset())
+
+        settings = GuildSettings.from_record(dict(make_record(100), logging_excluded=None))
+        self.assertNotIn(103, settings.excluded_channels)
+
+    def test_memory(self):
+        """GuildSettings should need less memory than the dict that the guild config cache held before"""
+
+        for description, dict_size, slots_size in measure_guild_config_memory():
+            self.assertLess(slots_size, dict_size, f"1,000 guilds with {description}: {dict_size / 1024:.0f} KiB "
+                                                   f"as dicts, {slots_size / 1024:.0f} KiB as GuildSettings")
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl(self):
+        cache = LRUCache(max_size=4, ttl=10)
+
+        with mock.patch('time.monotonic', return_value=100):
+            cache.put('a', 1)
+            cache.put('b', 2, ttl=60)
+            cache.put('c', None)
+
+        with mock.patch('time.monotonic', return_value=120):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+            self.assertNotIn('c', cache)
+
+        self.assertEqual(cache.evictions, 2)
+
+
+class TestCached(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.calls = 0
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_single_flight(self):
+        @cached('test_single_flight', max_size=8)
+        async def load(_self, key):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return key * 2
+
+        async def run():
+            # Concurrent misses share one call, later calls are hits
+            results = await asyncio.gather(*(load(None, 21) for _ in range(10)))
+            self.assertEqual(results, [42] * 10)
+            self.assertEqual(await load(None, 21), 42)
+            self.assertEqual(await load(None, 1), 2)
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(load.cache.hits, 1)
+
+    def test_exceptions_are_not_cached(self):
+        @cached('test_exceptions', max_size=8, key=lambda key: key)
+        async def load(key):
+            self.calls += 1
+
+            if self.calls == 1:
+                raise ValueError(key)
+
+            return key
+
+        async def run():
+            with self.assertRaises(ValueError):
+                await load('a')
+
+            self.assertEqual(await load('a'), 'a')
+            self.assertEqual(await load('a'), 'a')
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.calls, 2)
+
+    def test_ttl_per_result(self):
+        # Lookups that found nothing are retried, the others are kept for an hour
+        @cached('test_ttl_per_result', max_size=8, key=lambda key: key,
+                ttl=lambda result: 0 if result is None else 3600)
+        async def load(key):
+            self.calls += 1
+            return key or None
+
+        async def run():
+            for _ in range(2):
+                self.assertEqual(await load('a'), 'a')
+                self.assertIsNone(await load(''))
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.calls, 3)
+        self.assertIsNone(load.cache.ttl)
+
+
+if __name__ == '__main__':
+    print(f"{'1,000 guilds with':<22} {'dict KiB':>9} {'GuildSettings KiB':>18}")
+
+    for description, dict_size, slots_size in measure_guild_config_memory():
+        print(f"{description:<22} {dict_size / 1024:>9.0f} {slots_size / 1024:>18.0f}")
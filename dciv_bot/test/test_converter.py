@@ -0,0 +1,170 @@
+import asyncio
+import datetime
+import unittest
+
+from dciv_bot.util.cache import LRUCache
+from dciv_bot.util.converter import Session, Bill, Law, Motion, Tag, OwnedTag, PoliticalParty, SessionStatus
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        return loop.run_until_complete(coro(*args, **kwargs))
+
+    return wrapper
+
+
+# One row that has every column any of the converters could ask for
+RECORD = {
+    'id': 1, 'law_id': 1, 'bill_id': 1, 'leg_session': 1, 'tag_id': 1, 'party_id': 1,
+    'speaker': 1, 'is_active': False, 'status': 0, 'vote_form': None, 'opened_on': datetime.datetime.utcnow(),
+    'voting_started_on': None, 'closed_on': None, 'passed_on': datetime.datetime.utcnow(),
+    'session_id': 1, 'session_speaker': 1, 'session_is_active': False, 'session_status': SessionStatus.CLOSED,
+    'session_vote_form': None, 'session_opened_on': datetime.datetime.utcnow(), 'session_voting_started_on': None,
+    'session_closed_on': None, 'session_bills': [1], 'session_motions': [1],
+    'bill_name': 'Test Act', 'link': 'https://docs.google.com/', 'tiny_link': 'https://tinyurl.com/',
+    'description': '-', 'google_docs_description': '-', 'submitter': 1, 'is_vetoable': True, 'repealed_on': None,
+    'title': 'Test', 'hastebin': 'https://mystb.in/', 'tags': ['test'], 'tag': 'test',
+    'name': 'test', 'content': 'test', 'global': False, 'guild_id': 1, 'author': 1, 'uses': 0, 'is_embedded': True,
+    'aliases': ['test'], 'alias': 'test', 'leader': 1, 'discord_invite': None, 'is_private': False
+}
+
+
+class QueryCountingPool:
+    """Stand-in for the asyncpg pool that answers every query with the same row and counts the round trips"""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def fetchrow(self, query, *args):
+        self.queries += 1
+        return RECORD
+
+    async def fetch(self, query, *args):
+        self.queries += 1
+        return [RECORD]
+
+    async def fetchval(self, query, *args):
+        self.queries += 1
+        return 1
+
+    async def execute(self, query, *args):
+        self.queries += 1
+
+
+class MockObject:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MockBot:
+    def __init__(self):
+        self.db = QueryCountingPool()
+        self.cache = MockObject(legislature=LRUCache(max_size=16))
+        self.democraciv_guild_object = MockObject(get_role=lambda _id: MockObject(id=_id), roles=[])
+
+
+class MockContext:
+    def __init__(self, bot=None):
+        self.bot = bot or MockBot()
+        self.guild = MockObject(id=1)
+        self.author = MockObject(id=1, guild_permissions=MockObject(administrator=True))
+
+
+class TestConverterQueries(unittest.TestCase):
+    """Every converter should build its object from a single database round trip."""
+
+    def setUp(self):
+        PoliticalParty.fetch_record.cache.clear()
+
+    async def count_queries(self, converter, argument) -> int:
+        ctx = MockContext()
+        await converter.convert(ctx, argument)
+        return ctx.bot.db.queries
+
+    @async_test
+    async def test_queries_per_conversion(self):
+        """Round trips per conversion, counted with QueryCountingPool, before the converters loaded their objects
+        with a single query:
+
+            Session.convert(1)                  3
+            Bill.convert(1)                     4
+            Bill.convert('Test Act')            4
+            Motion.convert(1)                   4
+            Law.convert(1)                      6
+            Law.convert('Test Act')             7
+            Tag.convert('test')                 3
+            OwnedTag.convert('test')            3
+            PoliticalParty.convert(1)           2
+            PoliticalParty.convert('test')      3
+        """
+
+        conversions = ((Session, 1), (Bill, 1), (Bill, 'Test Act'), (Motion, 1), (Law, 1), (Law, 'Test Act'),
+                       (Tag, 'test'), (OwnedTag, 'test'), (PoliticalParty, 1), (PoliticalParty, 'test'))
+
+        for converter, argument in conversions:
+            queries = await self.count_queries(converter, argument)
+            self.assertEqual(queries, 1, f"{converter.__name__}.convert({argument!r}) needed {queries} queries")
+
+    @async_test
+    async def test_convert_many_is_constant(self):
+        for amount in (1, 10, 100):
+            ctx = MockContext()
+            await Bill.convert_many(ctx, range(amount))
+            self.assertEqual(ctx.bot.db.queries, 2)
+
+    @async_test
+    async def test_is_law_without_query(self):
+        bot = MockBot()
+        law = Bill.from_record(bot, RECORD, session=None)
+        bill = Bill.from_record(bot, {**RECORD, 'law_id': None}, session=None)
+
+        self.assertTrue(await law.is_law())
+        self.assertFalse(await bill.is_law())
+        self.assertEqual(bot.db.queries, 0)
+
+        # Bills that were not built by a converter don't know their law yet
+        self.assertTrue(await Bill(id=1, bot=bot).is_law())
+        self.assertEqual(bot.db.queries, 1)
+
+    @async_test
+    async def test_identity_map(self):
+        ctx = MockContext()
+        law = await Law.convert(ctx, 1)
+
+        self.assertIs(await Law.convert(ctx, 1), law)
+        self.assertIs(await Bill.convert(ctx, 1), law.bill)
+        self.assertIs(await Session.convert(ctx, 1), law.bill.session)
+        self.assertIs((await Bill.convert_many(ctx, [1, 1]))[0], law.bill)
+        self.assertEqual(ctx.bot.db.queries, 1)
+
+        # Another invocation has its own identity map
+        self.assertIsNot(await Law.convert(MockContext(), 1), law)
+
+    @async_test
+    async def test_legislature_cache(self):
+        bot = MockBot()
+        law = await Law.convert(MockContext(bot), 1)
+
+        # A later invocation is served from the cache
+        self.assertIs(await Law.convert(MockContext(bot), 1), law)
+        self.assertIs(await Session.convert(MockContext(bot), 1), law.bill.session)
+        self.assertEqual(bot.db.queries, 1)
+        self.assertEqual(bot.cache.legislature.hits, 2)
+
+        await law.bill.veto()
+        self.assertNotIn((Bill, 1), bot.cache.legislature)
+        self.assertNotIn((Law, 1), bot.cache.legislature)
+        self.assertIn((Session, 1), bot.cache.legislature)
+
+        await law.bill.session.close()
+        self.assertEqual(len(bot.cache.legislature), 0)
+
+    @async_test
+    async def test_party_cache(self):
+        PoliticalParty.fetch_record.cache.clear()
+        bot = MockBot()
+
+        await PoliticalParty.convert(MockContext(bot), 'test')
+        await PoliticalParty.convert(MockContext(bot), 'TEST')
+        self.assertEqual(bot.db.queries, 1)
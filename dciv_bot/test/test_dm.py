@@ -0,0 +1,82 @@
+import time
+import asyncio
+import discord
+import unittest
+
+from unittest import mock
+from dciv_bot.util.cache import Cache, LRUCache
+from dciv_bot.util.dm import DMDispatcher, DMReport
+
+
+class SettingsPool:
+    """Stand-in for the asyncpg pool that knows the dm_settings of user 2 and counts the round trips"""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def fetch(self, query, user_ids):
+        self.queries += 1
+        return [{'user_id': 2, 'ban_kick_mute': True, 'leg_session_open': False, 'leg_session_update': True,
+                 'leg_session_submit': True, 'leg_session_withdraw': True}] if 2 in user_ids else []
+
+
+class MockUser:
+    def __init__(self, user_id: int, accepts_dms: bool = True):
+        self.id = user_id
+        self.accepts_dms = accepts_dms
+        self.received = []
+
+    async def send(self, content=None, embed=None):
+        if not self.accepts_dms:
+            raise discord.Forbidden(mock.Mock(status=403, reason="Forbidden"), "Cannot send messages to this user")
+
+        self.received.append(content)
+
+
+class MockBot:
+    def __init__(self):
+        self.db = SettingsPool()
+
+        # Only the DM settings part of the cache, without its startup tasks
+        self.cache = Cache.__new__(Cache)
+        self.cache.bot = self
+        self.cache.dm_settings = LRUCache(max_size=16)
+
+
+class TestDMDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.bot = MockBot()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_settings_and_report(self):
+        users = [MockUser(1), MockUser(2), MockUser(3, accepts_dms=False), MockUser(4)]
+
+        with mock.patch('dciv_bot.config.config.DM_PER_SECOND', 1000):
+            dms = DMDispatcher(self.bot)
+            report = self.loop.run_until_complete(dms.send(users, reason='leg_session_open', message='Hello'))
+
+        self.assertEqual(report, DMReport(delivered=2, skipped=1, failed=1))
+        self.assertEqual(len(users[0].received), 1)
+        self.assertEqual(users[1].received, [])
+        self.assertTrue(users[0].received[0].startswith('Hello'))
+
+        # Settings of all recipients were loaded at once, and are cached now
+        self.assertEqual(self.bot.db.queries, 1)
+        self.loop.run_until_complete(dms.send(users, reason='leg_session_update'))
+        self.assertEqual(self.bot.db.queries, 1)
+
+    def test_rate_limit(self):
+        users = [MockUser(user_id) for user_id in range(10, 16)]
+
+        with mock.patch('dciv_bot.config.config.DM_PER_SECOND', 20):
+            dms = DMDispatcher(self.bot)
+            started = time.monotonic()
+            report = self.loop.run_until_complete(dms.send(users))
+
+        self.assertEqual(report.delivered, 6)
+        self.assertGreaterEqual(time.monotonic() - started, 5 / 20)
@@ -0,0 +1,36 @@
+import ast
+import pathlib
+import dciv_bot
+import unittest
+
+from dciv_bot.config import config
+
+
+def listeners_and_loops(extension: str):
+    """The names of the functions of the extension that are decorated as event listener or tasks.loop()"""
+
+    path = pathlib.Path(dciv_bot.__file__).parent.parent.joinpath(*extension.split('.')).with_suffix('.py')
+    found = []
+
+    for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+
+        for decorator in node.decorator_list:
+            function = decorator.func if isinstance(decorator, ast.Call) else decorator
+
+            if isinstance(function, ast.Attribute) and function.attr in ('listener', 'loop'):
+                found.append(node.name)
+
+    return found
+
+
+class TestLazyExtensions(unittest.TestCase):
+
+    def test_lazy_extensions_only_have_commands(self):
+        for extension in config.LAZY_EXTENSIONS:
+            self.assertEqual(listeners_and_loops(extension), [],
+                             f"{extension} has listeners or loops that would not run until it is loaded")
+
+    def test_detects_listeners(self):
+        self.assertIn('original_join_position_listener', listeners_and_loops('dciv_bot.module.misc'))
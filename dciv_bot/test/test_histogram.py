@@ -0,0 +1,42 @@
+import unittest
+
+from dciv_bot.util.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+
+        for _ in range(90):
+            histogram.add(0.005)
+
+        for _ in range(9):
+            histogram.add(0.05)
+
+        histogram.add(3.0)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.counts, [90, 9, 0, 1])
+        self.assertEqual(histogram.percentile(50), 0.01)
+        self.assertEqual(histogram.percentile(95), 0.1)
+        self.assertEqual(histogram.percentile(99), 0.1)
+        self.assertEqual(histogram.percentile(100), 3.0)
+        self.assertAlmostEqual(histogram.average, (90 * 0.005 + 9 * 0.05 + 3.0) / 100)
+
+    def test_max_caps_bucket_bound(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1))
+        histogram.add(0.02)
+
+        self.assertEqual(histogram.percentile(50), 0.02)
+
+    def test_empty_and_clear(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(99), 0.0)
+
+        histogram.add(0.5)
+        histogram.clear()
+
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(sum(histogram.counts), 0)
+        self.assertEqual(histogram.percentile(50), 0.0)
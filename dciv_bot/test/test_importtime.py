@@ -0,0 +1,19 @@
+import unittest
+
+from dciv_bot.util import importtime
+
+# Only needed once a bill is submitted or an Apps Script is run, so they should not slow down the bot's start
+LAZY_PACKAGES = {'nltk', 'bs4', 'lxml', 'googleapiclient', 'oauth2client', 'httplib2'}
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_heavy_dependencies_are_lazy(self):
+        imports = importtime.profile(['dciv_bot.util.law_helper', 'dciv_bot.util.google_api'])
+        report = importtime.report(imports)
+
+        self.assertTrue(report.startswith(f"Imported {len(imports)} modules in "))
+        self.assertIn("dciv_bot", report)
+
+        imported = {entry.module.split('.')[0] for entry in imports}
+        self.assertFalse(imported & LAZY_PACKAGES, "Heavy dependencies are imported at module level")
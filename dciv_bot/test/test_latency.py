@@ -0,0 +1,70 @@
+import asyncio
+import discord
+import unittest
+
+from discord.ext import commands, tasks
+from dciv_bot.util import latency
+
+
+class LoopingCog(commands.Cog):
+    def __init__(self):
+        self.iterations = 0
+
+    @tasks.loop(seconds=60)
+    async def refresh(self):
+        self.iterations += 1
+
+    @tasks.loop(seconds=60)
+    async def broken(self):
+        raise ValueError("broken")
+
+
+class TestLatencyStats(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        latency.latency_stats.clear()
+
+    def tearDown(self):
+        latency.latency_stats.clear()
+        self.loop.close()
+
+    def test_record_by_kind(self):
+        stats = latency.LatencyStats(recent=2)
+
+        stats.record("command:tag", 0.2, "'test'")
+        stats.record("command:tag", 0.4, "'test'")
+        stats.record("command:ping", 0.05)
+        stats.record("event:on_message", 3.0, "Message(1)")
+
+        self.assertEqual([name for name, _ in stats.by_kind("command")], ["command:tag", "command:ping"])
+        self.assertEqual(stats.histograms["command:tag"].count, 2)
+
+        # Only the 2 most recent commands are kept, but events are kept apart from them
+        self.assertEqual([i.duration for i in stats.slowest_recent("command")], [0.4, 0.05])
+        self.assertEqual(stats.slowest_recent("event")[0].arguments, "Message(1)")
+
+    def test_describe_arguments(self):
+        user = discord.Object(id=1234)
+        self.assertEqual(latency.describe_arguments([user, "name", 3], {'force': True}),
+                         "Object(1234), 'name', 3, force=True")
+        self.assertTrue(latency.describe_arguments(["x" * 100]).endswith("..."))
+        self.assertLessEqual(len(latency.describe_arguments(["a" * 20] * 10, limit=50)), 50)
+
+    def test_instrument_loops(self):
+        cog = LoopingCog()
+
+        self.assertEqual(latency.instrument_loops(cog), 2)
+        self.assertEqual(latency.instrument_loops(cog), 0)
+
+        # This is what Loop._loop calls on every iteration
+        self.loop.run_until_complete(cog.refresh.coro(cog))
+
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(cog.broken.coro(cog))
+
+        self.assertEqual(cog.iterations, 1)
+        self.assertEqual(latency.latency_stats.histograms["task:LoopingCog.refresh"].count, 1)
+        self.assertEqual([i.failed for i in latency.latency_stats.recent["task"]], [False, True])
+        self.assertEqual(cog.refresh.coro.__qualname__, "LoopingCog.refresh")
@@ -1,6 +1,7 @@
 import asyncio
 import unittest
 
+from unittest import mock
 from dciv_bot.util.law_helper import LawUtils
 
 
@@ -43,6 +44,7 @@ class TestLawHelper(unittest.TestCase):
         for link in test_strings:
             self.assertFalse(self.laws.is_google_doc_link(link), "Invalid URL got through Google Docs Link test")
 
+    @unittest.skipUnless(LawUtils.has_nltk_data(), "nltk data is not installed")
     def test_generate_law_tags(self):
         description1 = "elections are a mystery to the people of arabia"
         description2 = "bill title - this is a noun and another noun yet again"
@@ -50,3 +52,16 @@ class TestLawHelper(unittest.TestCase):
 
         self.assertCountEqual(self.laws.generate_law_tags(description1, description2), tags)
 
+
+class TestNLTKDataCheck(unittest.TestCase):
+
+    def test_missing_data_is_reported_once(self):
+        laws = LawUtils(None)
+
+        with mock.patch.object(LawUtils, 'has_nltk_data', return_value=False) as has_nltk_data, \
+                mock.patch('builtins.print') as print_:
+            self.assertIsNone(laws.nltk)
+            self.assertIsNone(laws.nltk)
+
+        self.assertEqual(has_nltk_data.call_count, 1)
+        self.assertEqual(print_.call_count, 1)
@@ -0,0 +1,123 @@
+import ast
+import typing
+import timeit
+import pathlib
+import dciv_bot
+import unittest
+
+from unittest import mock
+from dciv_bot.util import levenshtein
+
+WORDS = ['help', 'commands', 'about', 'ping', 'addme', 'dms', 'tag', 'tags', 'legislature', 'leg', 'laws', 'law',
+         'ministry', 'min', 'parties', 'party', 'join', 'leave', 'role', 'roles', 'server', 'wikipedia', 'wiki',
+         'time', 'clock', 'random', 'whois', 'avatar', 'starboard', 'court', 'supremecourt', 'ban', 'kick', 'mute']
+
+
+class TestBKTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = levenshtein.BKTree(WORDS)
+
+    def brute_force_closest(self, word: str, max_distance: int):
+        candidates = [(levenshtein.distance(word, w), w) for w in WORDS]
+        candidates = [c for c in candidates if c[0] <= max_distance]
+        return min(candidates)[1] if candidates else None
+
+    def test_exact_match(self):
+        self.assertEqual(self.tree.closest('legislature', 3), 'legislature')
+
+    def test_typo(self):
+        self.assertEqual(self.tree.closest('legislatur', 3), 'legislature')
+        self.assertEqual(self.tree.closest('prty', 3), 'party')
+
+    def test_nothing_close_enough(self):
+        self.assertIsNone(self.tree.closest('xxxxxxxxxxxxxxxx', 3))
+        self.assertIsNone(levenshtein.BKTree().closest('help', 3))
+
+    def test_same_as_brute_force(self):
+        for word in ('hlp', 'comand', 'tg', 'minstry', 'wikipeda', 'kik', 'stars', 'cout', 'partys', 'a', ''):
+            for max_distance in range(0, 6):
+                self.assertEqual(self.tree.closest(word, max_distance), self.brute_force_closest(word, max_distance),
+                                 f"BKTree and brute force disagree on '{word}' with max_distance={max_distance}")
+
+
+def get_command_names() -> typing.List[str]:
+    """Collects the names and aliases of every command and group that is declared in the bot's cogs"""
+
+    names = set()
+
+    for directory in ('module', 'event'):
+        for path in pathlib.Path(dciv_bot.__file__).parent.joinpath(directory).rglob('*.py'):
+            for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                        and node.func.attr in ('command', 'group')):
+                    continue
+
+                for keyword in node.keywords:
+                    if keyword.arg == 'name' and isinstance(keyword.value, ast.Constant):
+                        names.add(keyword.value.value)
+                    elif keyword.arg == 'aliases' and isinstance(keyword.value, ast.List):
+                        names.update(e.value for e in keyword.value.elts if isinstance(e, ast.Constant))
+
+    return sorted(names)
+
+
+TYPOS = ['hlep', 'comands', 'legslature', 'minstry', 'partys', 'wikipeda', 'tg', 'xyz', 'supremecort', 'startboard',
+         'laws search', 'randomthingthatisnotacommand']
+
+
+class TestDistanceWithin(unittest.TestCase):
+
+    def setUp(self):
+        self.command_names = get_command_names()
+        self.typos = TYPOS
+
+    def test_same_as_distance(self):
+        for typo in self.typos:
+            for name in self.command_names:
+                real_distance = levenshtein.distance(typo, name)
+
+                for max_k in range(0, 5):
+                    self.assertEqual(levenshtein.distance_within(typo, name, max_k),
+                                     real_distance if real_distance <= max_k else max_k + 1,
+                                     f"Wrong distance between '{typo}' and '{name}' with max_k={max_k}")
+
+    def test_tree_visits_fewer_names(self):
+        """The BK-tree should compute the distance to only a part of the command names, instead of all of them"""
+
+        self.assertGreater(len(self.command_names), 50, "Could not find the bot's commands")
+        index = levenshtein.BKTree(self.command_names)
+
+        with mock.patch.object(levenshtein, 'distance_within', wraps=levenshtein.distance_within) as distance_within:
+            for typo in self.typos:
+                index.closest(typo, 2)
+
+        full_scan = len(self.typos) * len(self.command_names)
+        self.assertLess(distance_within.call_count, full_scan / 2)
+
+
+def benchmark(max_distance: int = 2, number: int = 20):
+    """How long it takes to find the closest command name for every typo, by computing the full distance to every
+    name, the distance up to max_distance to every name, and with the BK-tree. Not part of the tests as timings
+    depend too much on the machine, run it with python -m dciv_bot.test.test_levenshtein"""
+
+    names = get_command_names()
+    index = levenshtein.BKTree(names)
+
+    approaches = {
+        'distance': lambda: [min(names, key=lambda name: levenshtein.distance(typo, name)) for typo in TYPOS],
+        'distance_within': lambda: [min(names, key=lambda name: levenshtein.distance_within(typo, name, max_distance))
+                                    for typo in TYPOS],
+        'BKTree.closest': lambda: [index.closest(typo, max_distance) for typo in TYPOS]
+    }
+
+    print(f"{len(TYPOS)} typos against {len(names)} command names, max_distance={max_distance}, best of 5\n")
+    print(f"{'Approach':<20} {'ms per lookup':>14}")
+
+    for approach, function in approaches.items():
+        best = min(timeit.repeat(function, number=number, repeat=5))
+        print(f"{approach:<20} {best / number / len(TYPOS) * 1000:>14.3f}")
+
+
+if __name__ == '__main__':
+    benchmark()
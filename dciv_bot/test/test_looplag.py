@@ -0,0 +1,62 @@
+import time
+import asyncio
+import unittest
+
+from unittest import mock
+from dciv_bot.util.looplag import LoopLagMonitor
+
+
+def crunch_numbers():
+    # Stands in for CPU work like Levenshtein matching that blocks the event loop
+    time.sleep(0.3)
+
+
+class TestLoopLagMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_lag_and_slow_callbacks(self):
+        monitor = LoopLagMonitor(self.loop, interval=0.05)
+
+        async def blocking_command():
+            await asyncio.sleep(0.1)
+            crunch_numbers()
+            await asyncio.sleep(0.1)
+
+        monitor.start(detect_slow_callbacks=True, slow_callback_duration=0.1)
+
+        try:
+            # The detector logs the blocked loop
+            with mock.patch('builtins.print'):
+                self.loop.run_until_complete(blocking_command())
+        finally:
+            monitor.stop()
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+        self.assertFalse(self.loop.get_debug())
+        self.assertGreaterEqual(monitor.lag.max, 0.2)
+        self.assertGreater(monitor.lag.count, 1)
+
+        callback = monitor.slow_callbacks[-1]
+        self.assertIn("blocking_command", callback.description)
+        self.assertGreaterEqual(callback.duration, 0.3)
+        self.assertTrue(any("crunch_numbers" in frame for frame in callback.stack))
+
+    def test_without_detector(self):
+        monitor = LoopLagMonitor(self.loop, interval=0.01)
+        monitor.start()
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        monitor.stop()
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        self.assertFalse(monitor.detects_slow_callbacks)
+        self.assertFalse(self.loop.get_debug())
+        self.assertGreater(monitor.lag.count, 0)
+
+        monitor.clear()
+        self.assertEqual(monitor.lag.count, 0)
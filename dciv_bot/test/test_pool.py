@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from unittest import mock
+from dciv_bot.util import pool
+from dciv_bot.util.converter import SessionStatus
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = pool.QueryStats()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_origin(self):
+        async def command():
+            token = pool.query_origin.set("command:tag")
+
+            try:
+                self.stats.command_invoked("command:tag")
+                self.stats.record("SELECT 1", 0.001)
+                self.stats.record("SELECT 2", 0.003)
+            finally:
+                pool.query_origin.reset(token)
+
+        async def background_task():
+            self.stats.record("SELECT 1", 0.002)
+
+        self.loop.run_until_complete(command())
+        self.loop.run_until_complete(background_task())
+
+        self.assertEqual(self.stats.queries_per_invocation(), [("command:tag", 2.0)])
+        self.assertIn("task:TestQueryStats.test_origin.<locals>.background_task", self.stats.by_origin)
+        self.assertEqual(self.stats.by_query["SELECT 1"].count, 2)
+        self.assertAlmostEqual(self.stats.by_query["SELECT 1"].average, 0.0015)
+        self.assertEqual(self.stats.top_queries(1)[0][0], "SELECT 1")
+
+    def test_slow_query(self):
+        with mock.patch('dciv_bot.config.config.DATABASE_SLOW_QUERY_THRESHOLD', 0.1), \
+                mock.patch('builtins.print') as log:
+            self.stats.record("SELECT 1", 0.05)
+            self.stats.record("SELECT  pg_sleep(1)\n", 1.0)
+
+        self.assertEqual(self.stats.slow_queries, 1)
+        log.assert_called_once_with("[DATABASE] Slow query (1000ms) from unknown: SELECT pg_sleep(1)")
+
+
+class RecordingConnection:
+    """Stand-in for an asyncpg connection that records the codecs that the init hook registers"""
+
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+class TestConnectionSetup(unittest.TestCase):
+
+    def test_server_settings(self):
+        with mock.patch('dciv_bot.config.config.DATABASE_TRGM_SIMILARITY_THRESHOLD', 0.5):
+            settings = pool.server_settings("democraciv-bot")
+
+        self.assertEqual(settings, {'application_name': "democraciv-bot", 'pg_trgm.similarity_threshold': "0.5"})
+
+    def test_codecs(self):
+        connection = RecordingConnection()
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(pool.init_connection(connection))
+        loop.close()
+
+        codec = connection.codecs['session_status']
+        self.assertEqual(codec['decoder']('Voting Period'), SessionStatus.VOTING_PERIOD)
+        self.assertEqual(codec['encoder'](SessionStatus.CLOSED), 'Closed')
+        self.assertEqual(codec['encoder']('Closed'), 'Closed')
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from dciv_bot.util import statements
+from dciv_bot.util.statements import StatementRegistry
+
+
+class PreparedStatement:
+    def __init__(self, connection, query):
+        self.connection = connection
+        self.query = query
+
+    async def fetchval(self, *args):
+        self.connection.executions.append((self.query, args))
+        return args[0]
+
+
+class Connection:
+    """Stand-in for a pooled connection that counts how often statements are prepared and executed"""
+
+    def __init__(self):
+        self.prepared_statements = {}
+        self.prepares = 0
+        self.executions = []
+
+    async def prepare(self, query):
+        self.prepares += 1
+        return PreparedStatement(self, query)
+
+
+class TestStatementRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.registry = StatementRegistry()
+        self.registry.register('echo', "SELECT $1::int")
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_prepared_once_per_connection(self):
+        first, second = Connection(), Connection()
+
+        for connection in (first, first, first, second):
+            result = self.loop.run_until_complete(self.registry.run(connection, 'echo', 'fetchval', 5))
+            self.assertEqual(result, 5)
+
+        statement = self.registry.statements['echo']
+        self.assertEqual((first.prepares, second.prepares), (1, 1))
+        self.assertEqual(statement.prepares, 2)
+        self.assertEqual(statement.latency.count, 4)
+        self.assertEqual(first.executions, [("SELECT $1::int", (5,))] * 3)
+
+        self.registry.clear()
+        self.assertEqual(statement.latency.count, 0)
+
+    def test_unique_names(self):
+        with self.assertRaises(ValueError):
+            self.registry.register('echo', "SELECT 1")
+
+    def test_hot_paths_registered(self):
+        for name in ('tag_by_alias', 'guild_config', 'star_count'):
+            self.assertIn(name, statements.registry.statements)
+
+        for table in statements.SEEN_TABLES:
+            self.assertIn(f'mark_seen:{table}', statements.registry.statements)
+
+    def test_unprepared_fallback_is_recorded(self):
+        class PlainConnection:
+            async def fetchval(self, query, *args):
+                return args[0]
+
+        result = self.loop.run_until_complete(self.registry.run(PlainConnection(), 'echo', 'fetchval', 7))
+
+        self.assertEqual(result, 7)
+        self.assertEqual(self.registry.statements['echo'].prepares, 0)
+        self.assertEqual(self.registry.statements['echo'].latency.count, 1)
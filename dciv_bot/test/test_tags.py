@@ -0,0 +1,35 @@
+import unittest
+
+from dciv_bot.module.tags import Tags
+
+
+class TestTagIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Only the in-memory index of the cog, without its startup tasks
+        self.tags = Tags.__new__(Tags)
+        self.tags._tags = {1: {'id': 1, 'global': True}, 2: {'id': 2, 'global': False}}
+        self.tags._aliases = {}
+        self.tags._tag_aliases = {}
+
+        self.tags.index_alias(1, 'rules', 100, True)
+        self.tags.index_alias(2, 'rules', 200, False)
+
+    def test_unindex_local_keeps_global(self):
+        self.tags.unindex_tag(2)
+
+        self.assertEqual(self.tags.get_indexed_tag('rules', 200)['id'], 1)
+        self.assertEqual(self.tags.get_indexed_tag('rules', 300)['id'], 1)
+
+    def test_unindex_global_keeps_local(self):
+        self.tags.unindex_tag(1)
+
+        self.assertEqual(self.tags.get_indexed_tag('rules', 200)['id'], 2)
+        self.assertIsNone(self.tags.get_indexed_tag('rules', 300))
+
+    def test_toggle_global(self):
+        self.tags.set_tag_global(1, False)
+
+        self.assertEqual(self.tags.get_indexed_tag('rules', 100)['id'], 1)
+        self.assertEqual(self.tags.get_indexed_tag('rules', 200)['id'], 2)
+        self.assertIsNone(self.tags.get_indexed_tag('rules', 300))
@@ -0,0 +1,121 @@
+import os
+import time
+import zlib
+import typing
+import asyncio
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Backup(typing.NamedTuple):
+    parts: typing.List[str]
+    raw_size: int
+    compressed_size: int
+    duration: float
+
+    def __str__(self):
+        return f"{self.raw_size / 1024 ** 2:.1f} MiB of SQL, {self.compressed_size / 1024 ** 2:.1f} MiB compressed " \
+               f"in {len(self.parts)} file(s), took {self.duration:.1f}s"
+
+
+class BackupError(Exception):
+    pass
+
+
+async def stream_compressed(command: typing.List[str], path: str, env: typing.Dict[str, str] = None) -> int:
+    """Runs the command and writes its stdout gzip-compressed to the given path while it is still running. Returns the
+    size of the uncompressed output. Raises BackupError and removes the file if the command fails."""
+
+    loop = asyncio.get_event_loop()
+    process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE,
+                                                   stderr=asyncio.subprocess.PIPE, env=env)
+
+    # A gzip stream (wbits=31), so that the file can be restored with gunzip or zcat
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    raw_size = 0
+
+    def compress_to(file, chunk: bytes):
+        file.write(compressor.compress(chunk) if chunk else compressor.flush())
+
+    # Read stderr at the same time so that the process never blocks on a full pipe
+    stderr_task = loop.create_task(process.stderr.read())
+
+    with open(path, 'wb') as file:
+        while True:
+            chunk = await process.stdout.read(CHUNK_SIZE)
+            await loop.run_in_executor(None, compress_to, file, chunk)
+
+            if not chunk:
+                break
+
+            raw_size += len(chunk)
+
+    stderr = await stderr_task
+    await process.wait()
+
+    if process.returncode != 0:
+        os.remove(path)
+        raise BackupError(f"{command[0]} exited with {process.returncode}: {stderr.decode(errors='replace').strip()}")
+
+    return raw_size
+
+
+def split_file(path: str, max_size: int) -> typing.List[str]:
+    """Splits a file that is larger than max_size into path.part001, path.part002, ..., which can be joined again
+    with 'cat path.part* > path'. The numbers are zero-padded so that the shell sorts the parts in the right order.
+    Returns the paths of the parts, or just the path if the file is small enough."""
+
+    if os.path.getsize(path) <= max_size:
+        return [path]
+
+    parts = []
+
+    with open(path, 'rb') as file:
+        while True:
+            data = file.read(max_size)
+
+            if not data:
+                break
+
+            part = f"{path}.part{len(parts) + 1:03d}"
+
+            with open(part, 'wb') as part_file:
+                part_file.write(data)
+
+            parts.append(part)
+
+    os.remove(path)
+    return parts
+
+
+def apply_retention(directory: str, max_age_days: float, prefix: str) -> typing.List[str]:
+    """Deletes backups in the directory that are older than max_age_days and returns their names"""
+
+    threshold = time.time() - max_age_days * 86400
+    deleted = []
+
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.startswith(prefix) and entry.stat().st_mtime < threshold:
+            os.remove(entry.path)
+            deleted.append(entry.name)
+
+    return deleted
+
+
+async def backup_database(directory: str, file_name: str, max_part_size: int, *, user: str, password: str,
+                          database: str, host: str) -> Backup:
+    """Dumps the database with pg_dump into a compressed file in the directory that is split into parts no larger than
+    max_part_size"""
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{file_name}.sql.gz")
+    started = time.perf_counter()
+
+    # Pass the password through the environment instead of the command line, where other users could see it
+    raw_size = await stream_compressed(['pg_dump', database, '-U', user, '-h', host, '-w'], path,
+                                       env={**os.environ, 'PGPASSWORD': password})
+    compressed_size = os.path.getsize(path)
+    parts = await asyncio.get_event_loop().run_in_executor(None, split_file, path, max_part_size)
+
+    return Backup(parts=parts, raw_size=raw_size, compressed_size=compressed_size,
+                  duration=time.perf_counter() - started)
@@ -1,71 +1,360 @@
+import json
+import time
 import asyncio
+import typing
+import functools
+import collections
+
+from dciv_bot.util import statements
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry once it is full and counts its hits, misses and
+    evictions. Entries can optionally expire after a number of seconds, either for the whole cache or per key."""
+
+    def __init__(self, max_size: int, ttl: typing.Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self._lookup(key) is not _MISSING
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _lookup(self, key):
+        try:
+            value, expires_at = self._entries[key]
+        except KeyError:
+            return _MISSING
+
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            return _MISSING
+
+        return value
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, *, ttl: typing.Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        self._entries[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: typing.Callable[[typing.Any], bool]):
+        for key in [key for key, (value, _) in self._entries.items() if predicate(value)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+_MISSING = object()
+
+# Every cache that was created with @cached, by name, for the -cache command
+caches: typing.Dict[str, LRUCache] = {}
+
+
+def cached(name: str, *, max_size: int = 128,
+           ttl: typing.Union[float, typing.Callable[[typing.Any], typing.Optional[float]], None] = None,
+           key: typing.Optional[typing.Callable[..., typing.Hashable]] = None):
+    """Caches the results of a coroutine function in an LRUCache that is registered under the given name.
+
+    The ttl is either the amount of seconds every result is cached for, or a function that gets the result of a call
+    and returns how many seconds that result is cached for, or None to keep it until it is evicted.
+
+    The cache key is built by the key function, which gets the same arguments as the decorated function. By default,
+    that is all arguments except the first, so that methods don't include 'self'. Concurrent calls with the same key
+    while the result is still being loaded share a single call of the decorated function. Exceptions are not cached.
+
+    The decorated function gets the LRUCache as its 'cache' attribute, to invalidate entries.
+    """
+
+    def decorator(func):
+        cache = LRUCache(max_size=max_size, ttl=None if callable(ttl) else ttl)
+        loading: typing.Dict[typing.Hashable, asyncio.Task] = {}
+        make_key = key or (lambda *args, **kwargs: (*args[1:], *sorted(kwargs.items())))
+
+        def on_loaded(cache_key, task: asyncio.Task):
+            loading.pop(cache_key, None)
+
+            if not task.cancelled() and task.exception() is None:
+                result = task.result()
+                cache.put(cache_key, result, ttl=ttl(result) if callable(ttl) else None)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+            value = cache.get(cache_key, _MISSING)
+
+            if value is not _MISSING:
+                return value
+
+            try:
+                task = loading[cache_key]
+            except KeyError:
+                task = loading[cache_key] = asyncio.ensure_future(func(*args, **kwargs))
+                task.add_done_callback(functools.partial(on_loaded, cache_key))
+
+            # Don't cancel the load for the other callers when one of them is cancelled
+            return await asyncio.shield(task)
+
+        wrapper.cache = cache
+        caches[name] = cache
+        return wrapper
+
+    return decorator
+
+
+# Shared by every guild that doesn't exclude any channels from logging, most of them
+NO_CHANNELS = frozenset()
+
+
+class GuildSettings:
+    """The settings of a guild, as stored in the guilds table. logging_excluded is kept as a frozenset for O(1)
+    lookups in the message edit/delete and starboard listeners."""
+
+    __slots__ = ('id', 'welcome', 'welcome_message', 'welcome_channel', 'logging', 'logging_channel',
+                 'excluded_channels', 'defaultrole', 'defaultrole_role', 'tag_creation_allowed')
+
+    def __init__(self, **kwargs):
+        self.id: int = kwargs.get('id')
+        self.welcome: bool = kwargs.get('welcome', False)
+        self.welcome_message: typing.Optional[str] = kwargs.get('welcome_message')
+        self.welcome_channel: typing.Optional[int] = kwargs.get('welcome_channel')
+        self.logging: bool = kwargs.get('logging', False)
+        self.logging_channel: typing.Optional[int] = kwargs.get('logging_channel')
+        self.excluded_channels: typing.FrozenSet[int] = frozenset(kwargs.get('excluded_channels') or ()) or NO_CHANNELS
+        self.defaultrole: bool = kwargs.get('defaultrole', False)
+        self.defaultrole_role: typing.Optional[int] = kwargs.get('defaultrole_role')
+        self.tag_creation_allowed: bool = kwargs.get('tag_creation_allowed', False)
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(id=record['id'], welcome=record['welcome'], welcome_message=record['welcome_message'],
+                   welcome_channel=record['welcome_channel'], logging=record['logging'],
+                   logging_channel=record['logging_channel'], excluded_channels=record['logging_excluded'],
+                   defaultrole=record['defaultrole'], defaultrole_role=record['defaultrole_role'],
+                   tag_creation_allowed=record['tag_creation_allowed'])
+
+
+class DMSettings:
+    """Which DMs a user wants to get from the bot, as stored in the dm_settings table. Users without a row get
+    every DM."""
+
+    __slots__ = ('user_id', 'ban_kick_mute', 'leg_session_open', 'leg_session_update', 'leg_session_submit',
+                 'leg_session_withdraw')
+
+    def __init__(self, user_id: int, **kwargs):
+        self.user_id = user_id
+        self.ban_kick_mute: bool = kwargs.get('ban_kick_mute', True)
+        self.leg_session_open: bool = kwargs.get('leg_session_open', True)
+        self.leg_session_update: bool = kwargs.get('leg_session_update', True)
+        self.leg_session_submit: bool = kwargs.get('leg_session_submit', True)
+        self.leg_session_withdraw: bool = kwargs.get('leg_session_withdraw', True)
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(**record)
+
+    def is_enabled(self, reason: typing.Optional[str]) -> bool:
+        """Whether the user wants DMs of the given reason, which is a column of dm_settings. DMs without a reason
+        or with an unknown one are always sent."""
+
+        if reason is None or reason not in self.__slots__[1:]:
+            return True
+
+        return getattr(self, reason)
 
 
 class Cache:
     def __init__(self, bot):
         self.bot = bot
-        self.guild_config = None
+        self.guild_config: typing.Optional[typing.Dict[int, GuildSettings]] = None
+
+        # Sessions, bills, laws and motions, keyed by (class, id). Entries are invalidated by the methods of
+        # those classes that write to the database, see dciv_bot.util.converter
+        self.legislature = LRUCache(max_size=1024)
+
+        # DMSettings by user ID, also for users that don't have a row in dm_settings
+        self.dm_settings = LRUCache(max_size=4096)
+
         self.bot.loop.create_task(self.update_guild_config_cache())
-        self.allowed_guild_settings = ("welcome", "welcome_message", "welcome_channel", "logging", "logging_channel",
-                                       "logging_excluded", "defaultrole", "defaultrole_role", "tag_creation_allowed")
+        self.bot.loop.create_task(self.listen_for_invalidations())
+
+    async def listen_for_invalidations(self):
+        """Keeps a dedicated connection open that LISTENs on the 'cache_invalidation' channel that the triggers from
+        schema.sql notify. Changes that were made by someone else than this bot, like another instance of the bot,
+        a migration script or manual SQL, are then applied to the caches as well.
+
+        Other caches can subscribe to these changes with an 'on_cache_invalidation(table, operation, keys)' listener.
+        If the connection was lost, notifications might have been missed and the listeners are called once with
+        the table being None, meaning that everything should be reloaded."""
+
+        await self.bot.db_ready.wait()
+
+        reconnected = False
+
+        while not self.bot.is_closed():
+            closed = asyncio.Event()
+
+            try:
+                connection = await self.bot.create_db_connection()
+                connection.add_termination_listener(lambda _connection: closed.set())
+                await connection.add_listener('cache_invalidation', self._on_notification)
+            except Exception as e:
+                print(f"[DATABASE] Could not listen for cache invalidations, retrying in 30 seconds. "
+                      f"{e.__class__.__name__}: {e}")
+                await asyncio.sleep(30)
+                continue
+
+            if reconnected:
+                print("[CACHE] Reconnected to cache invalidations, reloading all caches.")
+                await self.on_cache_invalidation(None, None, {})
+                self.bot.dispatch('cache_invalidation', None, None, {})
+
+            reconnected = True
+
+            try:
+                await closed.wait()
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+    def _on_notification(self, _connection, _pid, _channel, payload: str):
+        notification = json.loads(payload)
+
+        # This bot already updated its caches itself when it made that change
+        if notification['origin'] == self.bot.db_application_name:
+            return
+
+        self.bot.loop.create_task(self.on_cache_invalidation(notification['table'], notification['operation'],
+                                                             notification['keys']))
+        self.bot.dispatch('cache_invalidation', notification['table'], notification['operation'],
+                          notification['keys'])
+
+    async def on_cache_invalidation(self, table: typing.Optional[str], operation: typing.Optional[str], keys: dict):
+        if table is None:
+            self.dm_settings.clear()
+            await self.update_guild_config_cache()
+
+        elif table == 'dm_settings':
+            self.dm_settings.invalidate(keys['user_id'])
+
+        elif table == 'guilds':
+            if operation == 'DELETE':
+                self.evict_guild_config(keys['id'])
+            else:
+                await self.refresh_guild_config(keys['id'])
 
     async def verify_guild_config_cache(self, message):
         if message.guild is None:
             return
 
-        if message.guild.id not in self.guild_config:
-            if not await self.bot.checks.is_guild_initialized(message.guild.id):
+        if self.guild_config is not None and message.guild.id not in self.guild_config:
+            if not await self.refresh_guild_config(message.guild.id):
                 print(f"[DATABASE] Guild {message.guild.name} ({message.guild.id}) was not initialized. "
                       f"Adding default entry to database... ")
-                await self.bot.db.execute("INSERT INTO guilds (id) VALUES ($1)", message.guild.id)
+                record = await self.bot.db.fetchrow("INSERT INTO guilds (id) VALUES ($1) ON CONFLICT (id) DO UPDATE "
+                                                    "SET id = EXCLUDED.id RETURNING *", message.guild.id)
+                self.upsert_guild_config(record)
                 print(f"[DATABASE] Successfully initialized guild {message.guild.name} ({message.guild.id})")
 
-            await self.update_guild_config_cache()
-
     async def update_guild_config_cache(self):
-        await self.bot.wait_until_ready()
-
-        if self.bot.db is None:
-            await asyncio.sleep(5)
+        await self.bot.db_ready.wait()
 
         records = await self.bot.db.fetch("SELECT * FROM guilds")
         guild_config = dict()
 
         for record in records:
-            config = {"welcome": record['welcome'],
-                      "welcome_message": record['welcome_message'],
-                      "welcome_channel": record['welcome_channel'],
-                      "logging": record['logging'],
-                      "logging_channel": record['logging_channel'],
-                      "logging_excluded": record['logging_excluded'],
-                      "defaultrole": record['defaultrole'],
-                      "defaultrole_role": record['defaultrole_role'],
-                      "tag_creation_allowed": record['tag_creation_allowed']
-                      }
-
-            guild_config[record['id']] = config
+            guild_config[record['id']] = GuildSettings.from_record(record)
 
         self.guild_config = guild_config
         print("[CACHE] Guild config cache was updated.")
 
-    async def get_guild_config_cache(self, guild_id: int, setting: str):
-        if setting not in self.allowed_guild_settings:
-            raise Exception("illegal setting")
+        if not self.bot.caches_warm.is_set():
+            self.bot.mark_startup_phase("Caches warm")
+            self.bot.caches_warm.set()
+
+    def upsert_guild_config(self, record):
+        """Puts a row of the guilds table into the cache, replacing the old entry of that guild"""
+
+        if self.guild_config is not None:
+            self.guild_config[record['id']] = GuildSettings.from_record(record)
+
+    def evict_guild_config(self, guild_id: int):
+        if self.guild_config is not None:
+            self.guild_config.pop(guild_id, None)
 
-        if not self.bot.is_ready():
-            await self.bot.wait_until_ready()
+    async def refresh_guild_config(self, guild_id: int) -> bool:
+        """Reloads the config of a single guild from the database. Returns False if the guild has no entry in the
+        database, in which case it is removed from the cache."""
 
-        if self.guild_config is None:
-            await asyncio.sleep(5)
+        record = await statements.fetch_guild_config(self.bot.db, guild_id)
+
+        if record is None:
+            self.evict_guild_config(guild_id)
+            return False
+
+        self.upsert_guild_config(record)
+        return True
+
+    def get_guild_settings(self, guild_id: int) -> GuildSettings:
+        """Returns the cached settings of a guild without touching the database. Guilds that are not (yet) cached, for
+        example because the bot just joined them, get the defaults of the guilds table."""
 
         try:
-            cached = self.guild_config[guild_id][setting]
-        except (TypeError, KeyError) as e:
-            print(f"[CACHE] Error in Cache.get_guild_config_cache({guild_id}, {setting})."
-                  f" Possible race condition on_guild_join"
-                  f"\n{e.__class__.__name__}: {e}")
+            return self.guild_config[guild_id]
+        except (TypeError, KeyError):
+            return GuildSettings(id=guild_id)
+
+    async def get_dm_settings(self, user_ids: typing.Iterable[int]) -> typing.Dict[int, DMSettings]:
+        """Returns the DM settings of all given users, loading the ones that are not cached with a single query"""
+
+        settings = {}
+
+        for user_id in user_ids:
+            settings[user_id] = self.dm_settings.get(user_id)
+
+        missing = [user_id for user_id, user_settings in settings.items() if user_settings is None]
+
+        if missing:
+            records = await self.bot.db.fetch("SELECT * FROM dm_settings WHERE user_id = ANY($1::bigint[])", missing)
+            loaded = {record['user_id']: DMSettings.from_record(record) for record in records}
+
+            for user_id in missing:
+                settings[user_id] = loaded.get(user_id) or DMSettings(user_id)
+                self.dm_settings.put(user_id, settings[user_id])
+
+        return settings
 
-            # f-string sql query is bad practice
-            return await self.bot.db.fetchval(f"SELECT {setting} FROM guilds WHERE id = $1", guild_id)
+    def update_dm_settings(self, record):
+        """Puts a row of the dm_settings table into the cache"""
 
-        return cached
+        self.dm_settings.put(record['user_id'], DMSettings.from_record(record))
@@ -7,6 +7,8 @@ from dciv_bot.config import config
 from datetime import datetime
 from discord.ext import commands
 from discord.ext.commands import BadArgument
+from dciv_bot.util import statements
+from dciv_bot.util.cache import cached
 from dciv_bot.util.exceptions import DemocracivBotException, TagError, NotFoundError, PartyNotFoundError
 
 
@@ -248,32 +250,33 @@ class Tag(commands.Converter):
         return discord.utils.escape_mentions(self.content)
 
     @classmethod
-    async def convert(cls, ctx, argument: str):
-        tag_id = await ctx.bot.db.fetchval("SELECT tag_id FROM guild_tags_alias WHERE global = true AND alias = $1",
-                                           argument.lower())
+    async def fetch_record(cls, ctx, argument: str):
+        """Gets the tag that matches the alias together with all of its aliases in one query. Global tags take
+        precedence over local tags with the same alias."""
 
-        if tag_id is None:
-            tag_id = await ctx.bot.db.fetchval(
-                "SELECT tag_id FROM guild_tags_alias WHERE alias = $1 AND guild_id = $2",
-                argument.lower(), ctx.guild.id)
+        tag_details = await statements.fetch_tag(ctx.bot.db, argument.lower(), ctx.guild.id if ctx.guild else None)
 
-        if tag_id is None:
+        if tag_details is None:
             raise TagError(f":x: There is no global or local tag named `{argument}`.")
 
-        tag_details = await ctx.bot.db.fetchrow("SELECT * FROM guild_tags WHERE id = $1", tag_id)
-
-        aliases = await ctx.bot.db.fetch("SELECT alias FROM guild_tags_alias WHERE tag_id = $1", tag_id)
-        aliases = [record['alias'] for record in aliases]
+        return tag_details
 
+    @classmethod
+    def from_record(cls, bot, record, **kwargs):
         try:
-            is_embedded = tag_details['is_embedded']
+            is_embedded = record['is_embedded']
         except KeyError:  # backwards compatibility
             is_embedded = True
 
-        return cls(id=tag_details['id'], name=tag_details['name'], title=tag_details['title'],
-                   content=tag_details['content'], _global=tag_details['global'], uses=tag_details['uses'],
-                   bot=ctx.bot, guild=tag_details['guild_id'], author=tag_details['author'], aliases=aliases,
-                   is_embedded=is_embedded)
+        return cls(id=record['id'], name=record['name'], title=record['title'],
+                   content=record['content'], _global=record['global'], uses=record['uses'],
+                   bot=bot, guild=record['guild_id'], author=record['author'], aliases=list(record['aliases']),
+                   is_embedded=is_embedded, **kwargs)
+
+    @classmethod
+    async def convert(cls, ctx, argument: str):
+        tag_details = await cls.fetch_record(ctx, argument)
+        return cls.from_record(ctx.bot, tag_details)
 
 
 class OwnedTag(Tag):
@@ -287,18 +290,7 @@ class OwnedTag(Tag):
 
     @classmethod
     async def convert(cls, ctx, argument: str):
-        tag_id = await ctx.bot.db.fetchval("SELECT tag_id FROM guild_tags_alias WHERE global = true AND alias = $1",
-                                           argument.lower())
-
-        if tag_id is None:
-            tag_id = await ctx.bot.db.fetchval(
-                "SELECT tag_id FROM guild_tags_alias WHERE alias = $1 AND guild_id = $2",
-                argument.lower(), ctx.guild.id)
-
-        if tag_id is None:
-            raise TagError(f":x: There is no global or local tag named `{argument}`.")
-
-        tag_details = await ctx.bot.db.fetchrow("SELECT * FROM guild_tags WHERE id = $1", tag_id)
+        tag_details = await cls.fetch_record(ctx, argument)
 
         if tag_details['global'] and tag_details['guild_id'] != ctx.guild.id:
             raise TagError(f":x: Global tags can only be edited, transferred or removed on "
@@ -307,18 +299,88 @@ class OwnedTag(Tag):
         if tag_details['author'] != ctx.author.id and not ctx.author.guild_permissions.administrator:
             raise TagError(f":x: That isn't your tag.")
 
-        aliases = await ctx.bot.db.fetch("SELECT alias FROM guild_tags_alias WHERE tag_id = $1", tag_id)
-        aliases = [record['alias'] for record in aliases]
+        return cls.from_record(ctx.bot, tag_details, invoked_with=argument.lower())
 
-        try:
-            is_embedded = tag_details['is_embedded']
-        except KeyError:  # backwards compatibility
-            is_embedded = True
 
-        return cls(id=tag_details['id'], name=tag_details['name'], title=tag_details['title'],
-                   content=tag_details['content'], _global=tag_details['global'], uses=tag_details['uses'],
-                   bot=ctx.bot, guild=tag_details['guild_id'], author=tag_details['author'], aliases=aliases,
-                   is_embedded=is_embedded, invoked_with=argument.lower())
+def get_identity_map(ctx) -> typing.Dict[typing.Tuple[type, int], typing.Any]:
+    """Returns the identity map of a command invocation. Every Session, Bill, Law and Motion that is loaded
+    during the invocation is kept in there, so that an ID is only loaded once and always resolves to the same object."""
+
+    identity_map = getattr(ctx, 'identity_map', None)
+
+    if identity_map is None:
+        identity_map = ctx.identity_map = {}
+
+    return identity_map
+
+
+def remember(ctx, obj):
+    """Puts obj into the identity map of ctx and into the legislature cache. If an object with the same ID was
+    already loaded during this invocation, that one is returned instead."""
+
+    obj = get_identity_map(ctx).setdefault((type(obj), obj.id), obj)
+    ctx.bot.cache.legislature.put((type(obj), obj.id), obj)
+    return obj
+
+
+def recall(ctx, cls, obj_id: int):
+    """Returns the object of that class and ID if it was already loaded during this invocation or is
+    in the legislature cache, otherwise None"""
+
+    identity_map = get_identity_map(ctx)
+
+    try:
+        return identity_map[(cls, obj_id)]
+    except KeyError:
+        pass
+
+    obj = ctx.bot.cache.legislature.get((cls, obj_id))
+
+    if obj is not None:
+        identity_map[(cls, obj_id)] = obj
+
+    return obj
+
+
+def invalidate_session(bot, session_id: int):
+    """Drops a session and every cached bill, motion and law of that session from the legislature cache"""
+
+    def belongs_to_session(obj) -> bool:
+        if isinstance(obj, Session):
+            return obj.id == session_id
+
+        if isinstance(obj, Law):
+            obj = obj.bill
+
+        return obj.session is not None and obj.session.id == session_id
+
+    bot.cache.legislature.invalidate_where(belongs_to_session)
+
+
+def invalidate_bill(bot, bill_id: int):
+    """Drops a bill and its law from the legislature cache"""
+
+    def is_bill(obj) -> bool:
+        return (isinstance(obj, Bill) and obj.id == bill_id) or (isinstance(obj, Law) and obj.bill.id == bill_id)
+
+    bot.cache.legislature.invalidate_where(is_bill)
+
+
+def invalidate_parties():
+    """Drops every cached party. Has to be called after the parties or party_alias tables were changed."""
+
+    PoliticalParty.fetch_record.cache.clear()
+
+
+# Every column of legislature_sessions (aliased as "s") plus the IDs of the session's bills and motions. This is
+# selected by the Session, Bill, Motion and Law converters so that each of them only needs a single query.
+SESSION_COLUMNS = """s.id AS session_id, s.speaker AS session_speaker, s.is_active AS session_is_active,
+                     s.status AS session_status, s.vote_form AS session_vote_form, s.opened_on AS session_opened_on,
+                     s.voting_started_on AS session_voting_started_on, s.closed_on AS session_closed_on,
+                     ARRAY(SELECT sb.id FROM legislature_bills sb
+                           WHERE sb.leg_session = s.id ORDER BY sb.id) AS session_bills,
+                     ARRAY(SELECT sm.id FROM legislature_motions sm
+                           WHERE sm.leg_session = s.id ORDER BY sm.id) AS session_motions"""
 
 
 class Session(commands.Converter):
@@ -352,10 +414,24 @@ class Session(commands.Converter):
                                    " voting_started_on = $2, vote_form = $3"
                                    " WHERE id = $1", self.id, datetime.utcnow(), voting_form)
 
+        self.status = SessionStatus.VOTING_PERIOD
+        self.voting_started_on = datetime.utcnow()
+        self.vote_form = voting_form
+        invalidate_session(self._bot, self.id)
+
     async def close(self):
         await self._bot.db.execute("UPDATE legislature_sessions SET is_active = false, closed_on = $2,"
                                    " status = 'Closed' WHERE id = $1", self.id, datetime.utcnow())
 
+        #  Update all bills that did not pass
+        await self._bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE leg_session = $2",
+                                   BillStatus.LEG_FAILED.value, self.id)
+
+        self.is_active = False
+        self.status = SessionStatus.CLOSED
+        self.closed_on = datetime.utcnow()
+        invalidate_session(self._bot, self.id)
+
     @classmethod
     async def convert(cls, ctx, argument: typing.Union[int, str]):
         if isinstance(argument, str):
@@ -367,22 +443,48 @@ class Session(commands.Converter):
                 except ValueError:
                     raise BadArgument(f":x: {argument} is neither a number nor 'all'.")
 
-        session = await ctx.bot.db.fetchrow("SELECT * FROM legislature_sessions WHERE id = $1", argument)
+        session = recall(ctx, cls, argument)
+
+        if session is not None:
+            return session
+
+        session = await ctx.bot.db.fetchrow(f"SELECT {SESSION_COLUMNS} FROM legislature_sessions s WHERE s.id = $1",
+                                            argument)
 
         if session is None:
             raise NotFoundError(f":x: There is no session with ID #{argument}.")
 
-        bills = await ctx.bot.db.fetch("SELECT id FROM legislature_bills WHERE leg_session = $1", session['id'])
-        bills = sorted([record['id'] for record in bills])
+        return remember(ctx, cls.from_record(ctx.bot, session))
+
+    @classmethod
+    def from_record(cls, bot, record):
+        """Builds a Session from a record that contains the columns of SESSION_COLUMNS"""
+
+        return cls(id=record['session_id'], is_active=record['session_is_active'],
+                   status=record['session_status'],
+                   vote_form=record['session_vote_form'], opened_on=record['session_opened_on'],
+                   voting_started_on=record['session_voting_started_on'], closed_on=record['session_closed_on'],
+                   speaker=record['session_speaker'], bills=list(record['session_bills']),
+                   motions=list(record['session_motions']), bot=bot)
+
+    @classmethod
+    async def convert_many(cls, ctx, session_ids: typing.Iterable[int]) -> typing.Dict[int, 'Session']:
+        """Loads any amount of sessions including the IDs of their bills and motions in a single query.
+        Returns a dict of session id -> Session, sessions that do not exist are left out."""
+
+        identity_map = get_identity_map(ctx)
+        session_ids = set(session_ids)
+        missing = [session_id for session_id in session_ids if recall(ctx, cls, session_id) is None]
+
+        if missing:
+            records = await ctx.bot.db.fetch(f"SELECT {SESSION_COLUMNS} FROM legislature_sessions s"
+                                             f" WHERE s.id = ANY($1::int[])", missing)
 
-        motions = await ctx.bot.db.fetch("SELECT id FROM legislature_motions WHERE leg_session = $1", session['id'])
-        motions = sorted([record['id'] for record in motions])
+            for record in records:
+                remember(ctx, cls.from_record(ctx.bot, record))
 
-        return cls(id=session['id'], is_active=session['is_active'],
-                   status=SessionStatus.from_str(session['status']),
-                   vote_form=session['vote_form'], opened_on=session['opened_on'],
-                   voting_started_on=session['voting_started_on'], closed_on=session['closed_on'],
-                   speaker=session['speaker'], bills=bills, motions=motions, bot=ctx.bot)
+        return {session_id: identity_map[(cls, session_id)] for session_id in session_ids
+                if (cls, session_id) in identity_map}
 
 
 class Bill(commands.Converter):
@@ -406,6 +508,9 @@ class Bill(commands.Converter):
         self.is_vetoable: bool = kwargs.get('is_vetoable')
         self.status: BillStatus = kwargs.get('status')
         self.repealed_on: typing.Optional[datetime] = kwargs.get('repealed_on')
+        self.law_id: typing.Optional[int] = kwargs.get('law_id')
+        # Whether law_id is known to be up to date, even if it is None because this bill is not a law
+        self._law_status_known: bool = kwargs.get('law_status_known', False)
         self._submitter: int = kwargs.get('submitter')
         self._bot = kwargs.get('bot')
 
@@ -424,39 +529,52 @@ class Bill(commands.Converter):
             return self.name
 
     async def is_law(self) -> bool:
-        found = await self._bot.db.fetchval("SELECT law_id FROM legislature_laws WHERE bill_id = $1", self.id)
-
-        if found:
+        # The converters already joined the legislature_laws table, so we only have to hit the database if this
+        # object was constructed without knowing about its law
+        if self.law_id is not None:
             return True
-        else:
+
+        if self._law_status_known:
             return False
 
+        self.law_id = await self._bot.db.fetchval("SELECT law_id FROM legislature_laws WHERE bill_id = $1", self.id)
+        self._law_status_known = True
+        return self.law_id is not None
+
     async def withdraw(self):
         await self._bot.db.execute("DELETE FROM legislature_bills WHERE id = $1", self.id)
+        invalidate_session(self._bot, self.session.id)
 
     async def pass_from_legislature(self):
         await self._bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE id = $2",
                                    BillStatus.LEG_PASSED.value,
                                    self.id)
+        self.status = BillStatus.LEG_PASSED
+        invalidate_bill(self._bot, self.id)
 
     async def veto(self):
         await self._bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE id = $2",
                                    BillStatus.MIN_FAILED.value,
                                    self.id)
+        self.status = BillStatus.MIN_FAILED
+        invalidate_bill(self._bot, self.id)
 
     async def pass_into_law(self, override: bool = False):
         if self.is_vetoable and not override:
             await self._bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE id = $2",
                                        BillStatus.MIN_PASSED.value,
                                        self.id)
+            self.status = BillStatus.MIN_PASSED
         if override:
             await self._bot.db.execute("UPDATE legislature_bills SET status = $1 WHERE id = $2",
                                        BillStatus.VETO_OVERRIDDEN.value,
                                        self.id)
+            self.status = BillStatus.VETO_OVERRIDDEN
 
         law_id = await self._bot.db.fetchval("INSERT INTO legislature_laws (bill_id, passed_on)"
                                              " VALUES ($1, $2) RETURNING law_id",
                                              self.id, datetime.utcnow())
+        self.law_id = law_id
 
         # The bot takes the submitter-provided description (from the -legislature submit command) *and* the description
         # from Google Docs (og:description property in HTML, usually the title of the Google Doc and the first
@@ -477,6 +595,8 @@ class Bill(commands.Converter):
             await self._bot.db.execute("INSERT INTO legislature_tags (id, tag) VALUES ($1, $2) ON CONFLICT DO NOTHING",
                                        law_id, tag.lower())
 
+        invalidate_bill(self._bot, self.id)
+
     async def get_emojified_status(self, verbose: bool = True) -> str:
         if self.status is BillStatus.SUBMITTED:
             if verbose:
@@ -542,25 +662,61 @@ class Bill(commands.Converter):
 
             return f"{config.LEG_BILL_STATUS_GREEN}{config.LEG_BILL_STATUS_GREEN}{config.LEG_BILL_STATUS_RED}"
 
+    @classmethod
+    def from_record(cls, bot, record, session: Session):
+        return cls(id=record['id'], name=record['bill_name'], link=record['link'], tiny_link=record['tiny_link'],
+                   description=record['description'], is_vetoable=record['is_vetoable'],
+                   session=session, submitter=record['submitter'], status=BillStatus(record['status']),
+                   repealed_on=record['repealed_on'], law_id=record['law_id'], law_status_known=True,
+                   google_docs_description=record['google_docs_description'], bot=bot)
+
     @classmethod
     async def convert(cls, ctx, argument: typing.Union[int, str]):
+        query = f"""SELECT b.*, l.law_id, {SESSION_COLUMNS} FROM legislature_bills b
+                    JOIN legislature_sessions s ON s.id = b.leg_session
+                    LEFT JOIN legislature_laws l ON l.bill_id = b.id"""
+
         try:
             argument = int(argument)
-            bill = await ctx.bot.db.fetchrow("SELECT * FROM legislature_bills WHERE id = $1", argument)
+
+            bill = recall(ctx, cls, argument)
+
+            if bill is not None:
+                return bill
+
+            bill = await ctx.bot.db.fetchrow(f"{query} WHERE b.id = $1", argument)
         except ValueError:
-            bill = await ctx.bot.db.fetchrow("SELECT * FROM legislature_bills WHERE"
-                                             " lower(bill_name) = $2 or link = $1 or tiny_link = $1", argument,
-                                             argument.lower())
+            bill = await ctx.bot.db.fetchrow(f"{query} WHERE lower(b.bill_name) = $2 or b.link = $1"
+                                             f" or b.tiny_link = $1", argument, argument.lower())
 
         if bill is None:
             raise NotFoundError(f":x: There is no bill that matches `{argument}`.")
 
-        session = await Session.convert(ctx, bill['leg_session'])
+        session = remember(ctx, Session.from_record(ctx.bot, bill))
+        return remember(ctx, cls.from_record(ctx.bot, bill, session))
+
+    @classmethod
+    async def convert_many(cls, ctx, bill_ids: typing.Iterable[int]) -> typing.List['Bill']:
+        """Loads any amount of bills together with their sessions and law status in a constant amount of queries,
+        instead of one Bill.convert() per bill. Bills are returned in the order of bill_ids, IDs of bills that
+        do not exist are skipped."""
+
+        identity_map = get_identity_map(ctx)
+        bill_ids = list(bill_ids)
+        missing = list({bill_id for bill_id in bill_ids if recall(ctx, cls, bill_id) is None})
 
-        return cls(id=bill['id'], name=bill['bill_name'], link=bill['link'], tiny_link=bill['tiny_link'],
-                   description=bill['description'], is_vetoable=bill['is_vetoable'],
-                   session=session, submitter=bill['submitter'], status=BillStatus(bill['status']),
-                   google_docs_description=bill['google_docs_description'], bot=ctx.bot)
+        if missing:
+            query = """SELECT b.*, l.law_id FROM legislature_bills b
+                       LEFT JOIN legislature_laws l ON l.bill_id = b.id
+                       WHERE b.id = ANY($1::int[])"""
+
+            records = await ctx.bot.db.fetch(query, missing)
+            sessions = await Session.convert_many(ctx, [record['leg_session'] for record in records])
+
+            for record in records:
+                remember(ctx, cls.from_record(ctx.bot, record, sessions.get(record['leg_session'])))
+
+        return [identity_map[(cls, bill_id)] for bill_id in bill_ids if (cls, bill_id) in identity_map]
 
 
 class Law(commands.Converter):
@@ -581,14 +737,34 @@ class Law(commands.Converter):
         self.tags: typing.List[str] = kwargs.get('tags')
         self._bot = kwargs.get('bot')
 
+    # The law, its tags, its bill and the bill's session, all in one row
+    query = f"""SELECT l.law_id, l.passed_on, b.*,
+                       ARRAY(SELECT t.tag FROM legislature_tags t WHERE t.id = l.law_id) AS tags,
+                       {SESSION_COLUMNS}
+                FROM legislature_laws l
+                JOIN legislature_bills b ON b.id = l.bill_id
+                JOIN legislature_sessions s ON s.id = b.leg_session"""
+
     @classmethod
     async def from_bill(cls, ctx, bill_id: int):
-        law = await ctx.bot.db.fetchval("SELECT law_id FROM legislature_laws WHERE bill_id = $1", bill_id)
+        law = await ctx.bot.db.fetchrow(f"{cls.query} WHERE l.bill_id = $1", bill_id)
 
         if law is None:
             raise NotFoundError(f":x: There is no law with associated bill ID #{bill_id}.")
 
-        return await cls.convert(ctx, law)
+        return cls.from_joined_record(ctx, law)
+
+    @classmethod
+    def from_record(cls, bot, record, bill: Bill):
+        return cls(id=record['law_id'], bill=bill, tags=list(record['tags']), passed_on=record['passed_on'], bot=bot)
+
+    @classmethod
+    def from_joined_record(cls, ctx, record):
+        """Builds the Law, its Bill and the bill's Session from one row of Law.query"""
+
+        session = remember(ctx, Session.from_record(ctx.bot, record))
+        bill = remember(ctx, Bill.from_record(ctx.bot, record, session))
+        return remember(ctx, cls.from_record(ctx.bot, record, bill))
 
     async def repeal(self):
         await self._bot.db.execute("UPDATE legislature_bills SET status = $1, repealed_on = $2 WHERE id = $3",
@@ -598,6 +774,11 @@ class Law(commands.Converter):
 
         await self._bot.db.execute("DELETE FROM legislature_laws WHERE law_id = $1", self.id)
 
+        self.bill.status = BillStatus.REPEALED
+        self.bill.repealed_on = datetime.utcnow()
+        self.bill.law_id = None
+        invalidate_bill(self._bot, self.bill.id)
+
     async def amend(self, new_link: str):
         tiny_url = await self._bot.laws.post_to_tinyurl(new_link)
 
@@ -608,35 +789,29 @@ class Law(commands.Converter):
         await self._bot.db.execute("UPDATE legislature_bills SET link = $1, tiny_link = $2 WHERE id = $3",
                                    new_link, tiny_url, self.bill.id)
 
+        self.bill.link = new_link
+        self.bill.tiny_link = tiny_url
+        invalidate_bill(self._bot, self.bill.id)
+
     @classmethod
     async def convert(cls, ctx, argument: typing.Union[int, str]):
         try:
             argument = int(argument)
-            law = await ctx.bot.db.fetchrow("SELECT * FROM legislature_laws WHERE law_id = $1", argument)
-        except ValueError:
-            query = """SELECT law_id FROM legislature_laws AS l
-                       JOIN legislature_bills b on l.bill_id = b.id
-                       WHERE (lower(b.bill_name) = $2 OR b.link = $1 OR b.tiny_link = $1)"""
 
-            law_id = await ctx.bot.db.fetchval(query, argument, argument.lower())
+            law = recall(ctx, cls, argument)
 
-            if law_id:
-                law = await ctx.bot.db.fetchrow("SELECT * FROM legislature_laws WHERE law_id = $1", law_id)
-            else:
-                law = None
+            if law is not None:
+                return law
+
+            law = await ctx.bot.db.fetchrow(f"{cls.query} WHERE l.law_id = $1", argument)
+        except ValueError:
+            law = await ctx.bot.db.fetchrow(f"{cls.query} WHERE (lower(b.bill_name) = $2 OR b.link = $1"
+                                            f" OR b.tiny_link = $1)", argument, argument.lower())
 
         if law is None:
             raise NotFoundError(f":x: There is no law with ID #{argument}.")
 
-        bill = await Bill.convert(ctx, law['bill_id'])
-
-        if bill is None:
-            raise DemocracivBotException("Something fucked up")
-
-        tags = await ctx.bot.db.fetch("SELECT * FROM legislature_tags WHERE id = $1", law['law_id'])
-        tags = [record['tag'] for record in tags]
-
-        return cls(id=law['law_id'], bill=bill, tags=tags, passed_on=law['passed_on'], bot=ctx.bot)
+        return cls.from_joined_record(ctx, law)
 
 
 class Motion(commands.Converter):
@@ -680,6 +855,7 @@ class Motion(commands.Converter):
 
     async def withdraw(self):
         await self._bot.db.execute("DELETE FROM legislature_motions WHERE id = $1", self.id)
+        invalidate_session(self._bot, self.session.id)
 
     @classmethod
     async def convert(cls, ctx, argument: int):
@@ -688,15 +864,42 @@ class Motion(commands.Converter):
         except ValueError:
             raise BadArgument(f":x: {argument} is not a number.")
 
-        motion = await ctx.bot.db.fetchrow("SELECT * FROM legislature_motions WHERE id = $1", argument)
+        motion = recall(ctx, cls, argument)
+
+        if motion is not None:
+            return motion
+
+        motion = await ctx.bot.db.fetchrow(f"SELECT m.*, {SESSION_COLUMNS} FROM legislature_motions m"
+                                           f" JOIN legislature_sessions s ON s.id = m.leg_session"
+                                           f" WHERE m.id = $1", argument)
 
         if motion is None:
             raise NotFoundError(f":x: There is no motion with ID #{argument}.")
 
-        session = await Session.convert(ctx, motion['leg_session'])
+        session = remember(ctx, Session.from_record(ctx.bot, motion))
+        return remember(ctx, cls.from_record(ctx.bot, motion, session))
+
+    @classmethod
+    def from_record(cls, bot, record, session: Session):
+        return cls(id=record['id'], title=record['title'], link=record['hastebin'], description=record['description'],
+                   session=session, submitter=record['submitter'], bot=bot)
+
+    @classmethod
+    async def convert_many(cls, ctx, motion_ids: typing.Iterable[int]) -> typing.List['Motion']:
+        """Same as Bill.convert_many(), but for motions."""
+
+        identity_map = get_identity_map(ctx)
+        motion_ids = list(motion_ids)
+        missing = list({motion_id for motion_id in motion_ids if recall(ctx, cls, motion_id) is None})
 
-        return cls(id=motion['id'], title=motion['title'], link=motion['hastebin'], description=motion['description'],
-                   session=session, submitter=motion['submitter'], bot=ctx.bot)
+        if missing:
+            records = await ctx.bot.db.fetch("SELECT * FROM legislature_motions WHERE id = ANY($1::int[])", missing)
+            sessions = await Session.convert_many(ctx, [record['leg_session'] for record in records])
+
+            for record in records:
+                remember(ctx, cls.from_record(ctx.bot, record, sessions.get(record['leg_session'])))
+
+        return [identity_map[(cls, motion_id)] for motion_id in motion_ids if (cls, motion_id) in identity_map]
 
 
 class PoliticalParty(commands.Converter):
@@ -740,42 +943,52 @@ class PoliticalParty(commands.Converter):
         except (discord.NotFound, discord.HTTPException):
             return None
 
+    @staticmethod
+    @cached('parties', max_size=256, key=lambda bot, argument: argument)
+    async def fetch_record(bot, argument: typing.Union[int, str]):
+        """Returns the row of a party by its role id or by one of its aliases. The rows are cached until the parties or
+        party_alias tables change, see invalidate_parties()."""
+
+        query = """SELECT p.*, ARRAY(SELECT a.alias FROM party_alias a WHERE a.party_id = p.id) AS aliases
+                   FROM parties p"""
+
+        if isinstance(argument, int):
+            return await bot.db.fetchrow(f"{query} WHERE p.id = $1", argument)
+
+        return await bot.db.fetchrow(f"{query} WHERE p.id = (SELECT party_id FROM party_alias WHERE alias = $1)",
+                                     argument)
+
     @classmethod
     async def convert(cls, ctx, argument: typing.Union[int, str]):
         if isinstance(argument, int):
             # Check if role still exists before doing DB query
-            party = ctx.bot.democraciv_guild_object.get_role(argument)
+            role = ctx.bot.democraciv_guild_object.get_role(argument)
 
-            if party is None:
+            if role is None:
                 raise PartyNotFoundError(argument)
 
-            party_id = argument
+            party = await cls.fetch_record(ctx.bot, argument)
 
         elif isinstance(argument, str):
             if argument.lower() in ("independent", "independant", "ind", "ind."):
                 return cls(role=discord.utils.get(ctx.bot.democraciv_guild_object.roles, name="Independent"),
                            is_private=False, bot=ctx.bot)
 
-            party_id = await ctx.bot.db.fetchval("SELECT party_id FROM party_alias WHERE alias = $1", argument.lower())
+            party = await cls.fetch_record(ctx.bot, argument.lower())
 
-            if party_id is None:
-                party = discord.utils.get(ctx.bot.democraciv_guild_object.roles, name=argument)
+            if party is None:
+                role = discord.utils.get(ctx.bot.democraciv_guild_object.roles, name=argument)
 
-                if party is None:
+                if role is None:
                     raise PartyNotFoundError(argument)
-                else:
-                    party_id = party.id
+
+                party = await cls.fetch_record(ctx.bot, role.id)
 
         else:
             raise PartyNotFoundError(argument)
 
-        party = await ctx.bot.db.fetchrow("SELECT * FROM parties WHERE id = $1", party_id)
-
         if party is None:
             raise PartyNotFoundError(argument)
 
-        aliases = await ctx.bot.db.fetch("SELECT alias FROM party_alias WHERE party_id = $1", party['id'])
-        aliases = [record['alias'] for record in aliases]
-
         return cls(id=party['id'], leader=party['leader'], discord_invite=party['discord_invite'],
-                   is_private=party['is_private'], aliases=aliases, bot=ctx.bot)
+                   is_private=party['is_private'], aliases=list(party['aliases']), bot=ctx.bot)
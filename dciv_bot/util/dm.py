@@ -0,0 +1,102 @@
+import time
+import typing
+import asyncio
+import discord
+
+from dciv_bot.config import config
+
+
+class DMReport(typing.NamedTuple):
+    delivered: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    def __str__(self):
+        return f"{self.delivered} delivered, {self.skipped} skipped, {self.failed} failed"
+
+
+class DMDispatcher:
+    """Sends DMs to users that did not disable them with -dms.
+
+    The settings of all recipients are loaded with a single query through the DM settings cache. DMs are sent by at
+    most config.DM_CONCURRENCY tasks at once and no faster than config.DM_PER_SECOND, as Discord is quick to rate
+    limit bots that DM a lot of users. DMs to many users, like all Legislators, can be queued with queue() so that the
+    command that caused them doesn't have to wait.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._semaphore = asyncio.Semaphore(config.DM_CONCURRENCY)
+        self._interval = 1 / config.DM_PER_SECOND
+        self._next_send = 0.0
+        self._queue: typing.Optional[asyncio.Queue] = None
+        self._worker: typing.Optional[asyncio.Task] = None
+
+    @staticmethod
+    def with_footer(message: typing.Optional[str]) -> str:
+        footer = f"*If you want to enable or disable specific DMs from me, check `{config.BOT_PREFIX}help dms`.*"
+        return f"{message}\n\n{footer}" if message else footer
+
+    async def _wait_for_turn(self):
+        now = time.monotonic()
+        send_at = max(now, self._next_send)
+        self._next_send = send_at + self._interval
+
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def _send_one(self, target: typing.Union[discord.User, discord.Member], content: str,
+                        embed: typing.Optional[discord.Embed]) -> bool:
+        async with self._semaphore:
+            await self._wait_for_turn()
+
+            try:
+                await target.send(content=content, embed=embed)
+                return True
+            except discord.HTTPException:
+                return False
+
+    async def send(self, targets: typing.Iterable[typing.Union[discord.User, discord.Member]],
+                   reason: str = None, message: str = None, embed: discord.Embed = None) -> DMReport:
+        """DMs every target that has DMs of this reason enabled and returns how many were delivered, skipped because
+        of their settings, or failed because they don't accept DMs from the bot"""
+
+        targets = {target.id: target for target in targets}
+        settings = await self.bot.cache.get_dm_settings(targets.keys())
+        recipients = [target for user_id, target in targets.items() if settings[user_id].is_enabled(reason)]
+
+        content = self.with_footer(message)
+        results = await asyncio.gather(*(self._send_one(target, content, embed) for target in recipients))
+        delivered = sum(results)
+
+        return DMReport(delivered=delivered, skipped=len(targets) - len(recipients),
+                        failed=len(recipients) - delivered)
+
+    def queue(self, targets: typing.Iterable[typing.Union[discord.User, discord.Member]],
+              reason: str = None, message: str = None, embed: discord.Embed = None):
+        """Sends the DMs in the background. Queued DMs are sent one batch after another and their reports are logged."""
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        if self._worker is None or self._worker.done():
+            self._worker = self.bot.loop.create_task(self._work())
+
+        self._queue.put_nowait((list(targets), reason, message, embed))
+
+    async def _work(self):
+        while True:
+            targets, reason, message, embed = await self._queue.get()
+            started = time.perf_counter()
+
+            try:
+                report = await self.send(targets, reason=reason, message=message, embed=embed)
+                print(f"[BOT] Sent '{reason}' DMs in {time.perf_counter() - started:.1f}s: {report}")
+            except Exception as e:
+                print(f"[BOT] Error while sending '{reason}' DMs: {e.__class__.__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
@@ -2,22 +2,33 @@ import socket
 
 from dciv_bot.config import config
 
-from googleapiclient import errors
-from googleapiclient.discovery import build
-from oauth2client import file as oauth_file, client, tools
-
 
 class GoogleAPIWrapper:
+    """Runs Google Apps Scripts. googleapiclient and oauth2client are only imported once the first script is run,
+    as importing them takes a considerable part of the bot's startup time."""
+
     def __init__(self, bot):
         socket.setdefaulttimeout(600)
         self.bot = bot
         self.scopes = config.GOOGLE_CLOUD_PLATFORM_OAUTH_SCOPES
-        self.oauth2_store = oauth_file.Storage(config.GOOGLE_CLOUD_PLATFORM_CLIENT_OAUTH_CREDENTIALS_FILE)
+        self._oauth2_store = None
+
+    @property
+    def oauth2_store(self):
+        if self._oauth2_store is None:
+            from oauth2client import file as oauth_file
+            self._oauth2_store = oauth_file.Storage(config.GOOGLE_CLOUD_PLATFORM_CLIENT_OAUTH_CREDENTIALS_FILE)
+
+        return self._oauth2_store
 
     async def run_apps_script(self, script_id, function, parameters):
         return await self.bot.loop.run_in_executor(None, self.execute_apps_script, script_id, function, parameters)
 
     def execute_apps_script(self, script_id, function, parameters):
+        from googleapiclient import errors
+        from googleapiclient.discovery import build
+        from oauth2client import client, tools
+
         creds = self.oauth2_store.get()
 
         if not creds or creds.invalid:
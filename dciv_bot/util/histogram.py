@@ -0,0 +1,53 @@
+import bisect
+import typing
+
+# Upper bounds of the buckets in seconds, the last bucket holds everything slower than 10s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Counts durations in fixed buckets, so that percentiles can be estimated with constant memory no matter how
+    many durations were recorded. Percentiles are the upper bound of the bucket they fall into."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration: float):
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def percentile(self, percentile: float) -> float:
+        """The estimated duration that the given percentage (0 - 100) of the recorded durations did not exceed"""
+
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percentile / 100
+        seen = 0
+
+        for index, amount in enumerate(self.counts):
+            seen += amount
+
+            if seen >= rank and amount:
+                # The slowest duration is known exactly, no need to round it up to the bucket's upper bound
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+
+        return self.max
+
+    def clear(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
@@ -0,0 +1,70 @@
+"""Profiles how long it takes to import modules, to keep an eye on the bot's cold start time.
+
+Runs the imports in a fresh interpreter with 'python -X importtime' and sums up its report per top-level package.
+
+    python -m dciv_bot.util.importtime               # profiles bot.py, needs dciv_bot/config/token.py
+    python -m dciv_bot.util.importtime dciv_bot.util.law_helper dciv_bot.module.tags
+"""
+
+import re
+import sys
+import typing
+import subprocess
+import collections
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+class ImportTime(typing.NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(modules: typing.Iterable[str]) -> typing.List[ImportTime]:
+    """Imports the modules in a new interpreter and returns every module that was imported along the way, in the
+    order in which their imports finished"""
+
+    statement = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    if process.returncode != 0:
+        raise RuntimeError(f"Could not import {', '.join(modules)}:\n{process.stderr[-2000:]}")
+
+    imports = []
+
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(ImportTime(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+
+    return imports
+
+
+def by_package(imports: typing.List[ImportTime]) -> typing.List[typing.Tuple[str, int]]:
+    """Sums up the time spent importing each top-level package, slowest first"""
+
+    packages = collections.Counter()
+
+    for entry in imports:
+        packages[entry.module.split('.')[0]] += entry.self_us
+
+    return packages.most_common()
+
+
+def report(imports: typing.List[ImportTime], top: int = 15) -> str:
+    total = sum(entry.cumulative_us for entry in imports if entry.depth == 0)
+    lines = [f"Imported {len(imports)} modules in {total / 1000:.1f}ms", "", f"{'Package':<30} {'ms':>8} {'%':>6}"]
+
+    for package, self_us in by_package(imports)[:top]:
+        lines.append(f"{package:<30} {self_us / 1000:>8.1f} {self_us / total if total else 0:>6.1%}")
+
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    print(report(profile(sys.argv[1:] or ['bot'])))
@@ -0,0 +1,101 @@
+import time
+import typing
+import inspect
+import datetime
+import functools
+import collections
+
+from discord.ext import tasks
+from dciv_bot.util.histogram import LatencyHistogram
+
+
+class Invocation(typing.NamedTuple):
+    name: str
+    duration: float
+    arguments: str
+    finished_at: datetime.datetime
+    failed: bool = False
+
+
+def describe_arguments(args: typing.Iterable, kwargs: typing.Dict[str, typing.Any] = None, limit: int = 80) -> str:
+    """Short description of the arguments of an invocation. Discord objects are shown as their class name and ID
+    instead of their often very long repr()."""
+
+    def describe(argument) -> str:
+        if hasattr(argument, 'id') and not isinstance(argument, (str, int)):
+            return f"{argument.__class__.__name__}({argument.id})"
+
+        text = repr(argument)
+        return text if len(text) <= 30 else f"{text[:27]}..."
+
+    described = [describe(argument) for argument in args]
+    described.extend(f"{key}={describe(value)}" for key, value in (kwargs or {}).items())
+    text = ", ".join(described)
+    return text if len(text) <= limit else f"{text[:limit - 3]}..."
+
+
+class LatencyStats:
+    """Latency histograms of every command ("command:..."), event listener ("event:...") and background task
+    iteration ("task:..."), and the most recent invocations of each kind to find the slowest ones among them. The
+    kinds are kept apart so that frequent events like on_message don't push the commands out."""
+
+    def __init__(self, recent: int = 200):
+        self.histograms: typing.Dict[str, LatencyHistogram] = collections.defaultdict(LatencyHistogram)
+        self.recent: typing.Dict[str, typing.Deque[Invocation]] = collections.defaultdict(
+            lambda: collections.deque(maxlen=recent))
+
+    def record(self, name: str, duration: float, arguments: str = "", *, failed: bool = False):
+        self.histograms[name].add(duration)
+        self.recent[name.partition(":")[0]].append(Invocation(name=name, duration=duration, arguments=arguments,
+                                                              finished_at=datetime.datetime.utcnow(), failed=failed))
+
+    def by_kind(self, kind: str) -> typing.List[typing.Tuple[str, LatencyHistogram]]:
+        """The histograms of all commands, events or tasks, the ones that took the most time in total first"""
+
+        histograms = [(name, histogram) for name, histogram in self.histograms.items()
+                      if name.startswith(f"{kind}:")]
+        return sorted(histograms, key=lambda item: item[1].total, reverse=True)
+
+    def slowest_recent(self, kind: str, amount: int = 5) -> typing.List[Invocation]:
+        return sorted(self.recent[kind], key=lambda invocation: invocation.duration, reverse=True)[:amount]
+
+    def clear(self):
+        self.histograms.clear()
+        self.recent.clear()
+
+
+latency_stats = LatencyStats()
+
+
+def _timed_loop_coro(coro):
+    @functools.wraps(coro)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+
+        try:
+            await coro(*args, **kwargs)
+        except Exception:
+            latency_stats.record(f"task:{coro.__qualname__}", time.perf_counter() - started, failed=True)
+            raise
+        else:
+            latency_stats.record(f"task:{coro.__qualname__}", time.perf_counter() - started)
+
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_loops(obj) -> int:
+    """Records the duration of every iteration of the obj's tasks.loop()s, obj being a Cog or the bot. Returns the
+    amount of loops that were instrumented."""
+
+    instrumented = 0
+
+    for name, value in inspect.getmembers(type(obj), lambda member: isinstance(member, tasks.Loop)):
+        # Loop.__get__ gives every instance its own copy of the Loop, which is the one that actually runs
+        loop = getattr(obj, name)
+
+        if not getattr(loop.coro, '__timed__', False):
+            loop.coro = _timed_loop_coro(loop.coro)
+            instrumented += 1
+
+    return instrumented
@@ -1,5 +1,5 @@
+import os
 import copy
-import nltk
 import typing
 import discord
 import asyncpg
@@ -7,15 +7,23 @@ import datetime
 import collections
 
 from discord.ext import tasks
-from bs4 import BeautifulSoup, SoupStrainer
 
 from dciv_bot.util import mk
 from dciv_bot.util.converter import Session, Bill, Law
 
+# nltk, bs4 and lxml take longer to import than the rest of the bot together, and are only needed when a bill is
+# submitted. They are imported on first use in scrape_google_docs_html() and generate_law_tags().
+
+# The data that nltk needs for generate_law_tags() is never downloaded by the bot. It is looked up in nltk's default
+# locations and in this directory, see the README.
+NLTK_DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'nltk_data')
+NLTK_DATA = ('tokenizers/punkt', 'taggers/averaged_perceptron_tagger')
+
 
 class MockContext:
     def __init__(self, bot):
         self.bot = bot
+        self.identity_map = {}
 
 
 class AnnouncementQueue:
@@ -90,10 +98,45 @@ class LawUtils:
         self.bot = bot
         self.illegal_tags = ('act', 'the', 'author', 'authors', 'date',
                              'name', 'bill', 'law', 'and', 'd/m/y', 'type', 'description')
+        self._nltk = None
+        self._nltk_data_missing = False
+
+    @staticmethod
+    def has_nltk_data() -> bool:
+        """Checks whether the data that nltk needs for generate_law_tags() is available locally"""
+
+        import nltk
+
+        if NLTK_DATA_DIRECTORY not in nltk.data.path:
+            nltk.data.path.append(NLTK_DATA_DIRECTORY)
+
+        try:
+            for resource in NLTK_DATA:
+                nltk.data.find(resource)
+        except LookupError:
+            return False
+
+        return True
+
+    @property
+    def nltk(self):
+        """The nltk module, or None if its data is missing"""
 
-        # The natural language processor module nltk used for legislature_tags needs extra data to work
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
+        if self._nltk is None:
+            # The check is only done once, the data won't appear while the bot is running
+            if self._nltk_data_missing:
+                return None
+
+            if not self.has_nltk_data():
+                self._nltk_data_missing = True
+                print(f"[BOT] nltk data is missing, tags for laws cannot be generated. Run 'python -m nltk.downloader "
+                      f"-d {NLTK_DATA_DIRECTORY} punkt averaged_perceptron_tagger' to get it.")
+                return None
+
+            import nltk
+            self._nltk = nltk
+
+        return self._nltk
 
     @staticmethod
     def is_google_doc_link(link: str) -> bool:
@@ -124,6 +167,8 @@ class LawUtils:
         return None
 
     def scrape_google_docs_html(self, text: str):
+        from bs4 import BeautifulSoup, SoupStrainer
+
         strainer = SoupStrainer(property=["og:title", "og:description"])
         soup = BeautifulSoup(text, "lxml", parse_only=strainer)  # Use lxml parser to speed things up
 
@@ -165,6 +210,11 @@ class LawUtils:
     def generate_law_tags(self, google_docs_description: str, author_description: str) -> typing.List[str]:
         """Generates tags from all nouns of submitter-provided description and the Google Docs description"""
 
+        nltk = self.nltk
+
+        if nltk is None:
+            return []
+
         # Function to check if token is noun
         is_noun = lambda pos: pos[:2] == 'NN'
 
@@ -284,13 +334,6 @@ class LawUtils:
 
         return tiny_url
 
-    async def update_pg_trgm_similarity_threshold(self, threshold: float = 0.3, connection=None):
-        # I couldn't figure out how to make the setting persist in all sessions from the connection pool, so
-        # we just set it every time per connection
-
-        con = connection or self.bot.db
-        await con.execute(f"SET pg_trgm.similarity_threshold = {threshold}")
-
     async def search_law_by_name(self, name: str, connection=None) -> typing.Dict[str, None]:
         """Search for laws by their name, returns list with prettified strings of found laws"""
 
@@ -305,9 +348,10 @@ class LawUtils:
         laws = await con.fetch(query, name.lower())
 
         found = dict()
+        ctx = MockContext(self.bot)
 
         for law_id in laws:
-            law = await Law.convert(MockContext(self.bot), law_id['law_id'])
+            law = await Law.convert(ctx, law_id['law_id'])
             found[f"Law #{law.id} - [{law.bill.name}]({law.bill.link})"] = None
 
         return found
@@ -331,8 +375,12 @@ class LawUtils:
         # Abuse dict as ordered set
         pretty_laws = dict()
 
+        # The same law shows up once for every tag of it that matched, share one context so that every law is
+        # only loaded once
+        ctx = MockContext(self.bot)
+
         for law_id in found_laws:
-            law = await Law.convert(MockContext(self.bot), law_id['id'])
+            law = await Law.convert(ctx, law_id['id'])
             pretty_laws[f"Law #{law.id} - [{law.bill.name}]({law.bill.link})"] = None
 
         return pretty_laws
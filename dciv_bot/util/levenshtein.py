@@ -15,3 +15,118 @@ def distance(a, b):
         previous_distances, current_distances = current_distances, previous_distances
     
     return previous_distances[-1]
+
+
+def distance_within(a, b, max_k):
+    """Same as distance(a, b), but only if that is at most max_k. Otherwise max_k + 1 is returned.
+
+    Only the cells of the matrix that are at most max_k away from the diagonal are computed, since every cell
+    outside of that band already costs more than max_k edits. Stops as soon as a whole row exceeds max_k."""
+
+    if len(a) < len(b):
+        a, b = b, a
+
+    too_far = max_k + 1
+
+    if len(a) - len(b) > max_k:
+        return too_far
+
+    if not b:
+        return len(a)
+
+    length_b = len(b)
+    previous_distances = [j if j <= max_k else too_far for j in range(length_b + 1)]
+    current_distances = [too_far] * (length_b + 1)
+
+    for i in range(1, len(a) + 1):
+        low, high = max(1, i - max_k), min(length_b, i + max_k)
+        char_a = a[i - 1]
+
+        current_distances[0] = i if i <= max_k else too_far
+
+        if low > 1:
+            current_distances[low - 1] = too_far
+
+        row_minimum = current_distances[low - 1]
+
+        for j in range(low, high + 1):
+            d = min(previous_distances[j] + 1,
+                    current_distances[j - 1] + 1,
+                    previous_distances[j - 1] + (char_a != b[j - 1]))
+
+            current_distances[j] = d
+
+            if d < row_minimum:
+                row_minimum = d
+
+        if high < length_b:
+            current_distances[high + 1] = too_far
+
+        if row_minimum > max_k:
+            return too_far
+
+        previous_distances, current_distances = current_distances, previous_distances
+
+    return min(previous_distances[length_b], too_far)
+
+
+class BKTree:
+    """Burkhard-Keller tree of words, used to find the closest word to a typo without comparing it to every word.
+
+    Every child of a node is stored under its distance to that node. Because of the triangle inequality, a search
+    for words within a distance of k to the query only has to visit the children whose distance to a visited node is
+    within k of the query's distance to that node."""
+
+    def __init__(self, words=()):
+        self._root = None
+
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if self._root is None:
+            self._root = (word, {})
+            return
+
+        node_word, children = self._root
+
+        while True:
+            d = distance(word, node_word)
+
+            if d == 0:
+                return
+
+            if d not in children:
+                children[d] = (word, {})
+                return
+
+            node_word, children = children[d]
+
+    def closest(self, word: str, max_distance: int):
+        """Returns the closest word that is at most max_distance away from word, or None. Ties are broken
+        alphabetically."""
+
+        if self._root is None:
+            return None
+
+        best, best_distance = None, max_distance
+        to_visit = [self._root]
+
+        while to_visit:
+            node_word, children = to_visit.pop()
+
+            # No child can be in range if the node is further away than the largest child distance plus the
+            # search radius, so there is no need to compute the exact distance beyond that
+            d = distance_within(word, node_word, max(children, default=0) + best_distance)
+
+            if d < best_distance or (d == best_distance and (best is None or node_word < best)):
+                best, best_distance = node_word, d
+
+                if d == 0:
+                    break
+
+            # The search radius shrinks to the best distance found so far
+            to_visit.extend(child for child_distance, child in children.items()
+                            if d - best_distance <= child_distance <= d + best_distance)
+
+        return best
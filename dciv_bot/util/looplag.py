@@ -0,0 +1,142 @@
+import sys
+import time
+import typing
+import asyncio
+import logging
+import datetime
+import threading
+import traceback
+import collections
+
+from dciv_bot.util.histogram import LatencyHistogram
+
+
+class SlowCallback(typing.NamedTuple):
+    description: str
+    duration: float
+    stack: typing.List[str]
+    happened_at: datetime.datetime
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Receives the 'Executing <Handle> took 0.5 seconds' warnings that asyncio logs in debug mode"""
+
+    def __init__(self, monitor: 'LoopLagMonitor'):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        if isinstance(record.msg, str) and record.msg.startswith('Executing') and len(record.args or ()) == 2:
+            self.monitor.slow_callback(str(record.args[0]), float(record.args[1]))
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a sleep that should have ended, which is how long everything else,
+    like the gateway's heartbeats, had to wait for CPU work that blocked the loop.
+
+    The optional slow callback detector puts the loop into asyncio's debug mode, so that asyncio logs every callback
+    that ran longer than loop.slow_callback_duration. A watchdog thread takes the stack of the loop's thread while it
+    is blocked, which is attached to the callback that asyncio logs once it returns.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = 0.5, recent: int = 120):
+        self.loop = loop
+        self.interval = interval
+        self.lag = LatencyHistogram()
+        self.recent: typing.Deque[float] = collections.deque(maxlen=recent)
+        self.slow_callbacks: typing.Deque[SlowCallback] = collections.deque(maxlen=10)
+        self.slow_callback_duration: typing.Optional[float] = None
+
+        self._task: typing.Optional[asyncio.Task] = None
+        self._handler: typing.Optional[_SlowCallbackHandler] = None
+        self._watchdog: typing.Optional[threading.Thread] = None
+        self._next_tick: typing.Optional[asyncio.Handle] = None
+        self._stop_watchdog = threading.Event()
+        self._loop_thread_id: typing.Optional[int] = None
+        self._last_tick = time.monotonic()
+        self._blocked_stack: typing.Optional[typing.List[str]] = None
+
+    @property
+    def detects_slow_callbacks(self) -> bool:
+        return self._handler is not None
+
+    def start(self, *, detect_slow_callbacks: bool = False, slow_callback_duration: float = 0.1):
+        self._task = self.loop.create_task(self._sample())
+
+        if detect_slow_callbacks:
+            self.start_slow_callback_detector(slow_callback_duration)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+        self.stop_slow_callback_detector()
+
+    async def _sample(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.lag.add(lag)
+            self.recent.append(lag)
+
+    def start_slow_callback_detector(self, duration: float):
+        if self.detects_slow_callbacks:
+            return
+
+        self.slow_callback_duration = duration
+        self.loop.slow_callback_duration = duration
+        self.loop.set_debug(True)
+
+        self._handler = _SlowCallbackHandler(self)
+        logging.getLogger('asyncio').addHandler(self._handler)
+
+        self._stop_watchdog.clear()
+        self._last_tick = time.monotonic()
+        self._next_tick = self.loop.call_soon(self._tick)
+        self._watchdog = threading.Thread(target=self._watch, name='loop-lag-watchdog', daemon=True)
+        self._watchdog.start()
+
+    def stop_slow_callback_detector(self):
+        if not self.detects_slow_callbacks:
+            return
+
+        logging.getLogger('asyncio').removeHandler(self._handler)
+        self._handler = None
+        self._next_tick.cancel()
+        self._stop_watchdog.set()
+        self._watchdog.join(timeout=1)
+        self.loop.set_debug(False)
+
+    def _tick(self):
+        # Runs on the loop every now and then, the watchdog knows the loop is blocked when it stops doing so
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._blocked_stack = None
+
+        self._next_tick = self.loop.call_later(self.slow_callback_duration / 4, self._tick)
+
+    def _watch(self):
+        while not self._stop_watchdog.wait(self.slow_callback_duration / 2):
+            if self._blocked_stack is not None or self._loop_thread_id is None:
+                continue
+
+            if time.monotonic() - self._last_tick >= self.slow_callback_duration:
+                frame = sys._current_frames().get(self._loop_thread_id)
+
+                if frame is not None:
+                    self._blocked_stack = traceback.format_stack(frame)
+
+    def slow_callback(self, description: str, duration: float):
+        stack = self._blocked_stack or []
+        self._blocked_stack = None
+        self.slow_callbacks.append(SlowCallback(description=description, duration=duration, stack=stack,
+                                                happened_at=datetime.datetime.utcnow()))
+
+        where = stack[-1].strip().splitlines()[0] if stack else "unknown"
+        print(f"[BOT] Event loop was blocked for {duration * 1000:.0f}ms by {description[:200]} at {where}")
+
+    def clear(self):
+        self.lag.clear()
+        self.recent.clear()
+        self.slow_callbacks.clear()
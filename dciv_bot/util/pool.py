@@ -0,0 +1,171 @@
+import time
+import typing
+import asyncio
+import asyncpg
+import contextvars
+import collections
+
+from discord.ext import tasks
+from dciv_bot.config import config
+
+# What caused the queries that are made in the current context, like "command:legislature submit" or
+# "event:on_message". Set by DemocracivBot.invoke() and DemocracivBot._schedule_event()
+query_origin = contextvars.ContextVar('query_origin', default=None)
+
+
+def current_origin() -> str:
+    origin = query_origin.get()
+
+    if origin is not None:
+        return origin
+
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    if task is None:
+        return "unknown"
+
+    coro = task.get_coro()
+
+    # Background tasks from discord.ext.tasks all run Loop._loop, the actual task is the coroutine of that Loop
+    frame = getattr(coro, 'cr_frame', None)
+    loop = frame.f_locals.get('self') if frame is not None else None
+
+    if isinstance(loop, tasks.Loop):
+        return f"task:{loop.coro.__qualname__}"
+
+    return f"task:{getattr(coro, '__qualname__', 'unknown')}"
+
+
+class QueryStatistic:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+
+class QueryStats:
+    """Durations of all queries by query and by origin, and how often each command was invoked"""
+
+    def __init__(self):
+        self.by_query: typing.Dict[str, QueryStatistic] = collections.defaultdict(QueryStatistic)
+        self.by_origin: typing.Dict[str, QueryStatistic] = collections.defaultdict(QueryStatistic)
+        self.invocations: typing.Counter[str] = collections.Counter()
+        self.slow_queries = 0
+
+    def record(self, query: str, duration: float):
+        origin = current_origin()
+        self.by_query[query].add(duration)
+        self.by_origin[origin].add(duration)
+
+        if duration >= config.DATABASE_SLOW_QUERY_THRESHOLD:
+            self.slow_queries += 1
+            print(f"[DATABASE] Slow query ({duration * 1000:.0f}ms) from {origin}: {' '.join(query.split())[:200]}")
+
+    def command_invoked(self, origin: str):
+        self.invocations[origin] += 1
+
+    def top_queries(self, amount: int = 10) -> typing.List[typing.Tuple[str, QueryStatistic]]:
+        """The queries that took the most time in total"""
+        return sorted(self.by_query.items(), key=lambda item: item[1].total, reverse=True)[:amount]
+
+    def queries_per_invocation(self) -> typing.List[typing.Tuple[str, float]]:
+        """The average amount of queries per invocation of every command that was invoked, most queries first"""
+
+        averages = [(origin, self.by_origin[origin].count / invocations)
+                    for origin, invocations in self.invocations.items()]
+        return sorted(averages, key=lambda item: item[1], reverse=True)
+
+    def clear(self):
+        self.by_query.clear()
+        self.by_origin.clear()
+        self.invocations.clear()
+        self.slow_queries = 0
+
+
+query_stats = QueryStats()
+
+
+def server_settings(application_name: str) -> typing.Dict[str, str]:
+    """Session settings that are sent when a connection is opened. Unlike settings made with SET in init_connection(),
+    these survive the RESET ALL that the pool runs whenever a connection is released."""
+
+    return {'application_name': application_name,
+            # For the % operator in the law search by tag
+            'pg_trgm.similarity_threshold': str(float(config.DATABASE_TRGM_SIMILARITY_THRESHOLD))}
+
+
+async def init_connection(connection: asyncpg.Connection):
+    """Called by the pool once for every new connection. Type codecs live on the client side of the connection, so
+    they only have to be registered once."""
+
+    # Imported here since the converters use util.statements, which imports this module
+    from dciv_bot.util.converter import SessionStatus
+
+    # legislature_sessions.status is returned as SessionStatus, and SessionStatus can be used as query argument
+    await connection.set_type_codec('session_status', schema='public', format='text',
+                                    encoder=lambda status: getattr(status, 'value', status), decoder=SessionStatus)
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """asyncpg connection that records the duration of every query in query_stats. Used by the bot's pool, so that
+    both bot.db.fetch() and queries on acquired connections are recorded."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Filled by util.statements, which prepares its statements once for every connection
+        self.prepared_statements: typing.Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+    async def execute(self, query: str, *args, timeout: float = None) -> str:
+        started = time.perf_counter()
+
+        try:
+            return await super().execute(query, *args, timeout=timeout)
+        finally:
+            query_stats.record(query, time.perf_counter() - started)
+
+    async def executemany(self, command: str, args, *, timeout: float = None):
+        started = time.perf_counter()
+
+        try:
+            return await super().executemany(command, args, timeout=timeout)
+        finally:
+            query_stats.record(command, time.perf_counter() - started)
+
+    async def fetch(self, query, *args, timeout=None, record_class=None) -> list:
+        started = time.perf_counter()
+
+        try:
+            return await super().fetch(query, *args, timeout=timeout, record_class=record_class)
+        finally:
+            query_stats.record(query, time.perf_counter() - started)
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        started = time.perf_counter()
+
+        try:
+            return await super().fetchval(query, *args, column=column, timeout=timeout)
+        finally:
+            query_stats.record(query, time.perf_counter() - started)
+
+    async def fetchrow(self, query, *args, timeout=None, record_class=None):
+        started = time.perf_counter()
+
+        try:
+            return await super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+        finally:
+            query_stats.record(query, time.perf_counter() - started)
@@ -0,0 +1,127 @@
+import time
+import typing
+import asyncpg
+
+from dciv_bot.util.pool import query_stats
+from dciv_bot.util.histogram import LatencyHistogram
+
+Executor = typing.Union[asyncpg.pool.Pool, asyncpg.Connection]
+
+
+class Statement:
+    __slots__ = ('name', 'query', 'prepares', 'latency')
+
+    def __init__(self, name: str, query: str):
+        self.name = name
+        self.query = query
+        self.prepares = 0
+        self.latency = LatencyHistogram()
+
+
+class StatementRegistry:
+    """The statements of the hot paths, like tag lookups or starring a message.
+
+    Every statement is prepared once per connection the first time it runs on it, and the prepared statement is kept
+    on the connection (see InstrumentedConnection), so later executions skip parsing and planning. How often each
+    statement was prepared and executed, and how long executions took, is shown by -perf statements.
+    """
+
+    def __init__(self):
+        self.statements: typing.Dict[str, Statement] = {}
+
+    def register(self, name: str, query: str) -> Statement:
+        if name in self.statements:
+            raise ValueError(f"There already is a statement named '{name}'")
+
+        statement = Statement(name, query)
+        self.statements[name] = statement
+        return statement
+
+    async def _prepare(self, connection, statement: Statement):
+        prepared_statements = getattr(connection, 'prepared_statements', None)
+
+        # Connections that were not made by the bot's pool have nowhere to keep prepared statements, asyncpg's own
+        # statement cache still applies to them
+        if prepared_statements is None:
+            return None
+
+        prepared = prepared_statements.get(statement.name)
+
+        if prepared is None:
+            prepared = await connection.prepare(statement.query)
+            prepared_statements[statement.name] = prepared
+            statement.prepares += 1
+
+        return prepared
+
+    async def _run(self, connection, statement: Statement, method: str, args: tuple):
+        prepared = await self._prepare(connection, statement)
+        started = time.perf_counter()
+
+        try:
+            if prepared is None:
+                return await getattr(connection, method)(statement.query, *args)
+
+            return await getattr(prepared, method)(*args)
+        except asyncpg.InvalidCachedStatementError:
+            # The schema of a table changed since the statement was prepared, so prepare it again
+            connection.prepared_statements.pop(statement.name, None)
+            prepared = await self._prepare(connection, statement)
+            return await getattr(prepared, method)(*args)
+        finally:
+            duration = time.perf_counter() - started
+            statement.latency.add(duration)
+            query_stats.record(statement.query, duration)
+
+    async def run(self, executor: Executor, name: str, method: str, *args):
+        """Runs the statement with fetch, fetchrow or fetchval on the connection, or a connection from the pool"""
+
+        statement = self.statements[name]
+
+        if isinstance(executor, asyncpg.pool.Pool):
+            async with executor.acquire() as connection:
+                return await self._run(connection, statement, method, args)
+
+        return await self._run(executor, statement, method, args)
+
+    def clear(self):
+        for statement in self.statements.values():
+            statement.latency.clear()
+
+
+registry = StatementRegistry()
+
+registry.register('tag_by_alias', """SELECT t.*, ARRAY(SELECT a.alias FROM guild_tags_alias a WHERE a.tag_id = t.id)
+                                     AS aliases
+                                     FROM guild_tags t
+                                     WHERE t.id = (SELECT tag_id FROM guild_tags_alias
+                                                   WHERE alias = $1 AND (global = true OR guild_id = $2)
+                                                   ORDER BY global DESC
+                                                   LIMIT 1)""")
+registry.register('guild_config', "SELECT * FROM guilds WHERE id = $1")
+registry.register('star_count', "SELECT COUNT(*) FROM starboard_starrers WHERE entry_id = $1")
+
+# The tables that remember which posts, videos and streams of the feeds were already announced
+SEEN_TABLES = ('reddit_posts', 'youtube_uploads', 'youtube_streams', 'twitch_streams')
+
+for _table in SEEN_TABLES:
+    registry.register(f'mark_seen:{_table}', f"INSERT INTO {_table} (id) VALUES ($1) ON CONFLICT DO NOTHING "
+                                             f"RETURNING id")
+
+
+async def fetch_tag(executor: Executor, alias: str, guild_id: typing.Optional[int]) -> typing.Optional[asyncpg.Record]:
+    """The global tag with that alias, or else the tag with that alias on the guild, with all of its aliases"""
+    return await registry.run(executor, 'tag_by_alias', 'fetchrow', alias, guild_id)
+
+
+async def fetch_guild_config(executor: Executor, guild_id: int) -> typing.Optional[asyncpg.Record]:
+    return await registry.run(executor, 'guild_config', 'fetchrow', guild_id)
+
+
+async def count_stars(executor: Executor, entry_id: int) -> int:
+    return await registry.run(executor, 'star_count', 'fetchval', entry_id)
+
+
+async def mark_as_seen(executor: Executor, table: str, item_id: str) -> bool:
+    """Remembers the ID in one of the SEEN_TABLES. Returns False if it was already seen before."""
+    return await registry.run(executor, f'mark_seen:{table}', 'fetchval', item_id) is not None
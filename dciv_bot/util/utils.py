@@ -68,7 +68,7 @@ def tag_check():
     """Check to see if tag creation is allowed by everyone or just Administrators."""
 
     async def check(ctx):
-        is_allowed = await ctx.bot.checks.is_tag_creation_allowed(ctx.guild.id)
+        is_allowed = ctx.bot.checks.is_tag_creation_allowed(ctx.guild.id)
 
         if is_allowed:
             return True
@@ -83,15 +83,15 @@ def tag_check():
     return commands.check(check)
 
 
-async def get_logging_channel(bot, guild: discord.Guild) -> typing.Optional[discord.TextChannel]:
-    channel = await bot.cache.get_guild_config_cache(guild.id, 'logging_channel')
+def get_logging_channel(bot, guild: discord.Guild) -> typing.Optional[discord.TextChannel]:
+    channel = bot.cache.get_guild_settings(guild.id).logging_channel
 
     if channel:
         return guild.get_channel(channel)
 
 
-async def get_welcome_channel(bot, guild: discord.Guild) -> typing.Optional[discord.TextChannel]:
-    channel = await bot.cache.get_guild_config_cache(guild.id, 'welcome_channel')
+def get_welcome_channel(bot, guild: discord.Guild) -> typing.Optional[discord.TextChannel]:
+    channel = bot.cache.get_guild_settings(guild.id).welcome_channel
 
     if channel:
         return guild.get_channel(channel)
@@ -158,30 +158,25 @@ class CheckUtils:
 
         return check
 
-    async def is_logging_enabled(self, guild_id: int) -> bool:
+    def is_logging_enabled(self, guild_id: int) -> bool:
         """Returns true if logging is enabled for this guild."""
-        return await self.bot.cache.get_guild_config_cache(guild_id, 'logging')
+        return self.bot.cache.get_guild_settings(guild_id).logging
 
-    async def is_welcome_message_enabled(self, guild_id: int) -> bool:
+    def is_welcome_message_enabled(self, guild_id: int) -> bool:
         """Returns true if welcome messages are enabled for this guild."""
-        return await self.bot.cache.get_guild_config_cache(guild_id, 'welcome')
+        return self.bot.cache.get_guild_settings(guild_id).welcome
 
-    async def is_default_role_enabled(self, guild_id: int) -> bool:
+    def is_default_role_enabled(self, guild_id: int) -> bool:
         """Returns true if a default role is enabled for this guild."""
-        return await self.bot.cache.get_guild_config_cache(guild_id, 'defaultrole')
+        return self.bot.cache.get_guild_settings(guild_id).defaultrole
 
-    async def is_tag_creation_allowed(self, guild_id: int) -> bool:
+    def is_tag_creation_allowed(self, guild_id: int) -> bool:
         """Returns true if everyone is allowed to make tags on this guild."""
-        return await self.bot.cache.get_guild_config_cache(guild_id, 'tag_creation_allowed')
+        return self.bot.cache.get_guild_settings(guild_id).tag_creation_allowed
 
-    async def is_channel_excluded(self, guild_id: int, channel_id: int) -> bool:
+    def is_channel_excluded(self, guild_id: int, channel_id: int) -> bool:
         """Returns true if the channel is excluded from logging. This is used for the Starboard too."""
-        excluded_channels = await self.bot.cache.get_guild_config_cache(guild_id, 'logging_excluded')
-
-        if excluded_channels is not None:
-            return channel_id in excluded_channels
-        else:
-            return False
+        return channel_id in self.bot.cache.get_guild_settings(guild_id).excluded_channels
 
     async def is_guild_initialized(self, guild_id: int) -> bool:
         """Returns true if the guild has an entry in the bot's database."""